@@ -0,0 +1,105 @@
+from collections import defaultdict
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from projects.models import Project
+from .models import Issue, Comment
+
+
+# Counter column of Project holding the number of its issues in each status
+STATUS_COUNTERS = {
+    'TO_DO': 'to_do_count',
+    'IN_PROGRESS': 'in_progress_count',
+    'FINISHED': 'finished_count',
+}
+
+
+def shifted(column, delta):
+    """
+    Return the expression adding `delta` to a counter column, floored at zero.
+
+    A counter that drifted below its actual value (e.g. rows deleted outside of the API)
+    then stays at zero instead of breaking the write, until repair_counters fixes it.
+    """
+    return F(column) + delta if delta > 0 else Greatest(F(column) + delta, 0)
+
+
+def add_issue_counts(project_id, deltas, using=None):
+    """
+    Apply changes of the issue counts per status of a project, with a single UPDATE.
+
+    Counters are incremented with F() expressions, so concurrent writes never overwrite each
+    other. Call it in the transaction of the write it accounts for.
+
+    Args:
+        project_id (int): The project whose issues were created, deleted or changed status.
+        deltas (dict): Change of the number of issues per status, e.g. {'TO_DO': -1, 'FINISHED': 1}.
+        using (str): Alias of the database written to, the default one if None.
+    """
+    changes = {STATUS_COUNTERS[status]: shifted(STATUS_COUNTERS[status], delta) for status, delta in deltas.items() if delta}
+    if changes:
+        Project.objects.using(using).filter(pk=project_id).update(**changes)
+
+
+def add_comment_counts(deltas, using=None):
+    """
+    Apply changes of the comment counts of issues, with one UPDATE per distinct change.
+
+    Args:
+        deltas (dict): Change of the number of comments per issue id, e.g. {12: 1}.
+        using (str): Alias of the database written to, the default one if None.
+    """
+    issues_by_delta = defaultdict(list)
+    for issue_id, delta in deltas.items():
+        if delta:
+            issues_by_delta[delta].append(issue_id)
+    for delta, issue_ids in issues_by_delta.items():
+        Issue.objects.using(using).filter(pk__in=issue_ids).update(comment_count=shifted('comment_count', delta))
+
+
+def counted(queryset, field):
+    """
+    Return a correlated subquery counting the rows of `queryset` whose `field` is the outer row.
+    """
+    rows = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field)
+    return Coalesce(Subquery(rows.annotate(count=Count('pk')).values('count')), 0)
+
+
+def repair_counters(project_ids=None, using=None):
+    """
+    Recompute the issue and comment counters from the rows, in bulk.
+
+    Each table is fixed with a single UPDATE computing the counts with correlated
+    subqueries, and only the rows whose counters drifted are written.
+
+    Args:
+        project_ids (iterable, optional): Restrict the repair to these projects and their issues.
+        using (str): Alias of the database, the default one if None.
+
+    Returns:
+        tuple: The number of projects and of issues whose counters were fixed.
+    """
+    issues = Issue.objects.using(using)
+    projects = Project.objects.using(using)
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        projects = projects.filter(pk__in=project_ids)
+        issues = issues.filter(project_id__in=project_ids)
+
+    status_counts = {
+        column: counted(Issue.objects.using(using).filter(status=status), 'project')
+        for status, column in STATUS_COUNTERS.items()
+    }
+    drifted = Q()
+    for column in STATUS_COUNTERS.values():
+        drifted |= ~Q(**{column: F(f'actual_{column}')})
+    drifted_projects = projects.annotate(
+        **{f'actual_{column}': count for column, count in status_counts.items()}
+    ).filter(drifted).values('pk')
+    fixed_projects = Project.objects.using(using).filter(pk__in=drifted_projects).update(**status_counts)
+
+    comment_count = counted(Comment.objects.using(using), 'issue')
+    drifted_issues = issues.annotate(actual_comment_count=comment_count).exclude(
+        comment_count=F('actual_comment_count')
+    ).values('pk')
+    fixed_issues = Issue.objects.using(using).filter(pk__in=drifted_issues).update(comment_count=comment_count)
+    return fixed_projects, fixed_issues
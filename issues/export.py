@@ -0,0 +1,170 @@
+import csv
+import io
+import json
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+from .models import Issue, Comment
+
+
+# Columns exported for every issue and comment, with the key they are exported under
+ISSUE_COLUMNS = {
+    'id': 'id', 'title': 'title', 'description': 'description', 'tag': 'tag', 'status': 'status',
+    'priority': 'priority', 'assignee_id': 'assignee', 'author__username': 'author',
+    'created_time': 'created_time', 'updated_time': 'updated_time',
+}
+COMMENT_COLUMNS = {
+    'id': 'id', 'issue_id': 'issue', 'text': 'text', 'author__username': 'author',
+    'created_time': 'created_time', 'updated_time': 'updated_time',
+}
+
+# CSV header, shared by issue and comment rows
+CSV_FIELDS = ['type', 'id', 'issue', 'title', 'description', 'tag', 'status', 'priority', 'assignee',
+              'text', 'author', 'created_time', 'updated_time']
+
+# Size in characters of the chunks handed to the streaming response
+BUFFER_SIZE = 64 * 1024
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer selecting the NDJSON export (`Accept: application/x-ndjson` or `?format=ndjson`).
+
+    Exports are streamed by the view, so this only renders error responses, as one JSON line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data, cls=DjangoJSONEncoder) + '\n').encode() if data is not None else b''
+
+
+class CSVRenderer(NDJSONRenderer):
+    """
+    Renderer selecting the CSV export (`Accept: text/csv` or `?format=csv`).
+
+    Error responses are rendered as a JSON line as well.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+def iter_records(project_id, chunk_size):
+    """
+    Yield ('issue', row) and ('comment', row) pairs of a project, each issue followed by its comments.
+
+    Issues and comments are read with two server-side iterators sorted by issue id, and
+    merge-joined on the fly (see merge_comments), so only a chunk of each is held in memory
+    whatever the size of the project.
+
+    Args:
+        project_id (int): The project exported.
+        chunk_size (int): Number of rows fetched from the database at a time.
+    """
+    issues = Issue.objects.filter(project_id=project_id).order_by('id').values_list(*ISSUE_COLUMNS)
+    comments = Comment.objects.filter(issue__project_id=project_id).order_by('issue_id', 'created_time', 'id')
+    comments = comments.values_list(*COMMENT_COLUMNS).iterator(chunk_size=chunk_size)
+    yield from merge_comments(issues.iterator(chunk_size=chunk_size), comments)
+
+
+def merge_comments(issues, comments):
+    """
+    Yield ('issue', row) and ('comment', row) pairs from issue and comment rows both sorted by issue id.
+
+    The two queries are separate snapshots, so an issue deleted between them can leave
+    comments without their issue. Such comments are skipped, rather than stopping the merge.
+
+    Args:
+        issues (iterable): Rows of ISSUE_COLUMNS, sorted by id.
+        comments (iterable): Rows of COMMENT_COLUMNS, sorted by issue id.
+    """
+    comments = iter(comments)
+    issue_position = list(COMMENT_COLUMNS).index('issue_id')
+
+    pending = next(comments, None)
+    for issue in issues:
+        yield 'issue', dict(zip(ISSUE_COLUMNS.values(), issue))
+        while pending is not None and pending[issue_position] < issue[0]:
+            pending = next(comments, None)
+        while pending is not None and pending[issue_position] == issue[0]:
+            yield 'comment', dict(zip(COMMENT_COLUMNS.values(), pending))
+            pending = next(comments, None)
+
+
+def iter_ndjson(records, nested):
+    """
+    Yield the NDJSON lines of the records, with the comments nested in their issue or as lines of their own.
+
+    A nested issue line is only written once all its comments are read, so the comments of
+    one issue are held in memory together.
+    """
+    encoder = DjangoJSONEncoder()
+    if not nested:
+        for record_type, row in records:
+            yield encoder.encode({'type': record_type, **row}) + '\n'
+        return
+
+    # A nested issue is held until its last comment is read
+    issue = None
+    for record_type, row in records:
+        if record_type == 'comment':
+            issue['comments'].append(row)
+            continue
+        if issue is not None:
+            yield encoder.encode(issue) + '\n'
+        issue = {**row, 'comments': []}
+    if issue is not None:
+        yield encoder.encode(issue) + '\n'
+
+
+def iter_csv(records):
+    """
+    Yield the CSV lines of the records, one row per issue and per comment.
+    """
+    line = io.StringIO()
+    writer = csv.DictWriter(line, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for record_type, row in records:
+        if record_type == 'issue':
+            row = {**row, 'issue': row['id']}
+        writer.writerow({'type': record_type, **row})
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
+    yield line.getvalue()
+
+
+def buffered(lines, size=BUFFER_SIZE):
+    """
+    Group lines into chunks of about `size` characters, to limit the number of writes to the client.
+    """
+    buffer, length = [], 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+async def aiter_chunks(chunks):
+    """
+    Yield the chunks of a synchronous iterator from the event loop, for an ASGI server.
+
+    Django reads a synchronous streaming response whole into a list under ASGI. Each chunk is
+    instead read in the thread running the synchronous code, which also owns the database
+    cursors of the export, so only one chunk is held in memory at a time.
+    """
+    chunks = iter(chunks)
+    done = object()
+    read = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await read(chunks, done)) is not done:
+            yield chunk
+    finally:
+        # Closes the cursors of the export when the client disconnects early
+        if hasattr(chunks, 'close'):
+            await sync_to_async(chunks.close, thread_sensitive=True)()
@@ -0,0 +1,113 @@
+from django.db.models import Case, IntegerField, Q, Value, When
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+from tasktracker.pagination import uses_keyset_pagination
+from .models import Issue
+
+
+def split_values(raw):
+    """
+    Split a comma separated query parameter into its non-empty values.
+    """
+    return [value.strip() for value in raw.split(',') if value.strip()]
+
+
+class IssueFilterBackend(BaseFilterBackend):
+    """
+    Filter issue lists by `status`, `priority`, `tag` and `assignee` query parameters.
+
+    Every parameter accepts a comma separated list of values, e.g. `?status=TO_DO,IN_PROGRESS`.
+    `?assignee=none` selects unassigned issues. Each filter is served by a (project, field,
+    created_time) index of Issue.
+    """
+    choice_fields = {
+        'status': Issue.STATUS_CHOICES,
+        'priority': Issue.PRIORITY_CHOICES,
+        'tag': Issue.TAG_CHOICES,
+    }
+    unassigned_value = 'none'
+
+    def filter_queryset(self, request, queryset, view):
+        if view.action != 'list':
+            return queryset
+
+        errors = {}
+        for field, choices in self.choice_fields.items():
+            values = split_values(request.query_params.get(field, ''))
+            if not values:
+                continue
+            allowed = [choice for choice, _ in choices]
+            invalid = [value for value in values if value not in allowed]
+            if invalid:
+                errors[field] = [f"Invalid value(s) {', '.join(invalid)}, expected one of {', '.join(allowed)}."]
+            else:
+                queryset = queryset.filter(**{f'{field}__in': values})
+
+        assignees = split_values(request.query_params.get('assignee', ''))
+        if assignees:
+            unassigned = self.unassigned_value in assignees
+            ids = [value for value in assignees if value != self.unassigned_value]
+            if not all(value.isdigit() for value in ids):
+                errors['assignee'] = [f"Expected user ids or '{self.unassigned_value}'."]
+            elif unassigned and ids:
+                queryset = queryset.filter(Q(assignee_id__in=ids) | Q(assignee__isnull=True))
+            elif unassigned:
+                queryset = queryset.filter(assignee__isnull=True)
+            else:
+                queryset = queryset.filter(assignee_id__in=ids)
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': field,
+                'required': False,
+                'in': 'query',
+                'description': f"Comma separated {field} values to keep.",
+                'schema': {'type': 'string'},
+            }
+            for field in [*self.choice_fields, 'assignee']
+        ]
+
+
+class IssueOrderingFilter(OrderingFilter):
+    """
+    Order issue lists by the `ordering` query parameter, restricted to the view's ordering_fields.
+
+    Priorities and statuses are ordered by rank (LOW < MEDIUM < HIGH, TO_DO < IN_PROGRESS <
+    FINISHED) rather than alphabetically, and the id always breaks ties so that limit/offset
+    pages are stable. Cursor pagination only walks the creation order.
+    """
+    ranks = {
+        'priority': Issue.PRIORITY_CHOICES,
+        'status': Issue.STATUS_CHOICES,
+    }
+
+    def get_ordering(self, request, queryset, view):
+        if request.query_params.get(self.ordering_param) and uses_keyset_pagination(request, view):
+            raise ValidationError({self.ordering_param: ["Cursor pagination is always ordered by creation time."]})
+        return super().get_ordering(request, queryset, view)
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+
+        terms = []
+        for term in ordering:
+            field = term.lstrip('-')
+            if field in self.ranks:
+                # Choices are declared from the lowest rank to the highest
+                queryset = queryset.alias(**{f'{field}_rank': Case(
+                    *[When(**{field: choice}, then=Value(rank)) for rank, (choice, _) in enumerate(self.ranks[field])],
+                    output_field=IntegerField(),
+                )})
+                term = term.replace(field, f'{field}_rank')
+            terms.append(term)
+
+        if not any(term.lstrip('-') == 'id' for term in terms):
+            terms.append('id')
+        return queryset.order_by(*terms)
@@ -0,0 +1,313 @@
+import json
+import time
+from collections import Counter
+from typing import NamedTuple
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import F
+from rest_framework.exceptions import ValidationError
+from projects.cache import bump_project_versions
+from projects.events import build_event, publish_on_commit
+from projects.models import Contributor
+from users.models import User
+from .models import Issue, Comment, ImportJob, finished_time_for
+from .counters import add_issue_counts
+from .serializers import IssueSerializer, CommentSerializer
+
+
+# Number of rows validated and inserted together by default
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ImportReport(NamedTuple):
+    """
+    Outcome of a project import.
+
+    Attributes:
+        issues (int): Number of issues created.
+        comments (int): Number of comments created.
+        seconds (float): Duration of the import.
+    """
+    issues: int
+    comments: int
+    seconds: float
+
+    @property
+    def rows_per_second(self):
+        """
+        Return the import throughput, issues and comments together.
+        """
+        return round((self.issues + self.comments) / self.seconds) if self.seconds else 0
+
+    def as_dict(self):
+        """
+        Return the report as the body of the import endpoint.
+        """
+        return {**self._asdict(), 'seconds': round(self.seconds, 3), 'rows_per_second': self.rows_per_second}
+
+
+def get_resumable_job(project, job_id, requested_by=None):
+    """
+    Return the unfinished import job of a project, to resume it.
+
+    Args:
+        project (Project): The project receiving the rows.
+        job_id (str): The id of the job, as given back by the failed import.
+        requested_by (User): The uploader of the job, None for jobs of the import_project command.
+
+    Raises:
+        ValidationError: If no unfinished job of the project and uploader has this id.
+    """
+    try:
+        return ImportJob.objects.exclude(status='DONE').get(
+            pk=job_id, project_id=project.pk, requested_by_id=getattr(requested_by, 'pk', None),
+        )
+    except (ImportJob.DoesNotExist, DjangoValidationError):
+        raise ValidationError({'resume': ["Expected the id of an unfinished import of the project."]})
+
+
+class ProjectImporter:
+    """
+    Create the issues and comments of a project from NDJSON lines, in batches.
+
+    The lines follow the layouts of the project export: one issue per line with its comments
+    nested under 'comments', or issue lines (type 'issue') each followed by the lines of its
+    comments (type 'comment'). Authors and assignees are given as usernames, assignees also
+    as user ids, and must be contributors of the project. When the importer is given an
+    `author_id`, every row is created by that user and the authors of the lines are ignored.
+    Ids, timestamps and the project of the lines are ignored, the rows being created as new ones.
+
+    Lines are parsed as they are read and buffered until a batch holds `batch_size` rows,
+    flat comment lines included. A batch is validated with the rules of IssueSerializer and
+    CommentSerializer, its unknown usernames are resolved with a single query into a map kept
+    for the whole import, and its rows are inserted with bulk_create.
+
+    Every batch commits on its own, with the checkpoint of the import (see ImportJob): the
+    last committed line, and the last issue, which the next comment lines may belong to. An
+    invalid line rolls back its batch only and fails the job, whose id is given with the error.
+    Running the importer again with the job and the same lines skips the committed ones.
+
+    Attributes:
+        project (Project): The project receiving the issues.
+        batch_size (int): Number of rows validated and inserted together.
+        author_id (int): The user creating every row, or None to take the authors from the lines.
+        job (ImportJob): The checkpoint of the import, created by run unless an unfinished job is resumed.
+    """
+    def __init__(self, project, batch_size=DEFAULT_BATCH_SIZE, author_id=None, job=None):
+        self.project = project
+        self.batch_size = batch_size
+        self.fixed_author_id = author_id
+        self.job = job
+        self.user_ids = {}
+        self.contributor_ids = set()
+        self.counts = {'issues': 0, 'comments': 0}
+        # The last committed issue and its id in the lines, which later flat comment lines refer to
+        self.last_issue = None
+        self.last_issue_key = None
+
+    def run(self, lines):
+        """
+        Import the issues and comments of an iterable of NDJSON lines, as text or bytes.
+
+        Returns:
+            ImportReport: The number of rows created by this run and its duration.
+
+        Raises:
+            ValidationError: If a line is malformed or invalid, with its line number, the id of
+                             the failed job and the number of rows it committed.
+        """
+        started = time.perf_counter()
+        self.contributor_ids = set(Contributor.objects.filter(project=self.project).values_list('user_id', flat=True))
+        if self.job is None:
+            self.job = ImportJob.objects.create(project_id=self.project.pk, requested_by_id=self.fixed_author_id)
+        elif self.job.last_issue_id is not None:
+            # The id of the issue in the lines is unknown, so its comment lines are not checked against it
+            self.last_issue = Issue.objects.filter(pk=self.job.last_issue_id, project=self.project).first()
+
+        try:
+            self.import_lines(lines)
+        except ValidationError as error:
+            self.job.status = 'FAILED'
+            self.job.save(update_fields=['status', 'updated_time'])
+            self.job.refresh_from_db(fields=['issues', 'comments'])
+            error.detail.update(job=str(self.job.pk), imported={'issues': self.job.issues, 'comments': self.job.comments})
+            raise
+
+        self.job.status = 'DONE'
+        self.job.save(update_fields=['status', 'updated_time'])
+        return ImportReport(self.counts['issues'], self.counts['comments'], time.perf_counter() - started)
+
+    def import_lines(self, lines):
+        """
+        Split the lines past the checkpoint of the job into batches, and commit each of them.
+        """
+        # Issues with their comments, and the comments of the last committed issue
+        batch, tail, rows = [], [], 0
+        checkpoint = self.job.line
+        for number, record in self.parse(lines):
+            if number <= self.job.line:
+                continue
+
+            # Batches are cut before any line, so that long runs of flat comments are bounded too
+            if rows >= self.batch_size:
+                self.commit(batch, tail, checkpoint)
+                batch, tail, rows = [], [], 0
+
+            if record.get('type', 'issue') == 'comment':
+                if batch:
+                    _, issue, comments = batch[-1]
+                    key = issue.get('id')
+                elif self.last_issue is not None:
+                    comments, key = tail, self.last_issue_key
+                else:
+                    self.fail(number, {'type': ["A comment line must follow the line of its issue."]})
+                if 'issue' in record and key is not None and record['issue'] != key:
+                    self.fail(number, {'issue': ["A comment line must follow the line of its issue."]})
+                comments.append((number, record))
+                rows += 1
+            else:
+                nested = record.get('comments') or []
+                if not isinstance(nested, list) or not all(isinstance(comment, dict) for comment in nested):
+                    self.fail(number, {'comments': ["Expected a list of comment objects."]})
+                comments = [(number, comment) for comment in nested]
+                batch.append((number, record, comments))
+                rows += 1 + len(comments)
+            checkpoint = number
+
+        if batch or tail:
+            self.commit(batch, tail, checkpoint)
+
+    @transaction.atomic
+    def commit(self, batch, tail, checkpoint):
+        """
+        Insert a batch and move the checkpoint of the job to its last line, in one transaction.
+        """
+        issues, comments = self.flush(batch, tail)
+        if batch:
+            self.last_issue, self.last_issue_key = issues[-1], batch[-1][1].get('id')
+        ImportJob.objects.filter(pk=self.job.pk).update(
+            line=checkpoint, last_issue_id=getattr(self.last_issue, 'pk', None),
+            issues=F('issues') + len(issues), comments=F('comments') + len(comments),
+        )
+        self.job.line = checkpoint
+        self.counts['issues'] += len(issues)
+        self.counts['comments'] += len(comments)
+
+        # Bulk writes send no signals, so the cached responses are invalidated here, and the
+        # streams get a single event per batch telling clients to reload rather than one per row
+        bump_project_versions([self.project.pk])
+        publish_on_commit(build_event(self.project.pk, 'issue', 'imported', issues=len(issues), comments=len(comments)))
+
+    def parse(self, lines):
+        """
+        Yield the (line number, record) of every non-blank line.
+        """
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                self.fail(number, {'non_field_errors': [f"Invalid JSON: {error}."]})
+            if not isinstance(record, dict):
+                self.fail(number, {'non_field_errors': ["Expected a JSON object."]})
+            yield number, record
+
+    def fail(self, number, errors):
+        """
+        Abort the import on an invalid line.
+        """
+        error = ValidationError({'errors': errors})
+        # The line number is set after the conversion of the errors, which would turn it into a string
+        error.detail = {'line': number, **error.detail}
+        raise error
+
+    def resolve_users(self, batch, tail):
+        """
+        Add the usernames of the batch missing from the user map, with a single query.
+        """
+        usernames = set()
+        for _, issue, comments in batch:
+            usernames.add(issue.get('assignee'))
+            if self.fixed_author_id is None:
+                usernames.add(issue.get('author'))
+                usernames.update(comment.get('author') for _, comment in comments)
+        if self.fixed_author_id is None:
+            usernames.update(comment.get('author') for _, comment in tail)
+        missing = {name for name in usernames if isinstance(name, str)} - self.user_ids.keys()
+        if missing:
+            self.user_ids.update(User.objects.filter(username__in=missing).values_list('username', 'id'))
+
+    def author_id(self, number, record):
+        """
+        Return the id of the author of a record, who must be a contributor of the project.
+        """
+        if self.fixed_author_id is not None:
+            return self.fixed_author_id
+        user_id = self.user_ids.get(record.get('author')) if isinstance(record.get('author'), str) else None
+        if user_id is None or user_id not in self.contributor_ids:
+            self.fail(number, {'author': ["Expected the username of a contributor of the project."]})
+        return user_id
+
+    def validate(self, serializer_class, numbers, items, context=None):
+        """
+        Validate the items of a batch with a single list serializer, whose fields are built once.
+
+        Returns:
+            list: The validated data of the items, in order.
+        """
+        serializer = serializer_class(data=items, many=True, context=context or {})
+        if not serializer.is_valid():
+            # Errors are keyed by item index, or listed per item before DRF 3.15
+            errors = serializer.errors
+            index, errors = next((index, item) for index, item in (errors.items() if isinstance(errors, dict) else enumerate(errors)) if item)
+            self.fail(numbers[index], errors)
+        return serializer.validated_data
+
+    def flush(self, batch, tail):
+        """
+        Validate the issues and comments of a batch and insert them with bulk_create.
+
+        Args:
+            batch (list): The (line number, record, comments) of the new issues.
+            tail (list): The (line number, record) of the comments of the last committed issue.
+
+        Returns:
+            tuple: The created issues and comments.
+        """
+        self.resolve_users(batch, tail)
+
+        issue_data = []
+        for _, record, _ in batch:
+            data = dict(record)
+            if isinstance(data.get('assignee'), str):
+                # Unknown usernames are left to the assignee validation of the serializer
+                data['assignee'] = self.user_ids.get(data['assignee'], 0)
+            issue_data.append(data)
+        issue_data = self.validate(IssueSerializer, [number for number, _, _ in batch], issue_data,
+                                   {'contributor_ids': self.contributor_ids})
+
+        issues = []
+        comments = [(number, comment, self.last_issue) for number, comment in tail]
+        for (number, record, issue_comments), data in zip(batch, issue_data):
+            # Comments are created with their issue, whose counter is therefore known up front
+            issue = Issue(**data, project=self.project, author_id=self.author_id(number, record),
+                          comment_count=len(issue_comments))
+            issue.finished_time = finished_time_for(issue.status)
+            issues.append(issue)
+            comments.extend((comment_number, comment, issue) for comment_number, comment in issue_comments)
+
+        comment_data = self.validate(CommentSerializer, [number for number, _, _ in comments],
+                                     [comment for _, comment, _ in comments])
+        comments = [
+            Comment(**data, issue=issue, author_id=self.author_id(number, comment))
+            for (number, comment, issue), data in zip(comments, comment_data)
+        ]
+
+        # The issues get their ids back from the insert, which bulk_create then copies to their comments
+        Issue.objects.bulk_create(issues, batch_size=self.batch_size)
+        Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+        if tail:
+            Issue.objects.filter(pk=self.last_issue.pk).update(comment_count=F('comment_count') + len(tail))
+        add_issue_counts(self.project.pk, Counter(issue.status for issue in issues))
+        return issues, comments
@@ -0,0 +1,70 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from issues.models import Issue, Comment
+from issues.search import get_search_backend, search_terms
+from projects.models import Project
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the project search over a large number of comments.
+
+    Issues and comments made of random words are spread over several projects, then a set of
+    queries is timed against one project with the configured search backend. All benchmark
+    rows are created inside a transaction that is rolled back, so the database is left untouched.
+    """
+    help = "Time project searches over a large number of issues and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=1000000, help="Number of comments to create.")
+        parser.add_argument('--comments-per-issue', type=int, default=50)
+        parser.add_argument('--projects', type=int, default=10, help="Number of projects sharing the rows.")
+        parser.add_argument('--repeat', type=int, default=20, help="Number of timed runs per query.")
+        parser.add_argument('--queries', default='login crash,timeout,database migration fails,zzz',
+                            help="Comma separated queries to time.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        vocabulary = [f'word{i}' for i in range(20000)] + ['login', 'crash', 'timeout', 'database', 'migration', 'fails']
+
+        def sentence(length):
+            return ' '.join(rng.choice(vocabulary) for _ in range(length))
+
+        with transaction.atomic():
+            author = User.objects.create_user(username='bench-search', password=None, age=30)
+            projects = Project.objects.bulk_create(
+                [Project(title=f'Bench {i}', description='', type='back-end', author=author) for i in range(options['projects'])]
+            )
+
+            started = time.perf_counter()
+            issue_count = max(options['comments'] // options['comments_per_issue'], 1)
+            issues = Issue.objects.bulk_create(
+                [Issue(title=sentence(6), description=sentence(40), tag='BUG', priority='LOW',
+                       project=projects[i % len(projects)], author=author) for i in range(issue_count)],
+                batch_size=1000,
+            )
+            for offset in range(0, options['comments'], 10000):
+                Comment.objects.bulk_create(
+                    [Comment(text=sentence(25), issue=issues[(offset + i) % len(issues)], author=author)
+                     for i in range(min(10000, options['comments'] - offset))],
+                    batch_size=1000,
+                )
+            self.stdout.write(f"Created {issue_count} issues and {options['comments']} comments "
+                              f"(indexed on write) in {time.perf_counter() - started:.1f} s")
+
+            backend = get_search_backend()
+            self.stdout.write(f"Backend: {type(backend).__name__}")
+            for query in options['queries'].split(','):
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    hits = backend.search(projects[0].pk, search_terms(query), 20)
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(f"{query!r:<30} {len(hits):>3} hits  median {statistics.median(timings):7.2f} ms"
+                                  f"  max {max(timings):7.2f} ms")
+
+            transaction.set_rollback(True)
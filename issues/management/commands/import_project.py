@@ -0,0 +1,64 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from issues.models import ImportJob
+from issues.importer import DEFAULT_BATCH_SIZE, ProjectImporter, get_resumable_job
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Import the issues and comments of a project from an NDJSON file.
+
+    The file follows the layouts of the project export (see issues.importer.ProjectImporter).
+    It is read line by line, so files larger than memory can be imported, and rows are
+    inserted in batches with bulk_create, each committed on its own. An import stopped by an
+    invalid line, or interrupted, is resumed with --resume and the id of its job.
+    """
+    help = "Import issues and comments into a project from an NDJSON file ('-' for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('project', type=int, help="Id of the project receiving the issues.")
+        parser.add_argument('path', help="NDJSON file to import, '-' to read stdin.")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help="Number of rows validated and inserted together.")
+        parser.add_argument('--resume', metavar='JOB',
+                            help="Id of an unfinished import of the same file, whose committed lines are skipped.")
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(pk=options['project'])
+        except Project.DoesNotExist:
+            raise CommandError(f"Project {options['project']} does not exist.")
+        if options['batch_size'] < 1:
+            raise CommandError("The batch size must be positive.")
+
+        if options['resume']:
+            try:
+                job = get_resumable_job(project, options['resume'])
+            except ValidationError:
+                raise CommandError(f"No unfinished import {options['resume']} of project {project.pk}.")
+        else:
+            # Created up front, so that an interrupted import can be resumed too
+            job = ImportJob.objects.create(project_id=project.pk)
+        self.stdout.write(f"Import job {job.pk}, from line {job.line + 1}.")
+
+        importer = ProjectImporter(project, batch_size=options['batch_size'], job=job)
+        try:
+            if options['path'] == '-':
+                report = importer.run(sys.stdin.buffer)
+            else:
+                with open(options['path'], 'rb') as lines:
+                    report = importer.run(lines)
+        except ValidationError as error:
+            imported = error.detail['imported']
+            raise CommandError(
+                f"Line {error.detail['line']} is invalid: {error.detail['errors']}. {imported['issues']} issues and "
+                f"{imported['comments']} comments were imported before it. Fix the line and run the command again "
+                f"with --resume {error.detail['job']}."
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.issues} issues and {report.comments} comments in {report.seconds:.1f} s "
+            f"({report.rows_per_second} rows/s)."
+        ))
@@ -0,0 +1,58 @@
+import itertools
+from django.core.management.base import BaseCommand, CommandError
+from tasktracker.loadtest import obtain_token, run_for, summarize, timed_request
+
+
+class Command(BaseCommand):
+    """
+    Compare the throughput and latency of an issue or comment read across running servers.
+
+    Each target is a named base URL, typically the same database served once by a WSGI server
+    and once by an ASGI server with ASYNC_VIEWS enabled:
+
+        gunicorn -w 4 tasktracker.wsgi:application -b 127.0.0.1:8000
+        ASYNC_VIEWS=true uvicorn --workers 4 tasktracker.asgi:application --port 8001
+        python manage.py loadtest_reads --username alice --password secret \\
+            --path /projects/1/issues/ --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001
+
+    The targets are probed one after the other with the same number of threads, and each gets a
+    line with its request count, requests per second and latency percentiles. With
+    --bust-cache, every request gets a distinct query parameter so the response cache is missed
+    and the view runs in full.
+    """
+    help = "Report req/s and p99 latency of a read endpoint on several running servers (e.g. WSGI vs ASGI)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', required=True,
+                            help="Server to probe, as name=base URL. Repeat to compare servers.")
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--path', required=True, help="Read endpoint to probe, e.g. /projects/1/issues/.")
+        parser.add_argument('--concurrency', type=int, default=64, help="Number of threads sending requests.")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds each target is probed.")
+        parser.add_argument('--bust-cache', action='store_true',
+                            help="Add a distinct query parameter to every request to miss the response cache.")
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            name, _, base_url = target.partition('=')
+            if not base_url:
+                raise CommandError(f"Expected a target as name=URL, got '{target}'.")
+            targets.append((name, base_url.rstrip('/')))
+
+        separator = '&' if '?' in options['path'] else '?'
+        for name, base_url in targets:
+            token = obtain_token(base_url, options['username'], options['password'])
+            url = base_url + options['path']
+            counter = itertools.count()
+
+            def probe():
+                if options['bust_cache']:
+                    return timed_request(f'{url}{separator}nocache={next(counter)}', token=token)
+                return timed_request(url, token=token)
+
+            # A short warm-up opens the connections and fills the caches of every worker
+            run_for(min(options['duration'], 1), options['concurrency'], probe)
+            results = run_for(options['duration'], options['concurrency'], probe)
+            self.stdout.write(f"{summarize(name, results)}  {len(results) / options['duration']:8.1f} req/s")
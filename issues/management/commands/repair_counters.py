@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from issues.counters import repair_counters
+from projects.cache import bump_project_versions
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Recompute the issue counters of projects and the comment counters of issues.
+
+    The counters are maintained by the API writes, but rows written by other means (the
+    admin, the shell, raw SQL) make them drift. Each table is fixed with a single set-based
+    UPDATE that only writes the drifted rows, so the command can be run routinely.
+    """
+    help = "Recompute the per-status issue counts of projects and the comment counts of issues."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help="Only repair this project and its issues. Repeat for several projects.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed_projects, fixed_issues = repair_counters(options['projects'])
+            if fixed_projects or fixed_issues:
+                # Set-based updates send no signals, so the cached responses are invalidated here
+                bump_project_versions(options['projects'] or Project.objects.values_list('pk', flat=True))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Repaired the counters of {fixed_projects} projects and {fixed_issues} issues."
+        ))
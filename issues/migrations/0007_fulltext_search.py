@@ -0,0 +1,132 @@
+from django.db import migrations
+
+
+# FTS5 tables indexing issue titles/descriptions and comment texts, with the project of every
+# row as a 'p<id>' token. Triggers keep them in sync with every write, bulk or set-based ones
+# included. Comment ids are UUIDs while FTS5 rows need an integer rowid, which
+# issues_comment_fts_ids assigns.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE issues_issue_fts USING fts5(
+        title, description, project, tokenize = 'porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TABLE issues_comment_fts_ids (
+        rowid INTEGER PRIMARY KEY, comment_id char(32) NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE issues_comment_fts USING fts5(
+        text, project, issue_id UNINDEXED, tokenize = 'porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER issues_issue_fts_insert AFTER INSERT ON issues_issue BEGIN
+        INSERT INTO issues_issue_fts (rowid, title, description, project)
+        VALUES (new.id, new.title, new.description, 'p' || new.project_id);
+    END
+    """,
+    """
+    CREATE TRIGGER issues_issue_fts_update AFTER UPDATE OF title, description, project_id ON issues_issue BEGIN
+        DELETE FROM issues_issue_fts WHERE rowid = old.id;
+        INSERT INTO issues_issue_fts (rowid, title, description, project)
+        VALUES (new.id, new.title, new.description, 'p' || new.project_id);
+    END
+    """,
+    """
+    CREATE TRIGGER issues_issue_fts_delete AFTER DELETE ON issues_issue BEGIN
+        DELETE FROM issues_issue_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER issues_comment_fts_insert AFTER INSERT ON issues_comment BEGIN
+        INSERT INTO issues_comment_fts_ids (comment_id) VALUES (new.id);
+        INSERT INTO issues_comment_fts (rowid, text, project, issue_id)
+        SELECT ids.rowid, new.text, 'p' || issue.project_id, new.issue_id
+        FROM issues_comment_fts_ids AS ids, issues_issue AS issue
+        WHERE ids.comment_id = new.id AND issue.id = new.issue_id;
+    END
+    """,
+    """
+    CREATE TRIGGER issues_comment_fts_update AFTER UPDATE OF text, issue_id ON issues_comment BEGIN
+        DELETE FROM issues_comment_fts
+        WHERE rowid = (SELECT rowid FROM issues_comment_fts_ids WHERE comment_id = old.id);
+        INSERT INTO issues_comment_fts (rowid, text, project, issue_id)
+        SELECT ids.rowid, new.text, 'p' || issue.project_id, new.issue_id
+        FROM issues_comment_fts_ids AS ids, issues_issue AS issue
+        WHERE ids.comment_id = new.id AND issue.id = new.issue_id;
+    END
+    """,
+    """
+    CREATE TRIGGER issues_comment_fts_delete AFTER DELETE ON issues_comment BEGIN
+        DELETE FROM issues_comment_fts
+        WHERE rowid = (SELECT rowid FROM issues_comment_fts_ids WHERE comment_id = old.id);
+        DELETE FROM issues_comment_fts_ids WHERE comment_id = old.id;
+    END
+    """,
+    # Index the rows written before the migration
+    """
+    INSERT INTO issues_issue_fts (rowid, title, description, project)
+    SELECT id, title, description, 'p' || project_id FROM issues_issue
+    """,
+    "INSERT INTO issues_comment_fts_ids (comment_id) SELECT id FROM issues_comment",
+    """
+    INSERT INTO issues_comment_fts (rowid, text, project, issue_id)
+    SELECT ids.rowid, comment.text, 'p' || issue.project_id, comment.issue_id
+    FROM issues_comment AS comment
+    JOIN issues_comment_fts_ids AS ids ON ids.comment_id = comment.id
+    JOIN issues_issue AS issue ON issue.id = comment.issue_id
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER issues_comment_fts_delete",
+    "DROP TRIGGER issues_comment_fts_update",
+    "DROP TRIGGER issues_comment_fts_insert",
+    "DROP TRIGGER issues_issue_fts_delete",
+    "DROP TRIGGER issues_issue_fts_update",
+    "DROP TRIGGER issues_issue_fts_insert",
+    "DROP TABLE issues_comment_fts",
+    "DROP TABLE issues_comment_fts_ids",
+    "DROP TABLE issues_issue_fts",
+]
+
+# GIN indexes on the tsvector expressions of issues.search.PostgreSQLSearchBackend
+POSTGRESQL_FORWARD = [
+    "CREATE INDEX issue_search_idx ON issues_issue USING GIN (to_tsvector('english', title || ' ' || description))",
+    "CREATE INDEX comment_search_idx ON issues_comment USING GIN (to_tsvector('english', text))",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX comment_search_idx",
+    "DROP INDEX issue_search_idx",
+]
+
+STATEMENTS = {
+    'sqlite': (SQLITE_FORWARD, SQLITE_BACKWARD),
+    'postgresql': (POSTGRESQL_FORWARD, POSTGRESQL_BACKWARD),
+}
+
+
+def run_statements(direction):
+    """
+    Build a RunPython function running the statements of the database vendor, if it has any.
+    """
+    def run(apps, schema_editor):
+        statements = STATEMENTS.get(schema_editor.connection.vendor)
+        if statements is not None:
+            for statement in statements[direction]:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0006_issue_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_statements(0), run_statements(1)),
+    ]
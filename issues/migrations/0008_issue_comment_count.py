@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:32
+
+from importlib import import_module
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# SQLite rebuilds issues_issue to add a NOT NULL column, which drops the full-text search
+# triggers on the table and breaks those on issues_comment referencing it, so every trigger
+# is dropped first and created again afterwards
+FTS_TRIGGERS = [
+    statement for statement in import_module('issues.migrations.0007_fulltext_search').SQLITE_FORWARD
+    if statement.split()[:2] == ['CREATE', 'TRIGGER']
+]
+
+
+def drop_fts_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in FTS_TRIGGERS:
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {statement.split()[2]}')
+
+
+def create_fts_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in FTS_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def counted(queryset, field):
+    rows = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field)
+    return Coalesce(Subquery(rows.annotate(count=Count('pk')).values('count')), 0)
+
+
+def fill_counters(apps, schema_editor):
+    """
+    Count the existing comments of every issue and issues of every project per status.
+    """
+    Project = apps.get_model('projects', 'Project')
+    Issue = apps.get_model('issues', 'Issue')
+    Comment = apps.get_model('issues', 'Comment')
+    db = schema_editor.connection.alias
+
+    Issue.objects.using(db).update(comment_count=counted(Comment.objects.using(db), 'issue'))
+    issues = Issue.objects.using(db)
+    Project.objects.using(db).update(
+        to_do_count=counted(issues.filter(status='TO_DO'), 'project'),
+        in_progress_count=counted(issues.filter(status='IN_PROGRESS'), 'project'),
+        finished_count=counted(issues.filter(status='FINISHED'), 'project'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0007_fulltext_search'),
+        ('projects', '0004_project_issue_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_fts_triggers, create_fts_triggers),
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(create_fts_triggers, drop_fts_triggers),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
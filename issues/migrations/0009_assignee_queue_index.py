@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0008_issue_comment_count'),
+        ('projects', '0004_project_issue_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_assignee_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(('assignee__isnull', False)), fields=['assignee', 'status', 'created_time'], name='issue_assignee_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:10
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_finished_time(apps, schema_editor):
+    """
+    Take the last modification of the finished issues as the time they were finished.
+    """
+    Issue = apps.get_model('issues', 'Issue')
+    Issue.objects.using(schema_editor.connection.alias).filter(status='FINISHED').update(finished_time=F('updated_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0009_assignee_queue_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='finished_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_finished_time, migrations.RunPython.noop),
+    ]
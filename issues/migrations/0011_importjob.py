@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:17
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0010_issue_finished_time'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('project_id', models.BigIntegerField()),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('FAILED', 'Failed'), ('DONE', 'Done')], default='RUNNING', max_length=10)),
+                ('line', models.PositiveIntegerField(default=0)),
+                ('last_issue_id', models.BigIntegerField(blank=True, null=True)),
+                ('issues', models.PositiveIntegerField(default=0)),
+                ('comments', models.PositiveIntegerField(default=0)),
+                ('created_time', models.DateTimeField(auto_now_add=True)),
+                ('updated_time', models.DateTimeField(auto_now=True)),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from projects.models import Project
 from users.models import User
 import uuid
@@ -18,6 +20,9 @@ class Issue(models.Model):
         author (ForeignKey): The user who created the issue.
         assignee (ForeignKey): The user who is assigned to work on the issue.
         created_time (DateTimeField): The timestamp when the issue was created.
+        updated_time (DateTimeField): The timestamp of the last modification of the issue.
+        finished_time (DateTimeField): When the issue last moved to 'Finished', None while it is not finished.
+        comment_count (PositiveIntegerField): Number of comments on the issue.
 
     Returns:
         string: A string representation of the issue title.
@@ -42,16 +47,61 @@ class Issue(models.Model):
     description = models.TextField()
     tag = models.CharField(max_length=10, choices=TAG_CHOICES)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES)
-    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='issues')
+    # Lookups by project are served by the composite indexes declared in Meta
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='issues', db_index=False)
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='TO_DO')
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='authored_issues')
     assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='assigned_issues')
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    # Set by the writes changing the status, see finished_time_for
+    finished_time = models.DateTimeField(null=True, blank=True)
+    # Maintained by the comment writes (issues/counters.py), repaired by `manage.py repair_counters`
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """
+        Meta class to define the indexes of the hot issue queries.
+
+        The (project, created_time, id) index serves the project issue list, its keyset
+        pagination and every lookup by project. The (project, <field>, created_time) indexes
+        serve the issue list filtered by status, priority, tag or assignee in creation order.
+        The partial (assignee, status, created_time) index only holds assigned issues and
+        serves the cross-project queue of an assignee (`/me/issues/`) in creation order.
+        """
+        indexes = [
+            models.Index(fields=['project', 'created_time', 'id'], name='issue_project_created_idx'),
+            models.Index(fields=['project', 'status', 'created_time'], name='issue_project_status_idx'),
+            models.Index(fields=['project', 'priority', 'created_time'], name='issue_project_priority_idx'),
+            models.Index(fields=['project', 'tag', 'created_time'], name='issue_project_tag_idx'),
+            models.Index(fields=['project', 'assignee', 'created_time'], name='issue_project_assignee_idx'),
+            models.Index(fields=['assignee', 'status', 'created_time'], name='issue_assignee_queue_idx',
+                         condition=Q(assignee__isnull=False)),
+        ]
 
     def __str__(self):
         return self.title
 
 
+def finished_time_for(status, previous_status=None, current=None):
+    """
+    Return the finished_time of an issue written with `status`.
+
+    The time is set when the issue moves to 'Finished', kept while it stays finished, so
+    later edits do not move it, and cleared when it moves away.
+
+    Args:
+        status (str): The status written.
+        previous_status (str): The stored status before the write, None for a new issue.
+        current (datetime): The stored finished_time before the write.
+    """
+    if status != 'FINISHED':
+        return None
+    if previous_status != 'FINISHED':
+        return timezone.now()
+    return current
+
+
 class Comment(models.Model):
     """
     Represents a comment made on an issue.
@@ -62,15 +112,69 @@ class Comment(models.Model):
         issue (ForeignKey): The issue to which the comment belongs.
         author (ForeignKey): The user who authored the comment.
         created_time (DateTimeField): The timestamp when the comment was made.
+        updated_time (DateTimeField): The timestamp of the last modification of the comment.
 
     Returns:
         string: A string representation indicating the comment's author and the associated issue title.
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     text = models.TextField()
-    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='comments')
+    # Lookups by issue are served by the composite index declared in Meta
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='comments', db_index=False)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """
+        Meta class to define the index serving the comment list of an issue, its keyset
+        pagination and every lookup by issue.
+        """
+        indexes = [
+            models.Index(fields=['issue', 'created_time', 'id'], name='comment_issue_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Comment by {self.author.username} on {self.issue.title}"
+
+class ImportJob(models.Model):
+    """
+    Checkpoint of an NDJSON import, committed with every batch so that a stopped import can be resumed.
+
+    Ids are kept as plain integers, as erasures delete projects and issues with set-based
+    DELETEs that would not follow a foreign key.
+
+    Attributes:
+        id (UUIDField): The job identifier handed out to the client, to resume the import.
+        project_id (BigIntegerField): The primary key of the project receiving the rows.
+        status (CharField): 'RUNNING', 'FAILED' on an invalid line, or 'DONE'.
+        line (PositiveIntegerField): The number of the last line whose rows are committed.
+        last_issue_id (BigIntegerField): The last committed issue, which later comment lines may belong to.
+        issues (PositiveIntegerField): Number of issues committed so far.
+        comments (PositiveIntegerField): Number of comments committed so far.
+        requested_by (ForeignKey): The user who uploaded the rows, None for the import_project command.
+        created_time (DateTimeField): The date and time the import started.
+        updated_time (DateTimeField): The date and time of the last committed batch.
+    """
+    STATUS_CHOICES = (
+        ('RUNNING', 'Running'),
+        ('FAILED', 'Failed'),
+        ('DONE', 'Done'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project_id = models.BigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='RUNNING')
+    line = models.PositiveIntegerField(default=0)
+    last_issue_id = models.BigIntegerField(null=True, blank=True)
+    issues = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='import_jobs')
+    created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"Comment by {self.author.username} on {self.issue.title}"
\ No newline at end of file
+        """
+        Return a string representation of the job, naming its project and status.
+        """
+        return f"Import {self.id} into project {self.project_id} ({self.status})"
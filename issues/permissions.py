@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from projects.models import Project, Contributor
+from projects.membership import get_membership
 
 
 class IsIssueAuthorOrProjectContributor(permissions.BasePermission):
@@ -14,24 +14,23 @@ class IsIssueAuthorOrProjectContributor(permissions.BasePermission):
         project_id = view.kwargs.get('project_pk')
 
         if project_id:
-            project = Project.objects.get(pk=project_id)
             # Check if the user is a contributor to the project
-            is_contributor = Contributor.objects.filter(project=project, user=request.user).exists()
+            is_contributor = get_membership(request, project_id).is_contributor
 
-            if view.action in ['list', 'retrieve', 'create', 'update', 'partial_update', 'destroy']:
+            if view.action in ['list', 'retrieve', 'create', 'update', 'partial_update', 'destroy', 'bulk', 'import_issues']:
                 return is_contributor
-        
+
         # Default to True to allow access when project_id is not present
         return True
 
     def has_object_permission(self, request, view, obj):
         # Issue authors can always modify or delete their issue
-        if obj.author == request.user:
+        if obj.author_id == request.user.pk:
             return True
 
         # Contributors of the project can read (GET, HEAD, OPTIONS) the issue
         if request.method in permissions.SAFE_METHODS:
-            return Contributor.objects.filter(project=obj.project, user=request.user).exists()
+            return get_membership(request, obj.project_id).is_contributor
 
         # Default deny
         return False
@@ -50,22 +49,19 @@ class IsCommentAuthorOrProjectContributor(permissions.BasePermission):
 
         # If project_id is present, check if user is a contributor
         if project_id:
-            project = Project.objects.get(pk=project_id)
-            is_contributor = Contributor.objects.filter(project=project, user=request.user).exists()
-            return is_contributor
-        
+            return get_membership(request, project_id).is_contributor
+
         # Default to True to allow access when project_id is not present
         return True
 
     def has_object_permission(self, request, view, obj):
         # Comment authors can modify or delete their comments
-        if obj.author == request.user:
+        if obj.author_id == request.user.pk:
             return True
 
         # Contributors of the project can read the comment
         if request.method in permissions.SAFE_METHODS:
-            project = obj.issue.project
-            return Contributor.objects.filter(project=project, user=request.user).exists()
+            return get_membership(request, obj.issue.project_id).is_contributor
 
         # Default deny
         return False
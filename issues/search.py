@@ -0,0 +1,212 @@
+import re
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from .models import Issue, Comment
+
+
+# Markers wrapped around the matched terms of the snippets
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+# Number of words around the matched terms in a snippet
+SNIPPET_WORDS = 12
+
+
+def search_terms(query):
+    """
+    Split a free text query into its words, dropping punctuation and search operators.
+    """
+    return re.findall(r'\w+', query)
+
+
+class SearchBackend:
+    """
+    Base class of the issue and comment search backends.
+
+    A backend returns hits as dicts with the keys 'type' ('issue' or 'comment'), 'id',
+    'issue' (the id of the issue, or of the issue a comment belongs to), 'title' (of that
+    issue), 'snippet' (an excerpt with the matched terms between <mark> tags) and 'rank'
+    (higher is better), ordered from the best hit.
+    """
+    def search(self, project_id, terms, limit):
+        """
+        Return the best `limit` issues and comments of the project matching every term.
+
+        Args:
+            project_id (int): The project searched.
+            terms (list): The words to look for, as returned by search_terms.
+            limit (int): The maximum number of hits.
+        """
+        raise NotImplementedError
+
+    def merge(self, issues, comments, limit):
+        """
+        Merge issue and comment hits by rank and keep the best `limit` ones.
+        """
+        return sorted(issues + comments, key=lambda hit: hit['rank'], reverse=True)[:limit]
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """
+    Search backend using the FTS5 tables created by the issues.0007 migration on SQLite.
+
+    The FTS tables are kept in sync by triggers on issues_issue and issues_comment, which
+    also covers bulk writes and set-based deletes. The project of every row is indexed as a
+    'p<id>' token, so restricting a search to a project is an index lookup as well. Hits
+    are ranked with bm25, matches in an issue title weighing more than in its description.
+    """
+    def match_expression(self, project_id, columns, terms):
+        # Terms are quoted so that no user input is parsed as FTS syntax, the last one
+        # matches as a prefix to support search-as-you-type
+        phrases = ' AND '.join(f'"{term}"' for term in terms[:-1])
+        last = f'"{terms[-1]}"*'
+        phrases = f'{phrases} AND {last}' if phrases else last
+        return f'project : p{int(project_id)} AND {{{columns}}} : ({phrases})'
+
+    def search(self, project_id, terms, limit):
+        snippet = f"snippet({{table}}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', {SNIPPET_WORDS})"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT rowid, title, {snippet.format(table='issues_issue_fts')}, -bm25(issues_issue_fts, 10.0, 1.0, 0.0)
+                FROM issues_issue_fts
+                WHERE issues_issue_fts MATCH %s
+                ORDER BY bm25(issues_issue_fts, 10.0, 1.0, 0.0)
+                LIMIT %s
+                """,
+                [self.match_expression(project_id, 'title description', terms), limit],
+            )
+            issues = [
+                {'type': 'issue', 'id': row[0], 'issue': row[0], 'title': row[1], 'snippet': row[2], 'rank': row[3]}
+                for row in cursor.fetchall()
+            ]
+
+            cursor.execute(
+                f"""
+                SELECT ids.comment_id, issues_comment_fts.issue_id, issue.title,
+                       {snippet.format(table='issues_comment_fts')}, -bm25(issues_comment_fts, 1.0, 0.0, 0.0)
+                FROM issues_comment_fts
+                JOIN issues_comment_fts_ids AS ids ON ids.rowid = issues_comment_fts.rowid
+                JOIN issues_issue AS issue ON issue.id = issues_comment_fts.issue_id
+                WHERE issues_comment_fts MATCH %s
+                ORDER BY bm25(issues_comment_fts, 1.0, 0.0, 0.0)
+                LIMIT %s
+                """,
+                [self.match_expression(project_id, 'text', terms), limit],
+            )
+            comments = [
+                {'type': 'comment', 'id': str(Comment._meta.pk.to_python(row[0])), 'issue': row[1], 'title': row[2],
+                 'snippet': row[3], 'rank': row[4]}
+                for row in cursor.fetchall()
+            ]
+        return self.merge(issues, comments, limit)
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """
+    Search backend using the GIN full-text indexes created by the issues.0007 migration on PostgreSQL.
+
+    The tsvector expressions below must stay identical to the indexed ones for the indexes to be used.
+    """
+    issue_vector = "to_tsvector('english', issue.title || ' ' || issue.description)"
+    comment_vector = "to_tsvector('english', comment.text)"
+    headline_options = f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords={SNIPPET_WORDS * 2}, MinWords={SNIPPET_WORDS}'
+
+    def search(self, project_id, terms, limit):
+        query = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT issue.id, issue.title,
+                       ts_headline('english', issue.title || ' ' || issue.description, query, %s),
+                       ts_rank({self.issue_vector}, query)
+                FROM issues_issue AS issue, to_tsquery('english', %s) AS query
+                WHERE issue.project_id = %s AND {self.issue_vector} @@ query
+                ORDER BY 4 DESC
+                LIMIT %s
+                """,
+                [self.headline_options, query, project_id, limit],
+            )
+            issues = [
+                {'type': 'issue', 'id': row[0], 'issue': row[0], 'title': row[1], 'snippet': row[2], 'rank': row[3]}
+                for row in cursor.fetchall()
+            ]
+
+            cursor.execute(
+                f"""
+                SELECT comment.id, issue.id, issue.title,
+                       ts_headline('english', comment.text, query, %s),
+                       ts_rank({self.comment_vector}, query)
+                FROM issues_comment AS comment
+                JOIN issues_issue AS issue ON issue.id = comment.issue_id,
+                     to_tsquery('english', %s) AS query
+                WHERE issue.project_id = %s AND {self.comment_vector} @@ query
+                ORDER BY 5 DESC
+                LIMIT %s
+                """,
+                [self.headline_options, query, project_id, limit],
+            )
+            comments = [
+                {'type': 'comment', 'id': str(row[0]), 'issue': row[1], 'title': row[2], 'snippet': row[3], 'rank': row[4]}
+                for row in cursor.fetchall()
+            ]
+        return self.merge(issues, comments, limit)
+
+
+class BasicSearchBackend(SearchBackend):
+    """
+    Fallback search backend for databases without a full-text index, matching terms with icontains.
+
+    Hits are not ranked beyond putting the most recent first, and every search scans the
+    issues and comments of the project.
+    """
+    def search(self, project_id, terms, limit):
+        issue_filter, comment_filter = Q(), Q()
+        for term in terms:
+            issue_filter &= Q(title__icontains=term) | Q(description__icontains=term)
+            comment_filter &= Q(text__icontains=term)
+
+        issues = Issue.objects.filter(issue_filter, project_id=project_id).order_by('-created_time')
+        comments = Comment.objects.filter(comment_filter, issue__project_id=project_id).select_related('issue')
+        hits = [
+            {'type': 'issue', 'id': issue.pk, 'issue': issue.pk, 'title': issue.title,
+             'snippet': self.excerpt(f'{issue.title} {issue.description}', terms), 'rank': 0.0}
+            for issue in issues.only('id', 'title', 'description')[:limit]
+        ]
+        hits += [
+            {'type': 'comment', 'id': str(comment.pk), 'issue': comment.issue_id, 'title': comment.issue.title,
+             'snippet': self.excerpt(comment.text, terms), 'rank': 0.0}
+            for comment in comments.order_by('-created_time').only('id', 'text', 'issue__title')[:limit]
+        ]
+        return hits[:limit]
+
+    def excerpt(self, text, terms):
+        """
+        Return the words around the first matched term, with every matched term highlighted.
+        """
+        words = text.split()
+        lowered = [term.lower() for term in terms]
+        first = next((i for i, word in enumerate(words) if any(term in word.lower() for term in lowered)), 0)
+        start = max(first - SNIPPET_WORDS // 2, 0)
+        return ' '.join(
+            f'{HIGHLIGHT_START}{word}{HIGHLIGHT_STOP}' if any(term in word.lower() for term in lowered) else word
+            for word in words[start:start + SNIPPET_WORDS]
+        )
+
+
+# Backends used when ISSUE_SEARCH_BACKEND is not set, per database vendor
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend():
+    """
+    Return the search backend named by the ISSUE_SEARCH_BACKEND setting, or the one matching the database.
+    """
+    if settings.ISSUE_SEARCH_BACKEND:
+        return import_string(settings.ISSUE_SEARCH_BACKEND)()
+    return VENDOR_BACKENDS.get(connection.vendor, BasicSearchBackend)()
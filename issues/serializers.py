@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Issue, Comment, Project, User
+from projects.membership import get_contributor_ids
+from .models import Issue, Comment
 
 
 class IssueSerializer(serializers.ModelSerializer):
@@ -9,37 +10,52 @@ class IssueSerializer(serializers.ModelSerializer):
     author = serializers.ReadOnlyField(source='author.username')
     project = serializers.PrimaryKeyRelatedField(read_only=True)
 
-    # Define a field for assignee, setting an initial empty queryset
-    # The queryset will be dynamically set based on the selected project
-    assignee = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.none(), 
-        required=False, 
-        allow_null=True
-    )
+    # The assignee is written and read as a user id, and must be a contributor of the project
+    assignee = serializers.IntegerField(source='assignee_id', required=False, allow_null=True)
 
     class Meta:
         model = Issue
         fields = ['id', 'title', 'description', 'project', 'tag', 'status', 
-                  'priority', 'assignee', 'author', 'created_time']
-        read_only_fields = ['author', 'project']
+                  'priority', 'assignee', 'author', 'comment_count', 'created_time', 'updated_time', 'finished_time']
+        read_only_fields = ['author', 'project', 'comment_count', 'finished_time']
 
     def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Drop the fields left out of a sparse fieldset (`?fields=`)
+        fields = self.context.get('fields')
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def get_contributor_ids(self):
+        """
+        Return the ids of the users who may be assigned to the issue.
+
+        The set is taken from the 'contributor_ids' context entry when the caller provides it,
+        otherwise it is loaded once per request for the project of the URL, so validating many
+        issues of the same project costs a single query.
         """
-        Overrides the default initialization to dynamically set the queryset for the 'assignee' field.
-        
-        The queryset for the 'assignee' field is determined based on the project to which the issue belongs.
-        This ensures that only users who are contributors to the relevant project can be assigned.
+        if 'contributor_ids' in self.context:
+            return self.context['contributor_ids']
+        return get_contributor_ids(self.context['request'], self.context['view'].kwargs['project_pk'])
+
+    def validate_assignee(self, value):
         """
-        super().__init__(*args, **kwargs)
+        Validate that the assignee is a contributor of the project.
+        """
+        if value is not None and value not in self.get_contributor_ids():
+            raise serializers.ValidationError("The assignee must be a contributor of the project.")
+        return value
+
+
+class IssueBulkItemSerializer(IssueSerializer):
+    """
+    Serializer for one item of a bulk issue write.
+
+    Items carrying an 'id' are partial updates of an existing issue, the others are creations.
+    """
+    id = serializers.IntegerField(required=False)
 
-        # Set the queryset for 'assignee' dynamically based on the project specified in the URL
-        if 'view' in self.context and hasattr(self.context['view'], 'kwargs'):
-            project_pk = self.context['view'].kwargs.get('project_pk')
-            if project_pk:
-                # Filter users who are contributors to the specific project
-                self.fields['assignee'].queryset = User.objects.filter(
-                    contributions__project__id=project_pk
-                )
 
 class CommentSerializer(serializers.ModelSerializer):
     """
@@ -50,5 +66,5 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = ['id', 'issue', 'text', 'author', 'created_time']
+        fields = ['id', 'issue', 'text', 'author', 'created_time', 'updated_time']
         read_only_fields = ['author', 'issue']
\ No newline at end of file
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from projects.cache import bump_project_versions
+from projects.events import build_event, publish_on_commit
+from .models import Issue, Comment
+
+
+# Deletions are invalidated and published by IssueViewSet and CommentViewSet.perform_destroy:
+# a post_delete receiver would make every cascade load the deleted rows instead of using a
+# single DELETE (see Collector.can_fast_delete).
+
+
+def comment_project_id(comment, using=None):
+    """
+    Return the id of the project of a comment, without loading its issue.
+
+    The views save comments with their issue already loaded, whose project id is used as is.
+    Otherwise only the project id is read, once per issue for both receivers of the save.
+    """
+    if Comment.issue.is_cached(comment):
+        return comment.issue.project_id
+    known = getattr(comment, '_issue_project_id', None)
+    if known is None or known[0] != comment.issue_id:
+        project_id = Issue.objects.using(using).filter(pk=comment.issue_id).values_list('project_id', flat=True).first()
+        known = comment._issue_project_id = (comment.issue_id, project_id)
+    return known[1]
+
+
+@receiver(post_save, sender=Issue)
+def invalidate_issue(sender, instance, using=None, **kwargs):
+    """
+    Invalidate the cached responses of the project of a saved issue.
+    """
+    bump_project_versions([instance.project_id], using=using)
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_comment(sender, instance, using=None, **kwargs):
+    """
+    Invalidate the cached responses of the project of a saved comment.
+    """
+    bump_project_versions([comment_project_id(instance, using=using)], using=using)
+
+
+@receiver(post_save, sender=Issue)
+def publish_issue_event(sender, instance, created=False, using=None, **kwargs):
+    """
+    Send the creation or update of an issue to the event streams of its project once committed.
+    """
+    event = build_event(instance.project_id, 'issue', 'created' if created else 'updated', instance)
+    publish_on_commit(event, using=using)
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment_event(sender, instance, created=False, using=None, **kwargs):
+    """
+    Send the creation or update of a comment to the event streams of its project once committed.
+    """
+    event = build_event(comment_project_id(instance, using=using), 'comment', 'created' if created else 'updated', instance)
+    publish_on_commit(event, using=using)
@@ -0,0 +1,100 @@
+from collections import Counter
+from django.conf import settings
+from django.db.models import Case, Count, DateField, When
+from django.db.models.functions import Trunc
+from projects.cache import get_response_cache
+from .models import Issue
+
+
+# Cache key of the statistics of a project, see project_stats
+STATS_KEY = 'project-stats:{project}:{version}:{bucket}'
+
+# Time buckets of the histograms
+BUCKETS = ('day', 'week', 'month')
+
+
+class PeriodStart(Trunc):
+    """
+    First day of the day, week (starting on Monday) or month of a timestamp, as a date.
+
+    On SQLite, Trunc is a Python function called for every row, so the periods are computed
+    with the native date() function instead when the current time zone is UTC.
+    """
+    # date() modifiers moving a timestamp to the start of its period
+    sqlite_modifiers = {'day': '', 'week': ", 'weekday 0', '-6 days'", 'month': ", 'start of month'"}
+
+    def __init__(self, expression, kind):
+        super().__init__(expression, kind, output_field=DateField())
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        if self.get_tzname() not in (None, 'UTC'):
+            return self.as_sql(compiler, connection, **extra_context)
+        sql, params = compiler.compile(self.lhs)
+        return f'date({sql}{self.sqlite_modifiers[self.kind]})', params
+
+
+def compute_stats(project_id, bucket):
+    """
+    Compute the issue statistics of a project with a single grouped query.
+
+    Issues are grouped by status, priority, tag, creation bucket and, for finished issues,
+    the bucket of their finished time, which later edits do not move. The groups are then
+    folded into the per-field counts and the histograms.
+
+    Args:
+        project_id (int): The project whose issues are counted.
+        bucket (str): Width of the histogram buckets, one of BUCKETS.
+
+    Returns:
+        dict: The total, the counts per status, priority and tag, and the histogram of the
+              created and finished issues with the number of open issues at the end of each
+              bucket (burndown).
+    """
+    groups = Issue.objects.filter(project_id=project_id).order_by().values(
+        'status', 'priority', 'tag',
+        created=PeriodStart('created_time', bucket),
+        finished=Case(When(status='FINISHED', then=PeriodStart('finished_time', bucket))),
+    ).annotate(count=Count('pk'))
+
+    counts = {'status': Counter(), 'priority': Counter(), 'tag': Counter()}
+    created, finished = Counter(), Counter()
+    for group in groups:
+        for field, counter in counts.items():
+            counter[group[field]] += group['count']
+        created[group['created']] += group['count']
+        if group['finished'] is not None:
+            finished[group['finished']] += group['count']
+
+    histogram = []
+    still_open = 0
+    for period in sorted(created.keys() | finished.keys()):
+        still_open += created[period] - finished[period]
+        histogram.append({
+            'period': period, 'created': created[period], 'finished': finished[period], 'open': still_open,
+        })
+
+    return {
+        'total': sum(created.values()),
+        # Every choice is listed, with 0 when no issue has it
+        'by_status': {value: counts['status'][value] for value, _ in Issue.STATUS_CHOICES},
+        'by_priority': {value: counts['priority'][value] for value, _ in Issue.PRIORITY_CHOICES},
+        'by_tag': {value: counts['tag'][value] for value, _ in Issue.TAG_CHOICES},
+        'bucket': bucket,
+        'histogram': histogram,
+    }
+
+
+def project_stats(project, bucket):
+    """
+    Return the issue statistics of a project, from the cache while the project data is unchanged.
+
+    Statistics are cached under the current version of the project, which moves on every
+    issue write (see projects.cache.bump_project_versions), and shared by all its members.
+    """
+    cache = get_response_cache()
+    key = STATS_KEY.format(project=project.pk, version=project.version, bucket=bucket)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_stats(project.pk, bucket)
+        cache.set(key, stats, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+    return stats
@@ -1,9 +1,28 @@
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+from types import ModuleType
+from unittest import mock
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from django.urls import reverse
+from django.urls import path, reverse
+from django.db import connection
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient, AsyncRequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from users.models import User
 from projects.models import Project, Contributor
-from .models import Issue, Comment
+from rest_framework_simplejwt.tokens import AccessToken
+from .models import Issue, Comment, ImportJob
+from .views import IssueViewSet, CommentViewSet
+from projects.async_views import in_event_loop
+from projects.cache import get_response_cache
+from projects.views import ProjectViewSet
+from .export import COMMENT_COLUMNS, ISSUE_COLUMNS, merge_comments
 
 
 class IssueViewSetTestCase(APITestCase):
@@ -40,6 +59,21 @@ class IssueViewSetTestCase(APITestCase):
         issue = Issue.objects.get()
         self.assertEqual(issue.title, 'Test Issue')
 
+    def test_create_issue_with_non_contributor_assignee(self):
+        """
+        Tests that an issue cannot be assigned to a user who does not contribute to the project.
+        """
+        response = self.client.post(reverse('project-issues-list', kwargs={'project_pk': self.project.id}),
+                                    {**self.issue_data, 'assignee': self.other_user.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('assignee', response.data)
+
+        Contributor.objects.create(user=self.other_user, project=self.project)
+        response = self.client.post(reverse('project-issues-list', kwargs={'project_pk': self.project.id}),
+                                    {**self.issue_data, 'assignee': self.other_user.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Issue.objects.get().assignee, self.other_user)
+
     def test_retrieve_issue_list(self):
         """
         Tests if a project contributor can retrieve the list of issues associated with a project.
@@ -79,6 +113,247 @@ class IssueViewSetTestCase(APITestCase):
         # Assert that the modification is forbidden
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_retrieve_issue_resolves_membership_once(self):
+        """
+        Test ensuring that both permission checks of a retrieve share a single membership lookup.
+        """
+        other_author = User.objects.create_user(username='user3', password='pass', age=30)
+        Contributor.objects.create(user=other_author, project=self.project)
+        issue = Issue.objects.create(**self.issue_data, author=other_author, project=self.project)
+
+        # One query resolves the membership, one loads the issue with its author's username
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('project-issues-detail', kwargs={'project_pk': self.project.id, 'pk': issue.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unknown_project_returns_not_found(self):
+        """
+        Test ensuring that requesting issues of a missing project answers 404 instead of failing.
+        """
+        response = self.client.get(reverse('project-issues-list', kwargs={'project_pk': 9999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_create_and_update_issues(self):
+        """
+        Tests that the bulk endpoint creates and updates issues in one call, reporting a result per item.
+        """
+        Contributor.objects.create(user=self.other_user, project=self.project)
+        issue = Issue.objects.create(**self.issue_data, author=self.user, project=self.project)
+        payload = [
+            {**self.issue_data, 'title': 'Bulk 1', 'assignee': self.other_user.id},
+            {**self.issue_data, 'title': 'Bulk 2'},
+            {'id': issue.id, 'status': 'FINISHED'},
+        ]
+
+        response = self.client.post(reverse('project-issues-bulk', kwargs={'project_pk': self.project.id}), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 201, 200])
+        self.assertEqual(response.data['results'][0]['data']['assignee'], self.other_user.id)
+        self.assertEqual(Issue.objects.count(), 3)
+        issue.refresh_from_db()
+        self.assertEqual(issue.status, 'FINISHED')
+
+    def test_bulk_rejects_whole_batch_on_invalid_item(self):
+        """
+        Tests that nothing is written when one item is invalid, and that each item reports its own outcome.
+        """
+        other_issue = Issue.objects.create(**self.issue_data, author=self.other_user, project=self.project)
+        payload = [
+            {**self.issue_data, 'title': 'Valid'},
+            {**self.issue_data, 'assignee': self.other_user.id},
+            {'id': other_issue.id, 'status': 'FINISHED'},
+        ]
+
+        response = self.client.post(reverse('project-issues-bulk', kwargs={'project_pk': self.project.id}), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([result['status'] for result in response.data['results']], [200, 400, 403])
+        self.assertIn('assignee', response.data['results'][1]['errors'])
+        self.assertEqual(Issue.objects.count(), 1)
+
+    def test_bulk_rejects_an_issue_updated_twice(self):
+        """
+        Tests that an issue listed twice in a batch is rejected on its repeated item, and nothing is written.
+        """
+        issue = Issue.objects.create(**self.issue_data, author=self.user, project=self.project)
+        payload = [{'id': issue.id, 'status': 'IN_PROGRESS'}, {'id': issue.id, 'status': 'FINISHED'}]
+
+        response = self.client.post(reverse('project-issues-bulk', kwargs={'project_pk': self.project.id}), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([result['status'] for result in response.data['results']], [200, 400])
+        self.assertIn('id', response.data['results'][1]['errors'])
+        issue.refresh_from_db()
+        self.assertEqual(issue.status, 'TO_DO')
+
+    def test_non_contributor_cannot_bulk_create(self):
+        """
+        Tests that the bulk endpoint enforces the project contributor check.
+        """
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.post(reverse('project-issues-bulk', kwargs={'project_pk': self.project.id}), [self.issue_data], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_issue_list_is_cached_until_a_write(self):
+        """
+        Tests that a repeated issue list is served from the cache and refreshed by creations, single or bulk.
+        """
+        url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+        self.client.get(url)
+
+        # Only the membership of the user is looked up
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data['count'], 0)
+
+        self.client.post(url, self.issue_data)
+        self.assertEqual(self.client.get(url).data['count'], 1)
+        self.client.post(reverse('project-issues-bulk', kwargs={'project_pk': self.project.id}), [self.issue_data], format='json')
+        self.assertEqual(self.client.get(url).data['count'], 2)
+
+    def test_removed_contributor_loses_cached_access(self):
+        """
+        Tests that a removed contributor gets 403 instead of cached responses and 304s, even when
+        removed outside of the API.
+        """
+        contribution = Contributor.objects.create(user=self.other_user, project=self.project)
+        self.client.force_authenticate(user=self.other_user)
+        url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.delete(reverse('project-users-detail', kwargs={'project_pk': self.project.id, 'pk': contribution.id}))
+        self.client.force_authenticate(user=self.other_user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        Contributor.objects.create(user=self.other_user, project=self.project)
+        etag = self.client.get(url)['ETag']
+        Contributor.objects.filter(user=self.other_user).delete()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_issue_deletion_removes_comments_with_one_statement(self):
+        """
+        Tests that deleting an issue deletes its comments with a single DELETE, without loading them.
+        """
+        issue = Issue.objects.create(**self.issue_data, author=self.user, project=self.project)
+        Comment.objects.bulk_create([Comment(text=str(number), issue=issue, author=self.user) for number in range(5)])
+        url = reverse('project-issues-detail', kwargs={'project_pk': self.project.id, 'pk': issue.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        comment_queries = [query['sql'] for query in queries.captured_queries if '"issues_comment"' in query['sql']]
+        self.assertEqual(len(comment_queries), 1)
+        self.assertTrue(comment_queries[0].startswith('DELETE'))
+        self.assertFalse(Comment.objects.filter(issue_id=issue.id).exists())
+
+    def test_conditional_get_answers_not_modified(self):
+        """
+        Tests that replaying the ETag of an issue list answers 304 with only the membership query, until an issue is created.
+        """
+        url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(url, self.issue_data)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_writes_of_other_processes_invalidate_etags_and_cache(self):
+        """
+        Tests that a write handled by a process with another local response cache still moves the ETag and the cached list.
+        """
+        url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+        etag = self.client.get(url)['ETag']
+
+        with override_settings(RESPONSE_CACHE_ALIAS='default'):
+            self.client.post(url, self.issue_data)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_conditional_get_still_checks_permissions(self):
+        """
+        Tests that an outsider gets 403, whether they replay another user's ETag or send If-Modified-Since.
+        """
+        url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+        response = self.client.get(url)
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_filter_and_order_issue_list(self):
+        """
+        Tests that the issue list is filtered by status and assignee and ordered by priority rank.
+        """
+        Contributor.objects.create(user=self.other_user, project=self.project)
+        for title, priority, issue_status, assignee in [('Low', 'LOW', 'TO_DO', None), ('High', 'HIGH', 'TO_DO', self.other_user),
+                                                        ('Medium', 'MEDIUM', 'TO_DO', self.other_user), ('Done', 'HIGH', 'FINISHED', None)]:
+            Issue.objects.create(title=title, description='', tag='BUG', priority=priority, status=issue_status,
+                                 assignee=assignee, project=self.project, author=self.user)
+        url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+
+        response = self.client.get(url, {'status': 'TO_DO', 'ordering': '-priority'})
+        self.assertEqual([issue['title'] for issue in response.data['results']], ['High', 'Medium', 'Low'])
+        response = self.client.get(url, {'assignee': f'{self.other_user.id},none', 'status': 'TO_DO'})
+        self.assertEqual(response.data['count'], 3)
+        response = self.client.get(url, {'assignee': 'none'})
+        self.assertEqual(response.data['count'], 2)
+
+        response = self.client.get(url, {'status': 'DONE'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('status', response.data)
+
+    def test_sparse_fieldset_narrows_columns_and_output(self):
+        """
+        Tests that `?fields=` limits both the serialized fields and the selected columns.
+        """
+        Issue.objects.create(**self.issue_data, author=self.user, project=self.project)
+        url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'id,title,status'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'status'})
+        page_query = queries.captured_queries[-1]['sql']
+        self.assertNotIn('"description"', page_query)
+        self.assertNotIn('users_user', page_query)
+
+        response = self.client.get(url, {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sparse_fieldset_keeps_keyset_pages_at_one_query(self):
+        """
+        Tests that keyset pages of a sparse fieldset load the ordering columns with the page, not per boundary row.
+        """
+        for number in range(5):
+            Issue.objects.create(**{**self.issue_data, 'title': f'Issue {number}'}, author=self.user, project=self.project)
+        url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+
+        def page_queries(page_url, params=None):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(page_url, params)
+            return response, len(queries.captured_queries)
+
+        full, full_count = page_queries(url, {'pagination': 'cursor', 'limit': 2})
+        sparse, sparse_count = page_queries(url, {'pagination': 'cursor', 'limit': 2, 'fields': 'id,title'})
+        self.assertEqual(sparse_count, full_count)
+        self.assertEqual(set(sparse.data['results'][0]), {'id', 'title'})
+
+        _, full_count = page_queries(full.data['next'])
+        _, sparse_count = page_queries(sparse.data['next'])
+        self.assertEqual(sparse_count, full_count)
+
 
 class CommentViewSetTestCase(APITestCase):
     """
@@ -115,6 +390,20 @@ class CommentViewSetTestCase(APITestCase):
         comment = Comment.objects.get()
         self.assertEqual(comment.text, 'Test Comment')
 
+    def test_saving_a_comment_reads_only_the_project_id_of_its_issue(self):
+        """
+        Tests that the invalidation and event of a saved comment use its loaded issue, or read only its project id once.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            Comment.objects.create(**self.comment_data, author=self.user, issue=self.issue)
+        self.assertFalse([query for query in queries.captured_queries if query['sql'].startswith('SELECT')])
+
+        with CaptureQueriesContext(connection) as queries:
+            Comment.objects.create(**self.comment_data, author_id=self.user.id, issue_id=self.issue.id)
+        selects = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1)
+        self.assertTrue(selects[0].startswith('SELECT "issues_issue"."project_id" AS "project_id" FROM'))
+
     def test_retrieve_comment_list(self):
         """
         Tests if a project contributor can retrieve the list of comments associated with an issue.
@@ -169,4 +458,685 @@ class CommentViewSetTestCase(APITestCase):
         response = self.client.put(reverse('issue-comments-detail', kwargs={'project_pk': self.project.id, 'issue_pk': self.issue.id, 'pk': comment.id}), {'text': 'Unauthorized Comment Change'})
         
         # Assert that the modification attempt is forbidden (HTTP 403 status code)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_cursor_pagination_walks_all_comments(self):
+        """
+        Tests that the keyset pagination mode returns every comment exactly once, in creation order, without a count.
+        """
+        comments = [Comment.objects.create(text=f'Comment {i}', author=self.user, issue=self.issue) for i in range(5)]
+        url = reverse('issue-comments-list', kwargs={'project_pk': self.project.id, 'issue_pk': self.issue.id})
+
+        seen = []
+        response = self.client.get(url, {'pagination': 'cursor', 'limit': 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen += [comment['id'] for comment in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(seen, [str(comment.id) for comment in comments])
+
+    def test_limit_offset_pagination_without_count(self):
+        """
+        Tests that `count=false` keeps limit/offset pages but skips the total count.
+        """
+        for i in range(3):
+            Comment.objects.create(text=f'Comment {i}', author=self.user, issue=self.issue)
+        url = reverse('issue-comments-list', kwargs={'project_pk': self.project.id, 'issue_pk': self.issue.id})
+
+        response = self.client.get(url, {'count': 'false', 'limit': 2})
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+
+class SearchTestCase(APITestCase):
+    """
+    Test suite for the full-text search of /projects/<pk>/search/.
+    """
+
+    def setUp(self):
+        """
+        Creates a project with a contributor, an issue and a comment, and another project with a matching issue.
+        """
+        self.user = User.objects.create_user(username='searcher', password='pass', age=30)
+        self.project = Project.objects.create(title='Search', description='', type='back-end', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issue = Issue.objects.create(title='Login crash', description='The app crashes when logging in.',
+                                          tag='BUG', priority='HIGH', project=self.project, author=self.user)
+        self.comment = Comment.objects.create(text='Reproduced the crash on the login page.', issue=self.issue, author=self.user)
+        other_project = Project.objects.create(title='Other', description='', type='ios', author=self.user)
+        Issue.objects.create(title='Login crash elsewhere', description='', tag='BUG', priority='LOW',
+                             project=other_project, author=self.user)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('project-search', kwargs={'pk': self.project.id})
+
+    def test_search_ranks_and_highlights_issues_and_comments(self):
+        """
+        Tests that issues and comments of the project only are found, the title match first, with highlights.
+        """
+        response = self.client.get(self.url, {'q': 'login crashes'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        hits = response.data['results']
+        self.assertEqual([(hit['type'], hit['id']) for hit in hits], [('issue', self.issue.id), ('comment', str(self.comment.id))])
+        self.assertIn('<mark>Login</mark>', hits[0]['snippet'])
+        self.assertEqual(hits[1]['title'], 'Login crash')
+
+    def test_search_index_follows_writes(self):
+        """
+        Tests that updates, bulk creations and set-based deletes are reflected in the search results.
+        """
+        self.issue.title = 'Signup freeze'
+        self.issue.save()
+        Issue.objects.bulk_create([Issue(title='Timeout on signup', description='', tag='BUG', priority='LOW',
+                                         project=self.project, author=self.user)])
+        Comment.objects.filter(pk=self.comment.pk).delete()
+
+        response = self.client.get(self.url, {'q': 'signup'})
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get(self.url, {'q': 'reproduced'})
+        self.assertEqual(response.data['results'], [])
+
+    @override_settings(ISSUE_SEARCH_BACKEND='issues.search.BasicSearchBackend')
+    def test_fallback_backend_and_permissions(self):
+        """
+        Tests the icontains fallback backend, and that outsiders cannot search the project.
+        """
+        response = self.client.get(self.url, {'q': 'crash'})
+        self.assertEqual({hit['type'] for hit in response.data['results']}, {'issue', 'comment'})
+        self.assertIn('<mark>crash</mark>', response.data['results'][1]['snippet'])
+
+        self.client.force_authenticate(user=User.objects.create_user(username='outsider', password='pass', age=30))
+        response = self.client.get(self.url, {'q': 'crash'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ExportTestCase(APITestCase):
+    """
+    Test suite for the streaming export of /projects/<pk>/export/.
+    """
+
+    def setUp(self):
+        """
+        Creates a project with two issues, the first one having two comments.
+        """
+        self.user = User.objects.create_user(username='exporter', password='pass', age=30)
+        self.project = Project.objects.create(title='Export', description='', type='back-end', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issues = [
+            Issue.objects.create(title=f'Issue {i}', description='Line one,\nline "two"', tag='BUG', priority='LOW',
+                                 project=self.project, author=self.user)
+            for i in range(2)
+        ]
+        self.comments = [Comment.objects.create(text=f'Comment {i}', issue=self.issues[0], author=self.user) for i in range(2)]
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('project-export', kwargs={'pk': self.project.id})
+
+    def read_lines(self, response):
+        """
+        Returns the lines of a streamed response.
+        """
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_ndjson_export_nested_and_flat(self):
+        """
+        Tests that NDJSON exports nest comments in their issue by default, or write them after it with comments=flat.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertIn('attachment', response['Content-Disposition'])
+        lines = [json.loads(line) for line in self.read_lines(response)]
+        self.assertEqual([line['id'] for line in lines], [issue.id for issue in self.issues])
+        self.assertEqual([comment['text'] for comment in lines[0]['comments']], ['Comment 0', 'Comment 1'])
+        self.assertEqual(lines[1]['comments'], [])
+        self.assertEqual(lines[0]['author'], 'exporter')
+
+        lines = [json.loads(line) for line in self.read_lines(self.client.get(self.url, {'comments': 'flat'}))]
+        self.assertEqual([line['type'] for line in lines], ['issue', 'comment', 'comment', 'issue'])
+        self.assertEqual(lines[1]['issue'], self.issues[0].id)
+
+    def test_csv_export(self):
+        """
+        Tests that CSV exports write a header, then issue rows each followed by their comment rows.
+        """
+        response = self.client.get(self.url, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([(row['type'], row['issue']) for row in rows],
+                         [('issue', str(self.issues[0].id))] + [('comment', str(self.issues[0].id))] * 2
+                         + [('issue', str(self.issues[1].id))])
+        self.assertEqual(rows[0]['description'], 'Line one,\nline "two"')
+        self.assertEqual(rows[2]['text'], 'Comment 1')
+
+        response = self.client.get(self.url, {'format': 'csv', 'comments': 'nested'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_comments_of_a_missing_issue_are_skipped(self):
+        """
+        Tests that the merge skips comments whose issue is missing from the issue rows, and keeps the following ones.
+        """
+        issues = [(issue_id,) + (None,) * (len(ISSUE_COLUMNS) - 1) for issue_id in (1, 3)]
+        comments = [(comment_id, issue_id) + (None,) * (len(COMMENT_COLUMNS) - 2)
+                    for comment_id, issue_id in ((10, 1), (20, 2), (30, 3))]
+        records = merge_comments(issues, comments)
+        self.assertEqual([(record_type, row['id']) for record_type, row in records],
+                         [('issue', 1), ('comment', 10), ('issue', 3), ('comment', 30)])
+
+    async def test_export_streams_under_asgi(self):
+        """
+        Tests that under ASGI the export is an async stream, read chunk by chunk instead of whole by Django.
+        """
+        request = AsyncRequestFactory().get(self.url, headers={'Authorization': f'Bearer {AccessToken.for_user(self.user)}'})
+        view = ProjectViewSet.as_view({'get': 'export'})
+        response = await sync_to_async(view)(request, pk=self.project.id)
+        self.assertTrue(response.is_async)
+        lines = b''.join([chunk async for chunk in response]).decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [issue.id for issue in self.issues])
+
+    def test_outsider_cannot_export(self):
+        """
+        Tests that a user outside of the project gets a 404.
+        """
+        self.client.force_authenticate(user=User.objects.create_user(username='outsider', password='pass', age=30))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ImportTestCase(APITestCase):
+    """
+    Test suite for the NDJSON import of /projects/<pk>/issues/import/ and the import_project command.
+    """
+
+    def setUp(self):
+        """
+        Creates a project with two contributors.
+        """
+        self.user = User.objects.create_user(username='importer', password='pass', age=30)
+        self.member = User.objects.create_user(username='member', password='pass', age=30)
+        self.project = Project.objects.create(title='Import', description='', type='back-end', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        Contributor.objects.create(user=self.member, project=self.project)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('project-issues-import', kwargs={'project_pk': self.project.id})
+
+    def issue_line(self, title, **fields):
+        """
+        Returns the NDJSON line of an issue authored by the importer.
+        """
+        return json.dumps({'title': title, 'description': 'Imported', 'tag': 'BUG', 'priority': 'LOW',
+                           'author': 'importer', **fields}) + '\n'
+
+    def test_import_round_trips_an_export(self):
+        """
+        Tests that a nested export of a project imports into another one, with its comments and assignees.
+        """
+        issue = Issue.objects.create(title='Exported', description='Text', tag='TASK', priority='HIGH',
+                                     project=self.project, author=self.user, assignee=self.member)
+        Comment.objects.create(text='First', issue=issue, author=self.member)
+        export = b''.join(self.client.get(reverse('project-export', kwargs={'pk': self.project.id})).streaming_content)
+
+        target = Project.objects.create(title='Target', description='', type='ios', author=self.user)
+        Contributor.objects.create(user=self.user, project=target)
+        Contributor.objects.create(user=self.member, project=target)
+        response = self.client.post(reverse('project-issues-import', kwargs={'project_pk': target.id}),
+                                    export, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['issues'], response.data['comments']), (1, 1))
+        self.assertIn('rows_per_second', response.data)
+
+        imported = Issue.objects.get(project=target)
+        self.assertEqual((imported.title, imported.priority, imported.assignee_id), ('Exported', 'HIGH', self.member.id))
+        # Rows uploaded through the API are authored by the uploader, not by the users named in the lines
+        self.assertEqual(imported.author_id, self.user.id)
+        self.assertEqual(list(imported.comments.values_list('text', 'author_id')), [('First', self.user.id)])
+
+    def test_invalid_line_imports_nothing(self):
+        """
+        Tests that an invalid line, here an assignee outside of the project, aborts the whole import with its line number.
+        """
+        User.objects.create_user(username='outsider', password='pass', age=30)
+        body = self.issue_line('Valid') + '\n' + self.issue_line('Invalid', assignee='outsider')
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()['line'], 3)
+        self.assertIn('assignee', response.data['errors'])
+        self.assertEqual(ImportJob.objects.get(pk=response.data['job']).status, 'FAILED')
+        self.assertFalse(Issue.objects.filter(project=self.project).exists())
+
+    def test_command_imports_flat_lines_in_batches(self):
+        """
+        Tests that the import_project command imports flat comment lines across several batches and reports its throughput.
+        """
+        lines = []
+        for i in range(5):
+            lines.append(self.issue_line(f'Issue {i}', type='issue', id=100 + i, assignee='member'))
+            lines.append(json.dumps({'type': 'comment', 'issue': 100 + i, 'text': f'Comment {i}', 'author': 'member'}) + '\n')
+        path = os.path.join(tempfile.mkdtemp(), 'issues.ndjson')
+        with open(path, 'w') as file:
+            file.writelines(lines)
+
+        output = io.StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('import_project', self.project.id, path, batch_size=4, stdout=output)
+        self.assertIn('Imported 5 issues and 5 comments', output.getvalue())
+        self.assertIn('rows/s', output.getvalue())
+        self.assertEqual(
+            sorted(Comment.objects.filter(issue__project=self.project).values_list('issue__title', 'text')),
+            [(f'Issue {i}', f'Comment {i}') for i in range(5)],
+        )
+        # The command keeps the authors named in the lines
+        self.assertEqual(set(Comment.objects.filter(issue__project=self.project).values_list('author__username', flat=True)), {'member'})
+        # The usernames are resolved once, however many batches use them
+        self.assertEqual(sum('"users_user"."username" IN' in query['sql'] for query in queries.captured_queries), 1)
+
+    def test_command_resumes_after_an_invalid_line(self):
+        """
+        Tests that the batches committed before an invalid line are kept, and that the import resumes after them,
+        flat comments of a single issue being split across batches.
+        """
+        lines = [self.issue_line('Long', type='issue', id=1)]
+        lines += [json.dumps({'type': 'comment', 'issue': 1, 'text': f'Comment {i}', 'author': 'member'}) + '\n' for i in range(5)]
+        lines += [self.issue_line('Last', type='issue', id=2, author='nobody')]
+        path = os.path.join(tempfile.mkdtemp(), 'issues.ndjson')
+        with open(path, 'w') as file:
+            file.writelines(lines)
+
+        with self.assertRaisesMessage(CommandError, 'Line 7 is invalid') as raised:
+            call_command('import_project', self.project.id, path, batch_size=2, stdout=io.StringIO())
+        self.assertIn('1 issues and 5 comments were imported', str(raised.exception))
+        job = ImportJob.objects.get(project_id=self.project.id)
+        self.assertEqual((job.status, job.line), ('FAILED', 6))
+        self.assertEqual(Issue.objects.get(project=self.project).comment_count, 5)
+
+        lines[-1] = self.issue_line('Last', type='issue', id=2)
+        lines.append(json.dumps({'type': 'comment', 'issue': 2, 'text': 'Final', 'author': 'member'}) + '\n')
+        with open(path, 'w') as file:
+            file.writelines(lines)
+        output = io.StringIO()
+        call_command('import_project', self.project.id, path, batch_size=2, resume=str(job.pk), stdout=output)
+        self.assertIn('Imported 1 issues and 1 comments', output.getvalue())
+        self.assertEqual(sorted(Issue.objects.filter(project=self.project).values_list('title', 'comment_count')),
+                         [('Last', 1), ('Long', 5)])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.issues, job.comments), ('DONE', 2, 6))
+
+
+class CountersTestCase(APITestCase):
+    """
+    Test suite for the issue counters of projects and the comment counters of issues.
+    """
+
+    def setUp(self):
+        """
+        Creates a project with its author as contributor.
+        """
+        self.user = User.objects.create_user(username='counter', password='pass', age=30)
+        self.project = Project.objects.create(title='Counters', description='', type='back-end', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.client.force_authenticate(user=self.user)
+        self.issues_url = reverse('project-issues-list', kwargs={'project_pk': self.project.id})
+
+    def counts(self):
+        """
+        Returns the issue counters of the project, as exposed by the project detail.
+        """
+        data = self.client.get(reverse('project-detail', kwargs={'pk': self.project.id})).data
+        return data['to_do_count'], data['in_progress_count'], data['finished_count']
+
+    def test_counters_follow_api_writes(self):
+        """
+        Tests that creating, moving and deleting issues and comments through the API updates the counters.
+        """
+        issue = self.client.post(self.issues_url, {'title': 'A', 'description': 'x', 'tag': 'BUG', 'priority': 'LOW'}).data
+        self.client.post(self.issues_url, {'title': 'B', 'description': 'x', 'tag': 'BUG', 'priority': 'LOW',
+                                           'status': 'IN_PROGRESS'})
+        self.assertEqual(self.counts(), (1, 1, 0))
+
+        issue_url = reverse('project-issues-detail', kwargs={'project_pk': self.project.id, 'pk': issue['id']})
+        self.client.patch(issue_url, {'status': 'FINISHED'})
+        self.assertEqual(self.counts(), (0, 1, 1))
+
+        comments_url = reverse('issue-comments-list', kwargs={'project_pk': self.project.id, 'issue_pk': issue['id']})
+        comment = self.client.post(comments_url, {'text': 'First'}).data
+        self.client.post(comments_url, {'text': 'Second'})
+        self.assertEqual(self.client.get(issue_url).data['comment_count'], 2)
+        self.client.delete(reverse('issue-comments-detail', kwargs={
+            'project_pk': self.project.id, 'issue_pk': issue['id'], 'pk': comment['id']}))
+        self.assertEqual(self.client.get(issue_url).data['comment_count'], 1)
+
+        self.client.delete(issue_url)
+        self.assertEqual(self.counts(), (0, 1, 0))
+
+    def test_counters_follow_bulk_writes_and_imports(self):
+        """
+        Tests that bulk writes and imports update the counters, issues imported with comments included.
+        """
+        issue = Issue.objects.create(title='Stored', description='', tag='BUG', priority='LOW',
+                                     project=self.project, author=self.user)
+        call_command('repair_counters', stdout=io.StringIO())
+        response = self.client.post(reverse('project-issues-bulk', kwargs={'project_pk': self.project.id}), [
+            {'id': issue.id, 'status': 'FINISHED'},
+            {'title': 'New', 'description': 'x', 'tag': 'TASK', 'priority': 'LOW', 'status': 'IN_PROGRESS'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(), (0, 1, 1))
+
+        line = json.dumps({'title': 'Imported', 'description': 'x', 'tag': 'BUG', 'priority': 'LOW', 'author': 'counter',
+                           'comments': [{'text': 'One', 'author': 'counter'}, {'text': 'Two', 'author': 'counter'}]})
+        self.client.post(reverse('project-issues-import', kwargs={'project_pk': self.project.id}),
+                         line, content_type='application/x-ndjson')
+        self.assertEqual(self.counts(), (1, 1, 1))
+        self.assertEqual(Issue.objects.get(title='Imported').comment_count, 2)
+
+    def test_counters_ignore_a_batch_updating_an_issue_twice(self):
+        """
+        Tests that a bulk batch listing the same issue twice is rejected and leaves the counters unchanged.
+        """
+        issue = Issue.objects.create(title='Twice', description='', tag='BUG', priority='LOW',
+                                     project=self.project, author=self.user)
+        call_command('repair_counters', stdout=io.StringIO())
+        response = self.client.post(reverse('project-issues-bulk', kwargs={'project_pk': self.project.id}), [
+            {'id': issue.id, 'status': 'FINISHED'},
+            {'id': issue.id, 'status': 'FINISHED'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.counts(), (1, 0, 0))
+
+    def test_repair_counters_fixes_drifted_rows(self):
+        """
+        Tests that repair_counters recomputes counters left wrong by writes outside of the API.
+        """
+        issue = Issue.objects.create(title='Raw', description='', tag='BUG', priority='LOW', status='FINISHED',
+                                     project=self.project, author=self.user)
+        Comment.objects.create(text='Raw', issue=issue, author=self.user)
+        Project.objects.filter(pk=self.project.pk).update(to_do_count=7)
+
+        output = io.StringIO()
+        call_command('repair_counters', project=[self.project.id], stdout=output)
+        self.assertIn('1 projects and 1 issues', output.getvalue())
+        self.assertEqual(self.counts(), (0, 0, 1))
+        self.assertEqual(Issue.objects.get(pk=issue.pk).comment_count, 1)
+
+        output = io.StringIO()
+        call_command('repair_counters', stdout=output)
+        self.assertIn('0 projects and 0 issues', output.getvalue())
+
+
+class StatsTestCase(APITestCase):
+    """
+    Test suite for the issue statistics of /projects/<pk>/stats/.
+    """
+
+    def setUp(self):
+        """
+        Creates a project with issues created over two weeks, one of them finished.
+        """
+        self.user = User.objects.create_user(username='manager', password='pass', age=30)
+        self.project = Project.objects.create(title='Stats', description='', type='back-end', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('project-stats', kwargs={'pk': self.project.id})
+
+        # Wednesday 2024-01-03 and Monday 2024-01-08, in two consecutive weeks
+        for day, status_value, tag in ((3, 'TO_DO', 'BUG'), (3, 'FINISHED', 'BUG'), (8, 'IN_PROGRESS', 'TASK')):
+            issue = Issue.objects.create(title='Issue', description='', tag=tag, priority='HIGH', status=status_value,
+                                         project=self.project, author=self.user)
+            moment = datetime.datetime(2024, 1, day, 15, 30, tzinfo=datetime.timezone.utc)
+            finished_time = moment + datetime.timedelta(days=7) if status_value == 'FINISHED' else None
+            Issue.objects.filter(pk=issue.pk).update(created_time=moment, updated_time=moment + datetime.timedelta(days=7),
+                                                     finished_time=finished_time)
+
+    def test_stats_group_and_bucket_issues(self):
+        """
+        Tests the counts per field and the weekly and monthly histograms with their open issues.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(response.data['by_status'], {'TO_DO': 1, 'IN_PROGRESS': 1, 'FINISHED': 1})
+        self.assertEqual(response.data['by_priority'], {'LOW': 0, 'MEDIUM': 0, 'HIGH': 3})
+        self.assertEqual(response.data['by_tag'], {'BUG': 2, 'FEATURE': 0, 'TASK': 1})
+        self.assertEqual(response.json()['histogram'], [
+            {'period': '2024-01-01', 'created': 2, 'finished': 0, 'open': 2},
+            {'period': '2024-01-08', 'created': 1, 'finished': 1, 'open': 2},
+        ])
+
+        monthly = self.client.get(self.url, {'bucket': 'month'}).json()['histogram']
+        self.assertEqual(monthly, [{'period': '2024-01-01', 'created': 3, 'finished': 1, 'open': 2}])
+        self.assertEqual(self.client.get(self.url, {'bucket': 'year'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stats_are_cached_until_an_issue_changes(self):
+        """
+        Tests that repeated reads run no aggregate query, and that an issue write refreshes the statistics.
+        """
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse(any('COUNT' in query['sql'] for query in queries.captured_queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('project-issues-list', kwargs={'project_pk': self.project.id}),
+                             {'title': 'New', 'description': 'x', 'tag': 'FEATURE', 'priority': 'LOW'})
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['total'], 4)
+        self.assertEqual(response.data['by_tag']['FEATURE'], 1)
+
+    def test_finished_time_survives_edits(self):
+        """
+        Tests that editing a finished issue keeps its finished period, and that status changes set or clear it.
+        """
+        finished = Issue.objects.get(project=self.project, status='FINISHED')
+        issue_url = reverse('project-issues-detail', kwargs={'project_pk': self.project.id, 'pk': finished.id})
+        self.client.patch(issue_url, {'title': 'Renamed'})
+        finished.refresh_from_db()
+        self.assertEqual(finished.finished_time, datetime.datetime(2024, 1, 10, 15, 30, tzinfo=datetime.timezone.utc))
+        self.assertEqual(self.client.get(self.url).json()['histogram'][1]['finished'], 1)
+
+        bulk_url = reverse('project-issues-bulk', kwargs={'project_pk': self.project.id})
+        self.client.post(bulk_url, [{'id': finished.id, 'status': 'IN_PROGRESS'}], format='json')
+        finished.refresh_from_db()
+        self.assertIsNone(finished.finished_time)
+
+        response = self.client.patch(issue_url, {'status': 'FINISHED'})
+        self.assertIsNotNone(response.data['finished_time'])
+        self.assertGreater(Issue.objects.get(pk=finished.id).finished_time, finished.updated_time)
+
+    def test_stats_are_limited_to_members(self):
+        """
+        Tests that users outside of the project cannot read its statistics.
+        """
+        outsider = User.objects.create_user(username='statsoutsider', password='pass', age=30)
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class MyIssuesTestCase(APITestCase):
+    """
+    Test suite for the cross-project issue queue of /me/issues/.
+    """
+
+    def setUp(self):
+        """
+        Creates a user contributing to two projects and formerly to a third, with issues assigned to them in each.
+        """
+        self.user = User.objects.create_user(username='worker', password='pass', age=30)
+        self.other = User.objects.create_user(username='manager', password='pass', age=30)
+        self.projects = [Project.objects.create(title=f'Project {i}', description='', type='back-end', author=self.other)
+                         for i in range(3)]
+        for project in self.projects[:2]:
+            Contributor.objects.create(user=self.user, project=project)
+
+        self.assigned = [
+            Issue.objects.create(title=f'Assigned {i}', description='', tag='BUG', priority='LOW', status=status_value,
+                                 project=project, author=self.other, assignee=self.user)
+            for i, (project, status_value) in enumerate(zip(self.projects, ('TO_DO', 'IN_PROGRESS', 'TO_DO')))
+        ]
+        self.authored = Issue.objects.create(title='Authored', description='', tag='TASK', priority='HIGH',
+                                             project=self.projects[0], author=self.user, assignee=self.other)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('my-issues')
+
+    def test_lists_issues_of_the_user_in_their_projects(self):
+        """
+        Tests that assigned or authored issues are listed across projects, except in projects the user left.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([issue['id'] for issue in response.data['results']], [issue.id for issue in self.assigned[:2]])
+
+        response = self.client.get(self.url, {'status': 'TO_DO'})
+        self.assertEqual([issue['id'] for issue in response.data['results']], [self.assigned[0].id])
+
+        response = self.client.get(self.url, {'role': 'author'})
+        self.assertEqual([issue['id'] for issue in response.data['results']], [self.authored.id])
+        self.assertEqual(response.data['results'][0]['author'], 'worker')
+
+        self.assertEqual(self.client.get(self.url, {'role': 'watcher'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_keyset_pages_run_one_query(self):
+        """
+        Tests that the queue is walked with cursor links, each page costing a single query.
+        """
+        Contributor.objects.create(user=self.user, project=self.projects[2])
+
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(self.url, {'limit': 2})
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([issue['id'] for issue in first.data['results']], [issue.id for issue in self.assigned[:2]])
+        self.assertNotIn('count', first.data)
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual([issue['id'] for issue in second.data['results']], [self.assigned[2].id])
+        self.assertIsNone(second.data['next'])
+
+
+class AsyncViewSetTestCase(APITestCase):
+    """
+    Test suite for the issue and comment viewsets served with ASYNC_VIEWS enabled.
+
+    The async views are mounted on their own URLconf and requested through the ASGI handler,
+    where any query run by the synchronous ORM from the event loop would fail the request.
+    """
+
+    def setUp(self):
+        """
+        Sets up a project with issues and comments, and the URLconf of the async views.
+        """
+        self.user = User.objects.create_user(username='user1', password='pass', age=30)
+        self.outsider = User.objects.create_user(username='user2', password='pass', age=30)
+        self.project = Project.objects.create(title='Test Project', description='Description', type='back-end', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issues = [
+            Issue.objects.create(title=f'Issue {i}', description='Description', tag='BUG', priority='LOW', project=self.project, author=self.user)
+            for i in range(3)
+        ]
+        self.comment = Comment.objects.create(text='Comment', issue=self.issues[0], author=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.urlconf = ModuleType('async_urls')
+        with override_settings(ASYNC_VIEWS=True):
+            self.urlconf.urlpatterns = [
+                path('projects/<project_pk>/issues/', IssueViewSet.as_view({'get': 'list', 'post': 'create'}), name='project-issues-list'),
+                path('projects/<project_pk>/issues/<pk>/', IssueViewSet.as_view({'get': 'retrieve', 'patch': 'partial_update'}), name='project-issues-detail'),
+                path('projects/<project_pk>/issues/<issue_pk>/comments/', CommentViewSet.as_view({'get': 'list'}), name='issue-comments-list'),
+                path('projects/<project_pk>/issues/<issue_pk>/comments/<pk>/', CommentViewSet.as_view({'get': 'retrieve'}), name='issue-comments-detail'),
+            ]
+        self.issues_url = f'/projects/{self.project.id}/issues/'
+        self.comments_url = f'{self.issues_url}{self.issues[0].id}/comments/'
+
+    def auth_headers(self, user):
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def test_views_are_async_only_when_enabled(self):
+        """
+        Tests that the views are coroutine functions with ASYNC_VIEWS, and regular views without it.
+        """
+        self.assertTrue(iscoroutinefunction(self.urlconf.urlpatterns[0].callback))
+        self.assertFalse(iscoroutinefunction(IssueViewSet.as_view({'get': 'list'})))
+
+    async def test_reads_match_the_regular_views(self):
+        """
+        Tests that lists in every pagination mode and details are the responses of the regular views.
+        """
+        client = AsyncClient()
+        headers = self.auth_headers(self.user)
+        urls = [
+            self.issues_url,
+            f'{self.issues_url}?limit=2&offset=1',
+            f'{self.issues_url}?limit=2&count=false',
+            f'{self.issues_url}?pagination=cursor&limit=2',
+            f'{self.issues_url}?fields=id,title&status=TO_DO',
+            f'{self.issues_url}{self.issues[1].id}/',
+            self.comments_url,
+            f'{self.comments_url}{self.comment.id}/',
+        ]
+        for url in urls:
+            expected = await sync_to_async(self.client.get)(url)
+            with override_settings(ROOT_URLCONF=self.urlconf):
+                response = await client.get(url, headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(response.json(), expected.json(), url)
+
+    async def test_reads_go_through_the_view_hooks(self):
+        """
+        Tests that authentication, permissions, lookups and conditional requests apply to the async views.
+        """
+        with override_settings(ROOT_URLCONF=self.urlconf):
+            client = AsyncClient()
+            response = await client.get(self.issues_url)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            response = await client.get(self.issues_url, headers=self.auth_headers(self.outsider))
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+            headers = self.auth_headers(self.user)
+            for url in ['/projects/0/issues/', f'{self.issues_url}0/', f'{self.issues_url}x/']:
+                self.assertEqual((await client.get(url, headers=headers)).status_code, status.HTTP_404_NOT_FOUND, url)
+
+            response = await client.get(f'{self.issues_url}{self.issues[0].id}/', headers=headers)
+            self.assertIn('Authorization', response['Vary'])
+            response = await client.get(f'{self.issues_url}{self.issues[0].id}/', headers={**headers, 'If-None-Match': response['ETag']})
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_cache_is_not_blocked_on_in_the_event_loop(self):
+        """
+        Tests that the reads look up and fill the response cache through its async API only.
+        """
+        cache = get_response_cache()
+
+        class AsyncOnlyCache:
+            def __getattr__(self, name):
+                if name in ('get', 'set', 'add', 'get_many', 'set_many') and in_event_loop():
+                    raise AssertionError(f"cache.{name}() called in the event loop")
+                return getattr(cache, name)
+
+        headers = self.auth_headers(self.user)
+        with override_settings(ROOT_URLCONF=self.urlconf), mock.patch('projects.cache.get_response_cache', AsyncOnlyCache):
+            for _ in range(2):
+                response = await AsyncClient().get(self.issues_url, headers=headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = await AsyncClient().get(self.issues_url, headers={**headers, 'If-None-Match': response['ETag']})
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_writes_run_in_a_thread(self):
+        """
+        Tests that the other actions of the async views run the regular handlers.
+        """
+        with override_settings(ROOT_URLCONF=self.urlconf):
+            response = await AsyncClient().patch(
+                f'{self.issues_url}{self.issues[0].id}/', {'status': 'IN_PROGRESS'}, content_type='application/json',
+                headers=self.auth_headers(self.user))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        issue = await Issue.objects.aget(pk=self.issues[0].id)
+        self.assertEqual(issue.status, 'IN_PROGRESS')
@@ -1,15 +1,33 @@
-from rest_framework import viewsets, permissions
-from .models import Issue, Comment
-from projects.models import Project
-from .serializers import IssueSerializer, CommentSerializer
+from rest_framework import mixins, viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.db import transaction
+from collections import Counter
+from django.utils import timezone
+from .models import Issue, Comment, finished_time_for
+from projects.async_views import AsyncViewSetMixin
+from projects.cache import CachedResponseMixin, bump_project_versions
+from projects.conditional import ConditionalGetMixin
+from projects.events import build_event, publish_on_commit
+from projects.models import Project, Contributor
+from users.authentication import get_user_instance
+from .serializers import IssueSerializer, IssueBulkItemSerializer, CommentSerializer
+from .importer import ProjectImporter, get_resumable_job
+from .counters import add_comment_counts, add_issue_counts
+from .filters import IssueFilterBackend, IssueOrderingFilter, split_values
 from .permissions import IsIssueAuthorOrProjectContributor, IsCommentAuthorOrProjectContributor
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError
+from tasktracker.pagination import KeysetPagination, uses_keyset_pagination
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(ConditionalGetMixin, CachedResponseMixin, AsyncViewSetMixin, viewsets.ModelViewSet):
     """
     A viewset for handling the creation, retrieval, updating, and deletion of issues.
-    
+
+    Issue lists are served from the response cache until the project data changes, and
+    reads answer conditional requests with 304 Not Modified. With ASYNC_VIEWS enabled,
+    reads run in the event loop.
+
     Attributes:
         queryset (QuerySet): QuerySet that contains all issues with their related project.
         serializer_class (IssueSerializer): The serializer that handles issue instances.
@@ -17,18 +35,79 @@ class IssueViewSet(viewsets.ModelViewSet):
                                    authentication and issue-specific permissions.
                                    
     """
-    queryset = Issue.objects.select_related('project').all()
+    queryset = Issue.objects.select_related('author').all()
     serializer_class = IssueSerializer
     permission_classes = [permissions.IsAuthenticated, IsIssueAuthorOrProjectContributor]
+    filter_backends = [IssueFilterBackend, IssueOrderingFilter]
+    ordering_fields = ['created_time', 'updated_time', 'priority', 'status', 'title']
+    ordering = ['created_time', 'id']
+    # Lists may be paginated by keyset on (created_time, id), see FlexiblePagination
+    keyset_pagination = True
+    bulk_max_items = 500
+    import_batch_size = 1000
+
+    # Columns read by the permission checks, whatever the selected fields
+    required_fields = ['id', 'project', 'author']
+
+    # Columns read by each serialized field on list and retrieve, when not the field itself
+    field_columns = {'author': ['author__username']}
+
+    def get_sparse_fields(self):
+        """
+        Return the fields selected with `?fields=id,title,status` on list and retrieve, or None for all of them.
+
+        Raises:
+            ValidationError: If a selected field is not a field of IssueSerializer.
+        """
+        if self.action not in ['list', 'retrieve'] or 'fields' not in self.request.query_params:
+            return None
+
+        fields = split_values(self.request.query_params['fields'])
+        unknown = [field for field in fields if field not in IssueSerializer.Meta.fields]
+        if unknown or not fields:
+            raise ValidationError({'fields': [f"Expected a comma separated subset of {', '.join(IssueSerializer.Meta.fields)}."]})
+        return fields
+
+    def get_read_columns(self, fields):
+        """
+        Return the columns to load for the given serializer fields, with the author's username
+        joined in only when the author is selected, and the keyset ordering columns when pages
+        are keyset pages, whose cursors are built from the boundary rows.
+        """
+        columns = list(self.required_fields)
+        if uses_keyset_pagination(self.request, self):
+            columns.extend(KeysetPagination.ordering)
+        for field in fields:
+            columns.extend(self.field_columns.get(field, [field]))
+        return columns
 
     def get_queryset(self):
         """
         Returns a filtered queryset of issues belonging to a specific project, identified by the URL parameter 'project_pk'.
+
+        Read actions only load the columns emitted by the serializer, with the author's
+        username joined in, so no query is run per issue. A sparse fieldset (`?fields=`)
+        narrows the loaded columns down to the selected fields.
         """
         project_pk = self.kwargs.get('project_pk')
-        if project_pk:
-            return self.queryset.filter(project_id=project_pk)
-        raise NotFound("Project not found.")
+        if not project_pk:
+            raise NotFound("Project not found.")
+
+        queryset = self.queryset.filter(project_id=project_pk)
+        if self.action in ['list', 'retrieve']:
+            fields = self.get_sparse_fields() or IssueSerializer.Meta.fields
+            if 'author' not in fields:
+                queryset = queryset.select_related(None)
+            queryset = queryset.only(*self.get_read_columns(fields))
+        return queryset
+
+    def get_serializer_context(self):
+        """
+        Pass the sparse fieldset, if any, to the serializer.
+        """
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        return context
 
     def perform_create(self, serializer):
         """
@@ -37,30 +116,205 @@ class IssueViewSet(viewsets.ModelViewSet):
         """
         project_id = self.kwargs.get('project_pk')
         project = Project.objects.get(pk=project_id)
-        serializer.save(author=self.request.user, project=project)
+        issue_status = serializer.validated_data.get('status', Issue._meta.get_field('status').default)
+        with transaction.atomic():
+            issue = serializer.save(author=get_user_instance(self.request.user), project=project,
+                                    finished_time=finished_time_for(issue_status))
+            add_issue_counts(project.pk, {issue.status: 1})
+
+    def perform_update(self, serializer):
+        """
+        Saves the issue, moving it between the status counters of its project when its status
+        changes, and setting or clearing its finished time when it moves to or away from 'Finished'.
+        """
+        with transaction.atomic():
+            # The stored status is read under a row lock, so concurrent updates never count a change twice
+            stored = Issue.objects.select_for_update().filter(pk=serializer.instance.pk).values_list('status', 'finished_time').first()
+            if stored is None:
+                raise NotFound("Issue not found.")
+            previous, finished_time = stored
+            issue_status = serializer.validated_data.get('status', previous)
+            issue = serializer.save(finished_time=finished_time_for(issue_status, previous, finished_time))
+            if issue.status != previous:
+                add_issue_counts(issue.project_id, {previous: -1, issue.status: 1})
+
+    def perform_destroy(self, instance):
+        """
+        Deletes the issue and its comments, and decrements the status counter of its project.
+
+        Deletions send no signal handled by the project caches and event streams, which keeps
+        cascades on Django's single-DELETE path, so they are invalidated and published here.
+        """
+        with transaction.atomic():
+            previous = Issue.objects.select_for_update().filter(pk=instance.pk).values_list('status', flat=True).first()
+            _, deleted = instance.delete()
+            # A concurrent deletion already accounted for the issue if no row was deleted here
+            if previous is not None and deleted.get(Issue._meta.label):
+                add_issue_counts(instance.project_id, {previous: -1})
+                bump_project_versions([instance.project_id])
+                publish_on_commit(build_event(instance.project_id, 'issue', 'deleted', instance))
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request, project_pk=None):
+        """
+        Creates or partially updates a batch of issues of the project in a single transaction.
+
+        The body is a list of issue payloads. Items with an 'id' are partial updates of an
+        issue authored by the current user, each issue being updated at most once per batch;
+        the others are creations. Permissions are checked once for the batch, assignees are
+        validated with a single query and the rows are written with bulk_create/bulk_update.
+        Nothing is written if any item is invalid.
+
+        Returns:
+            Response: One result per item, in request order, with its status and either the
+                      serialized issue or its errors.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Expected a non-empty list of issues.")
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(f"A batch cannot hold more than {self.bulk_max_items} issues.")
+
+        # Issues targeted by updates are loaded with one query. Assignees are checked against
+        # the contributor ids of the project, loaded once for the whole batch.
+        update_ids = [item['id'] for item in items if isinstance(item, dict) and isinstance(item.get('id'), int)]
+        existing = self.get_queryset().in_bulk(update_ids)
+        context = self.get_serializer_context()
+
+        results = []
+        item_serializers = []
+        seen_ids = set()
+        for item in items:
+            serializer = None
+            issue_id = item.get('id') if isinstance(item, dict) else None
+            instance = existing.get(issue_id) if isinstance(issue_id, int) else None
+
+            if instance is not None and issue_id in seen_ids:
+                result = {'status': status.HTTP_400_BAD_REQUEST, 'errors': {'id': ["Issue updated more than once in the batch."]}}
+            elif issue_id is not None and instance is None:
+                result = {'status': status.HTTP_404_NOT_FOUND, 'errors': {'id': ["Issue not found."]}}
+            elif instance is not None and instance.author_id != request.user.pk:
+                result = {'status': status.HTTP_403_FORBIDDEN, 'errors': {'id': ["Only the author can modify this issue."]}}
+            else:
+                serializer = IssueBulkItemSerializer(instance, data=item, partial=instance is not None, context=context)
+                result = None if serializer.is_valid() else {'status': status.HTTP_400_BAD_REQUEST, 'errors': serializer.errors}
+            if instance is not None:
+                seen_ids.add(issue_id)
+            results.append(result)
+            item_serializers.append(serializer)
+
+        # Nothing is written unless every item is valid
+        if any(result is not None for result in results):
+            results = [result or {'status': status.HTTP_200_OK, 'errors': {}} for result in results]
+            return Response({'results': results}, status=status.HTTP_400_BAD_REQUEST)
 
+        created, updated, updated_fields = [], [], set()
+        statuses = []
+        for serializer in item_serializers:
+            data = dict(serializer.validated_data)
+            data.pop('id', None)
+            if serializer.instance is None:
+                serializer.instance = Issue(**data, author=get_user_instance(request.user), project_id=project_pk)
+                serializer.instance.finished_time = finished_time_for(serializer.instance.status)
+                created.append(serializer.instance)
+                statuses.append(status.HTTP_201_CREATED)
+            else:
+                statuses.append(status.HTTP_200_OK)
+                # bulk_update does not apply auto_now, so the modification time is set here
+                data['updated_time'] = timezone.now()
+                for field, value in data.items():
+                    setattr(serializer.instance, field, value)
+                updated_fields.update(data)
+                updated.append(serializer.instance)
 
-class CommentViewSet(viewsets.ModelViewSet):
+        # Items updating the same issue share its instance, which is counted and written once
+        updated = list({issue.pk: issue for issue in updated}.values())
+
+        with transaction.atomic():
+            # Status counters move from the stored statuses, read under row locks, to the written ones
+            counts = Counter(issue.status for issue in created)
+            if 'status' in updated_fields:
+                previous = dict(Issue.objects.select_for_update().filter(pk__in=[issue.pk for issue in updated]).values_list('id', 'status'))
+                counts.subtract(previous.values())
+                counts.update(issue.status for issue in updated)
+                for issue in updated:
+                    issue.finished_time = finished_time_for(issue.status, previous.get(issue.pk), issue.finished_time)
+                updated_fields.add('finished_time')
+            Issue.objects.bulk_create(created)
+            if updated_fields:
+                Issue.objects.bulk_update(updated, sorted(updated_fields))
+            add_issue_counts(project_pk, counts)
+            # Bulk writes send no signals, so the cached responses are invalidated and the events sent here
+            bump_project_versions([project_pk])
+            for issue in created:
+                publish_on_commit(build_event(project_pk, 'issue', 'created', issue))
+            for issue in updated:
+                publish_on_commit(build_event(project_pk, 'issue', 'updated', issue))
+
+        results = [
+            {'status': item_status, 'data': IssueSerializer(serializer.instance).data}
+            for item_status, serializer in zip(statuses, item_serializers)
+        ]
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='import', url_name='import')
+    def import_issues(self, request, project_pk=None):
+        """
+        Creates the issues and comments of an NDJSON upload, in the layouts of the project export.
+
+        The body is read as a stream, line by line, and rows are validated and inserted in
+        batches, each committed on its own (see issues.importer.ProjectImporter). Every row is
+        created by the requesting user, whatever the authors of the lines. An invalid line
+        answers 400 with the id of the import job, and the batches committed before it are
+        kept. Uploading the same lines again with `?resume=<job id>` skips them.
+
+        Returns:
+            Response: The number of issues and comments created and the import throughput.
+        """
+        project = Project.objects.get(pk=project_pk)
+        job = None
+        if 'resume' in request.query_params:
+            job = get_resumable_job(project, request.query_params['resume'], requested_by=request.user)
+        # The raw body is iterated as lines rather than parsed into request.data, which would load it whole
+        importer = ProjectImporter(project, batch_size=self.import_batch_size, author_id=request.user.pk, job=job)
+        report = importer.run(request.stream or [])
+        return Response(report.as_dict(), status=status.HTTP_201_CREATED)
+
+
+class CommentViewSet(ConditionalGetMixin, CachedResponseMixin, AsyncViewSetMixin, viewsets.ModelViewSet):
     """
     A viewset for handling the creation, retrieval, updating, and deletion of comments.
+
+    Comment lists are served from the response cache until the project data changes, and
+    reads answer conditional requests with 304 Not Modified. With ASYNC_VIEWS enabled,
+    reads run in the event loop.
     """
-    queryset = Comment.objects.select_related('issue', 'issue__project').all()
+    queryset = Comment.objects.select_related('issue', 'author').all()
     serializer_class = CommentSerializer
+    keyset_pagination = True
 
     # Permissions for authenticated users and custom comment-specific permissions
     permission_classes = [permissions.IsAuthenticated, IsCommentAuthorOrProjectContributor]
 
+    # Columns read by CommentSerializer and the permission checks on list and retrieve
+    read_fields = ['id', 'text', 'issue__project', 'author__username', 'created_time', 'updated_time']
+
     def get_queryset(self):
         """
         Overrides the default queryset to return comments of a specific issue within a project.
 
-        Identified by 'issue_pk' and 'project_pk' in the URL parameters.
+        Identified by 'issue_pk' and 'project_pk' in the URL parameters. Read actions only load
+        the columns emitted by the serializer, with the author's username joined in.
         """
         issue_pk = self.kwargs.get('issue_pk')
         project_pk = self.kwargs.get('project_pk')
-        if issue_pk and project_pk:
-            return self.queryset.filter(issue_id=issue_pk, issue__project_id=project_pk)
-        raise NotFound("Project or Issue not found")
+        if not (issue_pk and project_pk):
+            raise NotFound("Project or Issue not found")
+
+        queryset = self.queryset.filter(issue_id=issue_pk, issue__project_id=project_pk)
+        if self.action in ['list', 'retrieve']:
+            queryset = queryset.only(*self.read_fields)
+        return queryset
 
     def perform_create(self, serializer):
         """
@@ -70,4 +324,63 @@ class CommentViewSet(viewsets.ModelViewSet):
         with the issue identified by 'issue_pk' and 'project_pk' in the URL.
         """
         issue = Issue.objects.get(pk=self.kwargs.get('issue_pk'), project_id=self.kwargs.get('project_pk'))
-        serializer.save(author=self.request.user, issue=issue)
+        with transaction.atomic():
+            serializer.save(author=get_user_instance(self.request.user), issue=issue)
+            add_comment_counts({issue.pk: 1})
+
+    def perform_destroy(self, instance):
+        """
+        Deletes the comment, decrements the comment counter of its issue and invalidates and
+        publishes the deletion (see IssueViewSet.perform_destroy).
+        """
+        with transaction.atomic():
+            _, deleted = instance.delete()
+            if deleted.get(Comment._meta.label):
+                add_comment_counts({instance.issue_id: -1})
+                bump_project_versions([instance.issue.project_id])
+                publish_on_commit(build_event(instance.issue.project_id, 'comment', 'deleted', instance))
+
+
+class MyIssueViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    A viewset listing the issues assigned to (or authored by) the current user across all their projects.
+
+    Issues are looked up by assignee or author directly, and only kept in the projects the
+    user still contributes to, so the queue of a user of many projects is a single query
+    served by the (assignee, status, created_time) index. Pages are always keyset pages in
+    creation order.
+
+    Attributes:
+        roles (tuple): Accepted values of the `role` query parameter, the first being the default.
+    """
+    queryset = Issue.objects.select_related('author').all()
+    serializer_class = IssueSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [IssueFilterBackend]
+    pagination_class = KeysetPagination
+    roles = ('assignee', 'author')
+
+    # Columns read by IssueSerializer, with the author's username joined in
+    read_fields = [field for field in IssueSerializer.Meta.fields if field != 'author'] + ['author', 'author__username']
+
+    def get_role(self):
+        """
+        Return the relationship selected with `?role=assignee` or `?role=author`.
+
+        Raises:
+            ValidationError: If the role is not one of `roles`.
+        """
+        role = self.request.query_params.get('role', self.roles[0])
+        if role not in self.roles:
+            raise ValidationError({'role': [f"Expected one of {', '.join(self.roles)}."]})
+        return role
+
+    def get_queryset(self):
+        """
+        Returns the issues of the current user in the selected role, within the projects they contribute to.
+        """
+        user_id = self.request.user.pk
+        projects = Contributor.objects.filter(user_id=user_id).values('project_id')
+        return self.queryset.filter(
+            **{f'{self.get_role()}_id': user_id}, project_id__in=projects,
+        ).only(*self.read_fields)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "projects"
+
+    def ready(self):
+        # Connect the handlers invalidating the response cache and register its deployment check
+        from . import cache, signals  # noqa: F401
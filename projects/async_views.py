@@ -0,0 +1,156 @@
+import asyncio
+from functools import partial
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+
+
+# Marks what has not been loaded yet by an AsyncViewSetMixin view, None being a valid page
+NOT_LOADED = object()
+
+
+def in_event_loop():
+    """
+    Return True when called from a coroutine, where the synchronous ORM cannot be used.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class AsyncLoadRequired(Exception):
+    """
+    Raised by synchronous code needing rows that are not loaded yet while running in the event loop.
+
+    The view awaits `load`, which loads and memoizes the rows with the async ORM, then runs
+    the interrupted step again, which finds them loaded (see AsyncViewSetMixin.arun).
+
+    Attributes:
+        load (callable): Coroutine function loading the missing rows.
+    """
+    def __init__(self, load):
+        super().__init__(load)
+        self.load = load
+
+
+class AsyncViewSetMixin:
+    """
+    ViewSet mixin serving requests with an async dispatch when the ASYNC_VIEWS setting is enabled.
+
+    The dispatch goes through the regular DRF hooks (initialize_request, initial, the handler,
+    handle_exception and finalize_response), so permissions, throttles, content negotiation and
+    the other view mixins apply as on the synchronous path. The actions of `async_actions` run
+    in the event loop: the object and the page are loaded with the async ORM, and so are the
+    memberships read by the permission classes. The project versions and cached responses are
+    read with the async API of the cache, and responses are cached by the `deferred_calls`
+    awaited once the handler returned. Authentication and the other actions run in a worker
+    thread, as on the synchronous path under ASGI.
+
+    Attributes:
+        async_actions (tuple): Actions run in the event loop.
+        use_async_dispatch (bool): Set on the views built while ASYNC_VIEWS is enabled.
+    """
+    async_actions = ('list', 'retrieve')
+    use_async_dispatch = False
+    loaded_object = NOT_LOADED
+    loaded_page = NOT_LOADED
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        if not settings.ASYNC_VIEWS:
+            return super().as_view(actions, **initkwargs)
+        view = super().as_view(actions, use_async_dispatch=True, **initkwargs)
+        # Django awaits the views marked as coroutine functions, here returning adispatch()
+        return markcoroutinefunction(view)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.use_async_dispatch:
+            return super().dispatch(request, *args, **kwargs)
+        return self.adispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        Async counterpart of APIView.dispatch, calling the same hooks.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        self.deferred_calls = []
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # The authenticators are synchronous and may load the user, so they run in a thread
+            await sync_to_async(self.perform_authentication)(request)
+            await self.arun(self.initial, request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if self.action in self.async_actions and (self.action != 'list' or self.paginator is not None):
+                response = await self.arun(handler, request, *args, **kwargs)
+                for call in self.deferred_calls:
+                    await call()
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def arun(self, step, *args, **kwargs):
+        """
+        Run a synchronous step in the event loop, loading the rows it asks for until it completes.
+
+        Steps may run several times, so they must only change state once their rows are loaded.
+        """
+        while True:
+            try:
+                return step(*args, **kwargs)
+            except AsyncLoadRequired as required:
+                await required.load()
+
+    def get_object(self):
+        if not in_event_loop():
+            return super().get_object()
+        if self.loaded_object is NOT_LOADED:
+            raise AsyncLoadRequired(self.aload_object)
+        self.check_object_permissions(self.request, self.loaded_object)
+        return self.loaded_object
+
+    async def aload_object(self):
+        """
+        Load the object of a detail action, as GenericAPIView.get_object does, with the async ORM.
+
+        Raises:
+            Http404: If no object matches the lookup.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            self.loaded_object = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+    def paginate_queryset(self, queryset):
+        if not in_event_loop():
+            return super().paginate_queryset(queryset)
+        if self.loaded_page is NOT_LOADED:
+            raise AsyncLoadRequired(partial(self.aload_page, queryset))
+        return self.loaded_page
+
+    async def aload_page(self, queryset):
+        """
+        Load the page of a list action, with the async ORM when the paginator supports it.
+        """
+        if hasattr(self.paginator, 'apaginate_queryset'):
+            self.loaded_page = await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        else:
+            self.loaded_page = await sync_to_async(super().paginate_queryset)(queryset)
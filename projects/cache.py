@@ -0,0 +1,182 @@
+import hashlib
+import time
+from functools import partial
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from rest_framework import status
+from rest_framework.response import Response
+from .async_views import AsyncLoadRequired, in_event_loop
+from rest_framework.exceptions import NotFound
+from .membership import get_membership, is_project_member
+from .models import Project
+
+
+# Cache key of a cached response, see CachedResponseMixin.get_response_cache_key
+RESPONSE_KEY = 'response:{view}:{action}:{user}:{project}:{version}:{digest}'
+
+
+def get_response_cache():
+    """
+    Return the cache backend holding the cached responses.
+    """
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+@register(Tags.caches, deploy=True)
+def check_response_cache(app_configs=None, **kwargs):
+    """
+    Warn when the response cache is local to each process.
+
+    Responses are keyed by the project versions stored in the database, so no process serves
+    a stale response, but every process computes and holds its own copy of each response.
+    """
+    if not isinstance(get_response_cache(), LocMemCache):
+        return []
+    return [Warning(
+        f"The response cache '{settings.RESPONSE_CACHE_ALIAS}' is local to each process.",
+        hint="With several server processes, share the cached responses with a backend such as Redis (set REDIS_URL).",
+        id='projects.W001',
+    )]
+
+
+def bump_project_versions(project_ids, using=None):
+    """
+    Invalidate every cached response and ETag of the given projects by moving them to a new version.
+
+    Versions are stored on the Project rows, in the transaction of the write, so every server
+    process sees the new version as soon as the write commits. They are nanosecond timestamps,
+    which also give the Last-Modified of the project data, and always move forward, even past
+    a version overwritten by the save of a stale Project instance.
+
+    Args:
+        project_ids (iterable): The ids of the projects whose data changed.
+        using (str): Alias of the database written to, the default one if None.
+    """
+    project_ids = {int(project_id) for project_id in project_ids if project_id is not None}
+    if not project_ids:
+        return
+    Project.objects.using(using).filter(pk__in=project_ids).update(
+        version=Greatest(F('version') + 1, Value(time.time_ns())),
+    )
+
+
+def user_project_ids(user_id, using=None):
+    """
+    Return the ids of the projects a user authored or contributes to, whose responses show the user.
+    """
+    return set(
+        Project.objects.using(using).filter(Q(author_id=user_id) | Q(contributors__user_id=user_id)).values_list('pk', flat=True)
+    )
+
+
+def is_direct_deletion(origin, model):
+    """
+    Return True unless the row is deleted as a cascade of the deletion of another model.
+
+    Args:
+        origin: The `origin` argument of the delete signals, an instance or a queryset.
+        model (Model): The model the signal was sent for.
+    """
+    if origin is None:
+        return True
+    return isinstance(origin, model) or getattr(origin, 'model', None) is model
+
+
+class CachedResponseMixin:
+    """
+    ViewSet mixin caching the response data of read actions per user, project and query string.
+
+    A cached entry is keyed by the current version of the project (see bump_project_versions),
+    which moves on every save of the project, its contributors, issues and comments. Rows deleted
+    outside of the API do not move it, so a hit still goes through the permission checks and
+    requires the user to be a member of the project. The version is read along with the
+    membership, so one query, shared with the permission classes, replaces the count, page
+    queries and serialization.
+
+    Attributes:
+        cached_actions (tuple): Actions whose responses are cached.
+        project_url_kwarg (str): URL kwarg holding the id of the project.
+    """
+    cached_actions = ('list',)
+    project_url_kwarg = 'project_pk'
+
+    def get_response_cache_key(self, request):
+        """
+        Return the cache key of the current request, or None when its response is not cacheable.
+        """
+        if self.action not in self.cached_actions or not request.user.is_authenticated:
+            return None
+
+        project_id = self.kwargs.get(self.project_url_kwarg)
+        try:
+            project_id = int(project_id)
+        except (TypeError, ValueError):
+            return None
+
+        try:
+            version = get_membership(request, project_id).version
+        except NotFound:
+            return None
+
+        # Pagination links are absolute, so the host is part of the key with the path and query
+        digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        return RESPONSE_KEY.format(
+            view=self.basename, action=self.action, user=request.user.pk, project=project_id,
+            version=version, digest=digest,
+        )
+
+    def read_cached_data(self, key):
+        """
+        Return the data cached under the key, or None, read with the async API of the cache in the event loop.
+        """
+        if not in_event_loop():
+            return get_response_cache().get(key)
+        loaded = self.__dict__.setdefault('loaded_cached_data', {})
+        if key not in loaded:
+            raise AsyncLoadRequired(partial(self.aload_cached_data, key))
+        return loaded[key]
+
+    async def aload_cached_data(self, key):
+        self.loaded_cached_data[key] = await get_response_cache().aget(key)
+
+    def write_cached_data(self, key, data):
+        """
+        Cache the data of a response, once the handler returned when running in the event loop.
+        """
+        if in_event_loop():
+            # Awaited by AsyncViewSetMixin.adispatch
+            self.deferred_calls.append(partial(get_response_cache().aset, key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT))
+        else:
+            get_response_cache().set(key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+    def check_permissions(self, request):
+        super().check_permissions(request)
+        self.response_cache_key = self.get_response_cache_key(request)
+        self.cached_data = None
+        if self.response_cache_key is not None:
+            cached_data = self.read_cached_data(self.response_cache_key)
+            # Non-members are answered by the handler, with the same error as without the cache
+            if cached_data is not None and is_project_member(request, self.kwargs[self.project_url_kwarg]):
+                self.cached_data = cached_data
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """
+        Serve the cached data of the request if any, otherwise run the handler and cache its data.
+        """
+        if getattr(self, 'cached_data', None) is not None:
+            return Response(self.cached_data)
+
+        response = handler(request, *args, **kwargs)
+        if getattr(self, 'response_cache_key', None) is not None and response.status_code == status.HTTP_200_OK:
+            self.write_cached_data(self.response_cache_key, response.data)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
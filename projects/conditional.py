@@ -0,0 +1,100 @@
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.crypto import salted_hmac
+from django.utils.http import http_date
+from .membership import get_membership, is_project_member
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin answering If-None-Match and If-Modified-Since on read actions with 304 Not Modified.
+
+    Inside a project, the validators are derived from the project version (see
+    projects.cache.bump_project_versions), stored on the Project row and read along with the
+    membership of the user, which moves on every write to the project. Views without a project in the URL
+    can provide their own validators by overriding get_listing_state. ETags are signed with the
+    secret key and bound to the user. The permission checks still run, and inside a project a
+    304 requires the user to still be a member, so a 304 costs one membership lookup instead of
+    the main query and the serialization. Last-Modified has a one-second resolution, so clients
+    should prefer the ETag.
+
+    Attributes:
+        conditional_actions (tuple): Actions answering conditional requests.
+        project_url_kwarg (str): URL kwarg holding the id of the project.
+    """
+    conditional_actions = ('list', 'retrieve')
+    project_url_kwarg = 'project_pk'
+
+    def get_listing_state(self, request):
+        """
+        Return the (state, last modified timestamp) of a read outside of a project, or None
+        when it has no cheap validators. The timestamp may be None when the state has no
+        reliable modification date.
+        """
+        return None
+
+    def get_validators(self, request):
+        """
+        Return the (ETag, last modified timestamp) of the current request, or None when it
+        cannot be answered conditionally.
+        """
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return None
+        if not request.user.is_authenticated:
+            return None
+
+        try:
+            project_id = int(self.kwargs.get(self.project_url_kwarg))
+        except (TypeError, ValueError):
+            project_id = None
+
+        if project_id is not None:
+            # Removed members are answered by the handler, with the same error as a full request
+            if not is_project_member(request, project_id):
+                return None
+            # Versions are nanosecond timestamps of the last change of the project
+            version = get_membership(request, project_id).version
+            state, last_modified = version, version // 10**9
+        else:
+            listing_state = self.get_listing_state(request)
+            if listing_state is None:
+                return None
+            state, last_modified = listing_state
+
+        # The rendering format is part of the representation, and so of its ETag
+        value = ':'.join(str(part) for part in (
+            self.basename, self.action, request.user.pk, request.build_absolute_uri(),
+            request.accepted_renderer.format, state,
+        ))
+        etag = '"{}"'.format(salted_hmac('conditional-get', value).hexdigest())
+        return etag, last_modified
+
+    def check_permissions(self, request):
+        super().check_permissions(request)
+        self.validators = self.get_validators(request)
+        self.not_modified = None
+        if self.validators is not None:
+            etag, last_modified = self.validators
+            self.not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+
+    def list(self, request, *args, **kwargs):
+        if getattr(self, 'not_modified', None) is not None:
+            return self.not_modified
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if getattr(self, 'not_modified', None) is not None:
+            return self.not_modified
+        return super().retrieve(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Responses differ per user, so shared caches must not serve them and clients must revalidate
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
@@ -0,0 +1,356 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import BaseRenderer
+
+
+# Delay in milliseconds before a disconnected EventSource reconnects
+RETRY_MILLISECONDS = 3000
+
+
+class Event(NamedTuple):
+    """
+    Change of a row of a project, as sent on its event stream.
+
+    Attributes:
+        id (int): Nanosecond timestamp of the publication, used as the SSE event id (0 until published).
+        project_id (int): The project the row belongs to.
+        name (str): '<model>.<action>', e.g. 'issue.created' or 'contributor.deleted'.
+        data (str): The JSON payload: the model, action and id of the row and its field values.
+    """
+    id: int
+    project_id: int
+    name: str
+    data: str
+
+
+def build_event(project_id, model, action, instance=None, **extra):
+    """
+    Return the event of a row change, with the values of its concrete fields when an instance is given.
+
+    Args:
+        project_id (int): The project the row belongs to.
+        model (str): 'issue', 'comment' or 'contributor'.
+        action (str): 'created', 'updated', 'deleted', or 'imported' for bulk imports.
+        instance (Model): The saved or deleted row, if any.
+        **extra: Additional keys of the payload.
+    """
+    payload = {'model': model, 'action': action, 'project': int(project_id), **extra}
+    if instance is not None:
+        payload['id'] = instance.pk
+        payload['data'] = {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+    return Event(0, int(project_id), f'{model}.{action}', json.dumps(payload, cls=DjangoJSONEncoder))
+
+
+def build_reset_event(project_id):
+    """
+    Return a 'reset' event, published when rows of a project were removed without one event per row.
+
+    Clients handle it as the 'reset' sent by a stream that missed events: they reload their data.
+    """
+    return Event(0, int(project_id), 'reset', '{}')
+
+
+def format_event(event):
+    """
+    Return the text of an event in the SSE wire format.
+    """
+    return f'id: {event.id}\nevent: {event.name}\ndata: {event.data}\n\n'
+
+
+def format_reset():
+    """
+    Return a 'reset' event, telling the client that events were missed and its state must be reloaded.
+    """
+    return 'event: reset\ndata: {}\n\n'
+
+
+def ends_stream(event, user_id):
+    """
+    Return True when an event removes the user from the project, whose stream must then stop.
+    """
+    return event.name == 'contributor.deleted' and json.loads(event.data)['data']['user_id'] == user_id
+
+
+class Subscription:
+    """
+    Queue of the events of a project for one stream, fed by the broker from any thread.
+
+    A subscription created in an event loop is read with `await aget()`, otherwise with
+    `get()`. When the stream falls more than `max_pending` events behind, further events are
+    dropped and `overflowed` is set, so that the client is told to reload.
+    """
+    def __init__(self, broker, project_id, max_pending):
+        self.broker = broker
+        self.project_id = project_id
+        self.overflowed = False
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+        self.queue = asyncio.Queue(max_pending) if self.loop else queue.Queue(max_pending)
+
+    def push(self, event):
+        """
+        Queue an event, from any thread.
+        """
+        if self.loop is None:
+            self.put(event)
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.put, event)
+        except RuntimeError:
+            # The loop of the stream is closed, the stream is gone
+            self.close()
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except (queue.Full, asyncio.QueueFull):
+            self.overflowed = True
+
+    def get(self, timeout):
+        """
+        Return the next event, or None if none came within `timeout` seconds.
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def aget(self, timeout):
+        """
+        Async version of get.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalEventBroker:
+    """
+    In-process event broker, fanning the published events out to the streams of the process.
+
+    The last EVENT_HISTORY_SIZE events of every project are kept, so that a client
+    reconnecting with a Last-Event-ID gets the events it missed. Events are only delivered
+    within the publishing process, so with several server processes use a cross-process
+    backend such as RedisEventBroker.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+        self.history = {}
+        # Events after this id are all in the history of a project, unless older ones were evicted
+        self.started = time.time_ns()
+        self.floors = {}
+
+    def publish(self, event):
+        """
+        Send an event to every stream of its project.
+        """
+        self.deliver(event)
+
+    def deliver(self, event):
+        """
+        Record an event in the history of its project and queue it on the subscriptions of the process.
+        """
+        with self.lock:
+            history = self.history.setdefault(event.project_id, deque(maxlen=settings.EVENT_HISTORY_SIZE))
+            if len(history) == history.maxlen:
+                self.floors[event.project_id] = history[0].id
+            history.append(event)
+            subscriptions = list(self.subscriptions.get(event.project_id, ()))
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    def subscribe(self, project_id, after_id):
+        """
+        Subscribe to the events of a project published after the event `after_id`.
+
+        Returns:
+            tuple: The Subscription, and the list of the events already published after
+                   `after_id`, or None if some of them are no longer known.
+        """
+        subscription = Subscription(self, project_id, settings.EVENT_QUEUE_SIZE)
+        with self.lock:
+            self.subscriptions.setdefault(project_id, set()).add(subscription)
+            if after_id < self.floors.get(project_id, self.started):
+                return subscription, None
+            return subscription, [event for event in self.history.get(project_id, ()) if event.id > after_id]
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.project_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.project_id, None)
+
+
+class RedisEventBroker(LocalEventBroker):
+    """
+    Event broker sharing the events between processes through a Redis pub/sub channel.
+
+    Events are published on the channel, and every process serving streams listens to it
+    from a background thread, started with its first stream. Needs the redis package and
+    EVENT_BROKER_URL (REDIS_URL by default).
+    """
+    channel = 'tasktracker:events'
+
+    def __init__(self):
+        super().__init__()
+        import redis
+        self.client = redis.Redis.from_url(settings.EVENT_BROKER_URL)
+        self.listener = None
+
+    def publish(self, event):
+        self.client.publish(self.channel, json.dumps(event))
+
+    def subscribe(self, project_id, after_id):
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=self.listen, name='event-broker', daemon=True)
+                self.listener.start()
+        return super().subscribe(project_id, after_id)
+
+    def listen(self):
+        """
+        Deliver the events of the channel to the streams of the process, reconnecting on errors.
+        """
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self.deliver(Event(*json.loads(message['data'])))
+            except Exception:
+                # Events published while disconnected are lost, so older ids can no longer be replayed
+                with self.lock:
+                    self.started = time.time_ns()
+                    self.history.clear()
+                    self.floors.clear()
+                time.sleep(1)
+
+
+_broker = None
+
+
+def get_event_broker():
+    """
+    Return the event broker of the process, of the class named by the EVENT_BROKER_BACKEND setting.
+    """
+    global _broker
+    if _broker is None or type(_broker) is not import_string(settings.EVENT_BROKER_BACKEND):
+        _broker = import_string(settings.EVENT_BROKER_BACKEND)()
+    return _broker
+
+
+def publish_on_commit(event, using=None):
+    """
+    Publish an event once the current transaction commits, so that streams never show rolled back changes.
+
+    The event id is taken at publication, so that ids follow the order in which changes become visible.
+    """
+    transaction.on_commit(lambda: get_event_broker().publish(event._replace(id=time.time_ns())), using=using)
+
+
+def iter_events(project_id, after_id, user_id, timeout, heartbeat):
+    """
+    Yield the SSE text of the events of a project read synchronously, for a WSGI server.
+
+    The stream subscribes when it starts, replays the events published after the event
+    `after_id`, then waits for new ones, sending a comment every `heartbeat` seconds to keep
+    the connection open. It ends after `timeout` seconds, letting the client reconnect with
+    its Last-Event-ID, or when the user is removed from the project.
+    """
+    subscription, replay = get_event_broker().subscribe(project_id, after_id)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        if replay is None:
+            yield format_reset()
+        for event in replay or []:
+            yield format_event(event)
+            if ends_stream(event, user_id):
+                return
+
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            event = subscription.get(min(heartbeat, remaining))
+            if subscription.overflowed:
+                yield format_reset()
+                return
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event)
+            if ends_stream(event, user_id):
+                return
+    finally:
+        subscription.close()
+
+
+async def aiter_events(project_id, after_id, user_id, timeout, heartbeat):
+    """
+    Async version of iter_events, served from the event loop by an ASGI server.
+    """
+    subscription, replay = get_event_broker().subscribe(project_id, after_id)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        if replay is None:
+            yield format_reset()
+        for event in replay or []:
+            yield format_event(event)
+            if ends_stream(event, user_id):
+                return
+
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            event = await subscription.aget(min(heartbeat, remaining))
+            if subscription.overflowed:
+                yield format_reset()
+                return
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event)
+            if ends_stream(event, user_id):
+                return
+    finally:
+        subscription.close()
+
+
+class EventStreamUnavailable(APIException):
+    """
+    Raised when an event stream is requested from a WSGI server without EVENT_STREAM_WSGI, where
+    it would hold a worker for the whole stream.
+    """
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Event streams are only served by the ASGI server."
+    default_code = 'event_stream_unavailable'
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer selecting the event stream (`Accept: text/event-stream`).
+
+    Streams are returned by the view, so this only renders error responses, as an 'error' event.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return f'event: error\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'.encode() if data is not None else b''
@@ -0,0 +1,78 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from projects.models import Project, Contributor
+from projects.views import projects_for_user
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the /projects/ listing query as the number of memberships of a user grows.
+
+    For every membership count, the command prints the query plan and the median latency
+    of the paginated listing (COUNT plus first page) for the legacy JOIN + DISTINCT query
+    and for the semi-join used by ProjectViewSet. All benchmark rows are created inside a
+    transaction that is rolled back, so the database is left untouched.
+    """
+    help = "Compare query plans and latency of the project listing as membership count grows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,1000,5000',
+                            help="Comma separated membership counts to benchmark.")
+        parser.add_argument('--noise', type=int, default=5000,
+                            help="Number of unrelated projects owned by other users.")
+        parser.add_argument('--repeat', type=int, default=20,
+                            help="Number of timed runs per query and size.")
+        parser.add_argument('--page-size', type=int, default=10)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+
+        with transaction.atomic():
+            owner = User.objects.create_user(username='bench-owner', password=None, age=30)
+            member = User.objects.create_user(username='bench-member', password=None, age=30)
+            self._create_projects(owner, options['noise'], members=[])
+
+            created = 0
+            for size in sizes:
+                self._create_projects(owner, size - created, members=[member])
+                created = size
+                self._report(member, size, options['repeat'], options['page_size'])
+
+            transaction.set_rollback(True)
+
+    def _create_projects(self, author, count, members):
+        """
+        Bulk create projects authored by `author` and register every user of `members` on them.
+        """
+        projects = Project.objects.bulk_create(
+            [Project(title=f'Bench {i}', description='', type='back-end', author=author) for i in range(count)],
+            batch_size=500,
+        )
+        Contributor.objects.bulk_create(
+            [Contributor(user=user, project=project) for project in projects for user in members],
+            batch_size=500,
+        )
+
+    def _report(self, user, size, repeat, page_size):
+        legacy = (
+            Project.objects.filter(contributors__user=user).distinct()
+            | Project.objects.filter(author=user).distinct()
+        )
+        current = projects_for_user(Project.objects.all(), user)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{size} memberships"))
+        for label, queryset in (('legacy', legacy), ('semi-join', current)):
+            queryset = queryset.order_by('created_time', 'id')
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                queryset.count()
+                list(queryset[:page_size])
+                timings.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(f"{label}: median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms")
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f"    {line}")
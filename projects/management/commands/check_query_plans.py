@@ -0,0 +1,125 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from issues.views import IssueViewSet, CommentViewSet, MyIssueViewSet
+from projects.views import ProjectViewSet, ContributorViewSet
+from tasktracker.pagination import KeysetPagination
+from users.models import User
+
+
+# (label, viewset, URL kwargs, query parameters, supports keyset pagination) of every list query served by the API
+LIST_QUERIES = [
+    ('projects', ProjectViewSet, {}, {}, True),
+    ('project contributors', ContributorViewSet, {'project_pk': 1}, {}, False),
+    ('project issues', IssueViewSet, {'project_pk': 1}, {}, True),
+    ('project issues by status', IssueViewSet, {'project_pk': 1}, {'status': 'TO_DO'}, True),
+    ('project issues by priority', IssueViewSet, {'project_pk': 1}, {'priority': 'HIGH'}, True),
+    ('project issues by tag', IssueViewSet, {'project_pk': 1}, {'tag': 'BUG'}, True),
+    ('project issues by assignee', IssueViewSet, {'project_pk': 1}, {'assignee': '1'}, True),
+    ('issue comments', CommentViewSet, {'project_pk': 1, 'issue_pk': 1}, {}, True),
+    ('my issues', MyIssueViewSet, {}, {}, True),
+    ('my issues by status', MyIssueViewSet, {}, {'status': 'TO_DO'}, True),
+    ('my authored issues', MyIssueViewSet, {}, {'role': 'author'}, True),
+]
+
+# SQLite plan lines reading a whole table or index: SCAN, with or without USING INDEX, where a lookup shows SEARCH
+SQLITE_SCAN = re.compile(r'\bSCAN (\S+)')
+
+# PostgreSQL plan nodes reading a table or an index, the index ones being lookups only with an 'Index Cond'
+POSTGRESQL_SCAN = re.compile(r'\b(Seq Scan|Index Scan|Index Only Scan|Bitmap Index Scan)(?: Backward)?(?: using \S+)? on (\S+)')
+
+
+def sqlite_full_scans(plan):
+    """
+    Return the tables and indexes read in full by an SQLite query plan.
+    """
+    return SQLITE_SCAN.findall(plan)
+
+
+def postgresql_full_scans(plan):
+    """
+    Return the tables and indexes read in full by a PostgreSQL query plan.
+
+    Sequential scans always read the whole table. Index and bitmap index scans without an
+    'Index Cond' walk the whole index, e.g. to follow an ORDER BY while filtering every row.
+    """
+    nodes = [[]]
+    for line in plan.splitlines():
+        # Every node but the root starts with an arrow, followed by its detail lines
+        if '->' in line and nodes[-1]:
+            nodes.append([])
+        nodes[-1].append(line)
+
+    scanned = []
+    for node in nodes:
+        match = POSTGRESQL_SCAN.search(node[0]) if node else None
+        if match is None:
+            continue
+        kind, name = match.groups()
+        if kind == 'Seq Scan' or not any('Index Cond:' in line for line in node[1:]):
+            scanned.append(name)
+    return scanned
+
+
+# Function listing the tables and indexes read in full by a query plan, per database vendor
+FULL_SCAN_FINDERS = {
+    'sqlite': sqlite_full_scans,
+    'postgresql': postgresql_full_scans,
+}
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN on the list query of every ViewSet and fail if any of them scans a whole table.
+
+    Both the default ordering and the keyset ordering (created_time, id) are checked. Full
+    index scans fail the check as well as table scans. On PostgreSQL sequential scans are
+    disabled for the check, so a 'Seq Scan' in the plan means that no index can serve the
+    query at all rather than that the test table is small.
+    """
+    help = "Fail if the list query of a ViewSet falls back to a full table scan."
+
+    def handle(self, *args, **options):
+        find_full_scans = FULL_SCAN_FINDERS.get(connection.vendor)
+        if find_full_scans is None:
+            raise CommandError(f"Query plans cannot be checked on the '{connection.vendor}' backend.")
+
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for label, queryset in self.get_list_queries():
+                plan = queryset.explain()
+                scanned = find_full_scans(plan)
+                if scanned:
+                    failures.append(label)
+                    self.stdout.write(self.style.ERROR(f"FULL SCAN {label}: {', '.join(scanned)}"))
+                    for line in plan.splitlines():
+                        self.stdout.write(f"    {line}")
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"OK {label}"))
+
+        if failures:
+            raise CommandError(f"{len(failures)} list queries fall back to a full table scan.")
+
+    def get_list_queries(self):
+        """
+        Yield (label, queryset) pairs for the page query of every ViewSet, as built by the views.
+        """
+        factory = APIRequestFactory()
+        user = User(pk=1)
+
+        for label, viewset, kwargs, params, keyset in LIST_QUERIES:
+            request = factory.get('/', params)
+            force_authenticate(request, user=user)
+
+            view = viewset(action='list', action_map={'get': 'list'}, kwargs=kwargs, format_kwarg=None)
+            view.request = view.initialize_request(request)
+            queryset = view.filter_queryset(view.get_queryset())
+
+            yield label, queryset[:10]
+            if keyset:
+                yield f"{label} (keyset)", queryset.order_by(*KeysetPagination.ordering)[:10]
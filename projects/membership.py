@@ -0,0 +1,157 @@
+from functools import partial
+from typing import NamedTuple
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import NotFound
+from .async_views import AsyncLoadRequired, in_event_loop
+from .models import Project, Contributor
+
+
+ROLE_AUTHOR = 'author'
+ROLE_CONTRIBUTOR = 'contributor'
+
+
+class Membership(NamedTuple):
+    """
+    Relationship between a user and a single project.
+
+    Attributes:
+        project_id (int): The project the membership was resolved for.
+        author_id (int): The id of the project's author.
+        is_author (bool): True if the user authored the project.
+        is_contributor (bool): True if the user has a Contributor row for the project.
+        version (int): The version of the project data, see projects.cache.bump_project_versions.
+    """
+    project_id: int
+    author_id: int
+    is_author: bool
+    is_contributor: bool
+    version: int
+
+    @property
+    def role(self):
+        """
+        Return the strongest role the user holds on the project, or None for outsiders.
+        """
+        if self.is_author:
+            return ROLE_AUTHOR
+        if self.is_contributor:
+            return ROLE_CONTRIBUTOR
+        return None
+
+
+class MembershipResolver:
+    """
+    Resolves and memoizes a user's (project_id -> Membership) map for the lifetime of a request.
+
+    Every permission class asks the resolver instead of querying Project and Contributor
+    directly, so a request pays for at most one membership lookup per project. In the event
+    loop of an async view, memberships are loaded with the async ORM (see AsyncLoadRequired).
+    """
+    def __init__(self, user):
+        self.user = user
+        self._memberships = {}
+        self._contributor_ids = {}
+
+    def get(self, project_id):
+        """
+        Return the Membership of the user on the given project.
+
+        Args:
+            project_id: The primary key of the project, as found in the URL or on an object.
+
+        Returns:
+            Membership: The resolved membership.
+
+        Raises:
+            NotFound: If the project does not exist.
+            AsyncLoadRequired: If called from the event loop before the membership is loaded.
+        """
+        try:
+            project_id = int(project_id)
+        except (TypeError, ValueError):
+            raise NotFound("Project not found.")
+
+        if project_id not in self._memberships:
+            if in_event_loop():
+                raise AsyncLoadRequired(partial(self.aload, project_id))
+            self._memberships[project_id] = self._build(project_id, self._query(project_id).first())
+        return self._memberships[project_id]
+
+    async def aload(self, project_id):
+        """
+        Load the membership of the user on the given project with the async ORM.
+        """
+        self._memberships[project_id] = self._build(project_id, await self._query(project_id).afirst())
+
+    def contributor_ids(self, project_id):
+        """
+        Return the set of user ids contributing to the given project, loaded once per request.
+
+        Used to validate assignees without a query per validated field or per bulk item.
+        """
+        project_id = int(project_id)
+        if project_id not in self._contributor_ids:
+            self._contributor_ids[project_id] = set(
+                Contributor.objects.filter(project_id=project_id).values_list('user_id', flat=True)
+            )
+        return self._contributor_ids[project_id]
+
+    def _query(self, project_id):
+        # Author and contributor flags are fetched together in a single query
+        return Project.objects.filter(pk=project_id).annotate(
+            is_contributor=Exists(
+                Contributor.objects.filter(project=OuterRef('pk'), user_id=self.user.pk)
+            )
+        ).values_list('author_id', 'is_contributor', 'version')
+
+    def _build(self, project_id, row):
+        if row is None:
+            raise NotFound("Project not found.")
+
+        author_id, is_contributor, version = row
+        return Membership(
+            project_id=project_id,
+            author_id=author_id,
+            is_author=author_id == self.user.pk,
+            is_contributor=is_contributor,
+            version=version,
+        )
+
+
+def get_membership_resolver(request):
+    """
+    Return the MembershipResolver attached to the request, creating it on first use.
+
+    The resolver is stored on the underlying Django HttpRequest so that it is shared
+    by every permission class and view that handles the same request.
+    """
+    http_request = getattr(request, '_request', request)
+    resolver = getattr(http_request, '_membership_resolver', None)
+    if resolver is None or resolver.user.pk != request.user.pk:
+        resolver = MembershipResolver(request.user)
+        http_request._membership_resolver = resolver
+    return resolver
+
+
+def get_membership(request, project_id):
+    """
+    Shortcut returning the request user's Membership on the given project.
+    """
+    return get_membership_resolver(request).get(project_id)
+
+
+def is_project_member(request, project_id):
+    """
+    Return True if the request user authored or contributes to the project, False if it does not exist.
+    """
+    try:
+        return get_membership(request, project_id).role is not None
+    except NotFound:
+        return False
+
+
+def get_contributor_ids(request, project_id):
+    """
+    Shortcut returning the ids of the contributors of the given project, cached on the request.
+    """
+    return get_membership_resolver(request).contributor_ids(project_id)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_updated_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='finished_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='to_do_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
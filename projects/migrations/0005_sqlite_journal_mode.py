@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import migrations
+from tasktracker.database import set_journal_mode
+
+
+def switch_journal_mode(apps, schema_editor):
+    """
+    Switch SQLite databases to the SQLITE_JOURNAL_MODE setting, kept in the database file.
+    """
+    set_journal_mode(schema_editor.connection, settings.SQLITE_JOURNAL_MODE)
+
+
+class Migration(migrations.Migration):
+
+    # SQLite refuses to change the journal mode inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('projects', '0004_project_issue_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(switch_journal_mode, migrations.RunPython.noop),
+    ]
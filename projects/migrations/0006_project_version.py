@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:07
+
+import time
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_sqlite_journal_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.BigIntegerField(default=time.time_ns),
+        ),
+    ]
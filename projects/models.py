@@ -1,3 +1,4 @@
+import time
 from django.db import models
 from django.conf import settings
 from users.models import User
@@ -14,6 +15,12 @@ class Project(models.Model):
         type (CharField): The type/category of the project.
         author (ForeignKey): A reference to the User who authored and is the main contributor to the project.
         created_time (DateTimeField): The date and time when the project was created, automatically set to now.
+        updated_time (DateTimeField): The date and time of the last modification of the project.
+        to_do_count (PositiveIntegerField): Number of issues of the project to do.
+        in_progress_count (PositiveIntegerField): Number of issues of the project in progress.
+        finished_count (PositiveIntegerField): Number of finished issues of the project.
+        version (BigIntegerField): Nanosecond timestamp of the last change of the project data,
+                                   keying its cached responses and ETags.
     """
     PROJECT_TYPES = (
         ('back-end', 'Back-End'),
@@ -27,6 +34,21 @@ class Project(models.Model):
     type = models.CharField(max_length=10, choices=PROJECT_TYPES)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='authored_projects')
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    # Maintained by the issue writes (issues/counters.py), repaired by `manage.py repair_counters`
+    to_do_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    finished_count = models.PositiveIntegerField(default=0)
+    # Moved forward by every write to the project data, see projects.cache.bump_project_versions
+    version = models.BigIntegerField(default=time.time_ns)
+
+    class Meta:
+        """
+        Meta class to define the index backing the keyset pagination of projects.
+        """
+        indexes = [
+            models.Index(fields=['created_time', 'id'], name='project_created_idx'),
+        ]
 
     def __str__(self):
         """
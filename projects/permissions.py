@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from .models import Project, Contributor
+from .membership import get_membership
 
 
 class IsProjectAuthorOrReadOnly(permissions.BasePermission):
@@ -24,7 +24,7 @@ class IsProjectAuthorOrReadOnly(permissions.BasePermission):
             return True
         
         # Write permissions are only allowed to the author of the project
-        return obj.author == request.user
+        return obj.author_id == request.user.pk
 
 
 class IsProjectAuthorForContributor(permissions.BasePermission):
@@ -43,19 +43,15 @@ class IsProjectAuthorForContributor(permissions.BasePermission):
         Returns:
             bool: True if the user has the appropriate permissions, False otherwise.
         """
-        project_id = view.kwargs.get('project_pk')
-        project = Project.objects.get(pk=project_id)
+        membership = get_membership(request, view.kwargs.get('project_pk'))
 
         if view.action in ['create', 'update', 'partial_update', 'destroy']:
             # Only the author of the project can perform these actions
-            return request.user == project.author
+            return membership.is_author
 
         if view.action in ['list', 'retrieve']:
             # Both the author and the contributors of the project can read
-            return (
-                request.user == project.author or 
-                Contributor.objects.filter(project=project, user=request.user).exists()
-            )
+            return membership.is_author or membership.is_contributor
 
         # Default to True for other cases
         return True
@@ -72,16 +68,15 @@ class IsProjectAuthorForContributor(permissions.BasePermission):
         Returns:
             bool: True if the user has the appropriate permissions, False otherwise.
         """
+        membership = get_membership(request, obj.project_id)
+
         if view.action in ['update', 'partial_update', 'destroy']:
             # Only the author of the project can perform these actions on a contributor object
-            return request.user == obj.project.author
+            return membership.is_author
 
         if view.action in ['retrieve']:
             # Both the author and the contributors of the project can view contributor details
-            return (
-                request.user == obj.project.author or 
-                Contributor.objects.filter(project=obj.project, user=request.user).exists()
-            )
+            return membership.is_author or membership.is_contributor
 
         # Default to False for other cases
         return False
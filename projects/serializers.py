@@ -48,8 +48,10 @@ class ProjectListSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Project
-        fields = ['id', 'title', 'description', 'type', 'author', 'created_time']
-        read_only_fields = ['author'] # Author field is read-only
+        fields = ['id', 'title', 'description', 'type', 'author', 'created_time', 'updated_time',
+                  'to_do_count', 'in_progress_count', 'finished_count']
+        # Author and issue counters are read-only
+        read_only_fields = ['author', 'to_do_count', 'in_progress_count', 'finished_count']
 
 
 class ProjectDetailSerializer(serializers.ModelSerializer):
@@ -61,4 +63,6 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
-        fields = ['id', 'title', 'description', 'type', 'author', 'created_time', 'contributors']
+        fields = ['id', 'title', 'description', 'type', 'author', 'created_time', 'updated_time',
+                  'to_do_count', 'in_progress_count', 'finished_count', 'contributors']
+        read_only_fields = ['author', 'to_do_count', 'in_progress_count', 'finished_count']
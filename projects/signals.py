@@ -0,0 +1,56 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from users.models import User
+from .cache import bump_project_versions, is_direct_deletion, user_project_ids
+from .events import build_event, publish_on_commit
+from .models import Project, Contributor
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project(sender, instance, using=None, **kwargs):
+    """
+    Invalidate the cached responses of a saved or deleted project.
+    """
+    bump_project_versions([instance.pk], using=using)
+
+
+# Contributor deletions are invalidated and published by ContributorViewSet.perform_destroy,
+# so that deleting a project or a user removes its contributors with a single DELETE.
+
+
+@receiver(post_save, sender=Contributor)
+def invalidate_contributor(sender, instance, using=None, **kwargs):
+    """
+    Invalidate the cached responses of the project of a saved contributor.
+    """
+    bump_project_versions([instance.project_id], using=using)
+
+
+@receiver(post_save, sender=Contributor)
+def publish_contributor_event(sender, instance, created=False, using=None, **kwargs):
+    """
+    Send the creation or update of a contributor to the event streams of its project once committed.
+    """
+    event = build_event(instance.project_id, 'contributor', 'created' if created else 'updated', instance)
+    publish_on_commit(event, using=using)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_projects(sender, instance, created, update_fields=None, using=None, **kwargs):
+    """
+    Invalidate the projects showing a user whose profile changed, e.g. their username.
+    """
+    # Logins only touch the password (hasher upgrades) and last_login, which no response shows
+    if created or (update_fields and set(update_fields) <= {'password', 'last_login'}):
+        return
+    bump_project_versions(user_project_ids(instance.pk, using=using), using=using)
+
+
+@receiver(pre_delete, sender=User)
+def invalidate_deleted_user_projects(sender, instance, origin=None, using=None, **kwargs):
+    """
+    Invalidate the projects of a user about to be deleted, while their contributions still exist.
+    """
+    if is_direct_deletion(origin, User):
+        bump_project_versions(user_project_ids(instance.pk, using=using), using=using)
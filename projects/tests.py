@@ -2,8 +2,20 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 from rest_framework.test import APIClient
 from users.models import User
+from issues.models import Issue, Comment
+from users.deletion import erase_user
+from .cache import check_response_cache
+from .management.commands.check_query_plans import postgresql_full_scans, sqlite_full_scans
 from .models import Project, Contributor
+from .views import ProjectViewSet
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.tokens import AccessToken
 from django.urls import reverse
+from django.db import connection
+from django.test import AsyncRequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from io import StringIO
 
 
 class ProjectViewSetTestCase(APITestCase):
@@ -71,6 +83,107 @@ class ProjectViewSetTestCase(APITestCase):
         self.assertIn(test_project.title, project_titles)
         self.assertIn(other_project.title, project_titles)
 
+    def test_list_projects_without_duplicates(self):
+        """
+        Ensures a project the user both authored and contributes to is listed once,
+        without relying on a DISTINCT query.
+        """
+        project = Project.objects.create(**self.project_data, author=self.user)
+        Contributor.objects.create(user=self.user, project=project)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project-list'))
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertFalse(any('DISTINCT' in query['sql'] for query in queries.captured_queries))
+
+    def test_retrieve_project_query_count_does_not_grow_with_contributors(self):
+        """
+        Ensures retrieving a project loads its contributors in a fixed number of queries.
+        """
+        project = Project.objects.create(**self.project_data, author=self.user)
+        Contributor.objects.create(user=self.user, project=project)
+        url = reverse('project-detail', kwargs={'pk': project.pk})
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+
+        for i in range(5):
+            member = User.objects.create_user(username=f'member{i}', password=None, age=30)
+            Contributor.objects.create(user=member, project=project)
+
+        with self.assertNumQueries(len(few)):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data['contributors']), 6)
+        self.assertEqual(response.data['contributors'][-1]['project_title'], project.title)
+
+    def test_retrieve_project_is_cached_until_a_change(self):
+        """
+        Ensures a repeated project retrieve is served from the cache, and refreshed once a contributor is renamed.
+        """
+        project = Project.objects.create(**self.project_data, author=self.user)
+        Contributor.objects.create(user=self.other_user, project=project)
+        url = reverse('project-detail', kwargs={'pk': project.pk})
+        self.client.get(url)
+
+        # Only the membership of the user is looked up
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+        self.other_user.username = 'renamed'
+        self.other_user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['contributors'][0]['username'], 'renamed')
+
+    def test_local_response_cache_warns_on_deploy(self):
+        """
+        Ensures the deployment checks warn about a local-memory response cache, and not about a shared one.
+        """
+        self.assertEqual([warning.id for warning in check_response_cache()], ['projects.W001'])
+        with override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'responses': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        }):
+            self.assertEqual(check_response_cache(), [])
+
+    def test_project_list_answers_not_modified(self):
+        """
+        Ensures the project list answers 304 to its own ETag, and 200 once the user joins another project.
+        """
+        Project.objects.create(**self.project_data, author=self.user)
+        url = reverse('project-list')
+        etag = self.client.get(url)['ETag']
+
+        # A single query listing the project ids replaces the count and page queries
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other_project = Project.objects.create(**self.project_data, author=self.other_user)
+        Contributor.objects.create(user=self.user, project=other_project)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_project_list_etag_follows_membership_changes(self):
+        """
+        Ensures swapping memberships for projects with the same count, id sum and timestamps changes the list ETag.
+        """
+        projects = [Project.objects.create(**self.project_data, author=self.other_user) for _ in range(4)]
+        Project.objects.filter(pk__in=[project.pk for project in projects]).update(updated_time=projects[0].updated_time)
+        for project in (projects[0], projects[3]):
+            Contributor.objects.create(user=self.user, project=project)
+        url = reverse('project-list')
+        etag = self.client.get(url)['ETag']
+
+        Contributor.objects.filter(user=self.user).delete()
+        for project in (projects[1], projects[2]):
+            Contributor.objects.create(user=self.user, project=project)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({project['id'] for project in response.data['results']}, {projects[1].id, projects[2].id})
+
     def test_author_can_update_project(self):
         """ Test that the author of a project can update it. """
         # Creating a project with the authenticated user as the author
@@ -101,6 +214,20 @@ class ProjectViewSetTestCase(APITestCase):
         response = self.client.delete(reverse('project-detail', kwargs={'pk': project.pk}))
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
+    @override_settings(ERASURE_JOBS_EAGER=True)
+    def test_author_can_delete_project_in_background(self):
+        """ Test that `?async=true` queues an erasure job which deletes the project and its contributors. """
+        project = Project.objects.create(**self.project_data, author=self.user)
+        Contributor.objects.create(user=self.user, project=project)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('project-detail', kwargs={'pk': project.pk}) + '?async=true')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['kind'], 'project')
+        self.assertFalse(Project.objects.filter(pk=project.pk).exists())
+        self.assertFalse(Contributor.objects.filter(project_id=project.pk).exists())
+
     def test_contributor_cannot_update_or_delete_project(self):
         """  Verifies that a contributor (not the author) of a project cannot update or delete it. """
         # Creating a project with the authenticated user as the author
@@ -160,6 +287,35 @@ class ContributorViewSetTestCase(APITestCase):
         response = self.client.get(reverse('project-users-list', kwargs={'project_pk': self.project.id}))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_list_contributors_query_count_does_not_grow(self):
+        """
+        Tests that listing contributors does not run one query per contributor.
+        """
+        Contributor.objects.create(user=self.user, project=self.project)
+        url = reverse('project-users-list', kwargs={'project_pk': self.project.id})
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+
+        for i in range(5):
+            member = User.objects.create_user(username=f'member{i}', password=None, age=30)
+            Contributor.objects.create(user=member, project=self.project)
+
+        with self.assertNumQueries(len(few)):
+            response = self.client.get(url)
+        self.assertEqual(response.data['count'], 6)
+
+    def test_list_contributors_ignores_cursor_pagination(self):
+        """
+        Tests that contributor lists, which have no keyset ordering, stay paginated by limit/offset.
+        """
+        Contributor.objects.create(user=self.other_user, project=self.project)
+        url = reverse('project-users-list', kwargs={'project_pk': self.project.id})
+        for params in ({'pagination': 'cursor'}, {'cursor': 'cD0x'}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['count'], 1)
+
     def test_remove_contributor(self):
         """
         Tests the removal of a contributor from a project.
@@ -180,4 +336,196 @@ class ContributorViewSetTestCase(APITestCase):
         response = self.client.post(reverse('project-users-list', kwargs={'project_pk': self.project.id}), self.contributor_data)
         
         # Asserting that the non-author user is denied permission (status code 403)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class QueryPlanTestCase(APITestCase):
+    """
+    Guards the indexes of the hot list queries against regressions.
+    """
+
+    def test_list_queries_do_not_scan_full_tables(self):
+        """
+        Runs the check_query_plans command, which fails if a ViewSet list query falls back to a full table scan.
+        """
+        call_command('check_query_plans', stdout=StringIO())
+
+    def test_full_index_scans_are_reported(self):
+        """
+        Tests that scans walking a whole index are reported along with the sequential ones.
+        """
+        self.assertEqual(sqlite_full_scans(
+            'SCAN projects_project USING INDEX project_created_idx\nSEARCH projects_contributor USING INDEX contributor_user_idx (user_id=?)'
+        ), ['projects_project'])
+        self.assertEqual(postgresql_full_scans(
+            'Limit  (cost=0.15..8.17 rows=1 width=64)\n'
+            '  ->  Index Scan using project_created_idx on projects_project  (cost=0.15..8.17 rows=1 width=64)\n'
+            '        Filter: (hashed SubPlan 1)\n'
+            '        SubPlan 1\n'
+            '          ->  Index Only Scan using contributor_user_idx on projects_contributor  (cost=0.15..4.17 rows=1 width=8)\n'
+            '                Index Cond: (user_id = 1)\n'
+            '  ->  Bitmap Heap Scan on issues_issue  (cost=4.17..11.28 rows=3 width=8)\n'
+            '        Recheck Cond: (project_id = 1)\n'
+            '        ->  Bitmap Index Scan on issue_project_idx  (cost=0.00..4.17 rows=3 width=0)\n'
+            '              Index Cond: (project_id = 1)\n'
+            '  ->  Seq Scan on issues_comment  (cost=10000000000.00..10000000001.01 rows=1 width=8)\n'
+        ), ['projects_project', 'issues_comment'])
+
+
+@override_settings(EVENT_STREAM_TIMEOUT=0.2, EVENT_STREAM_HEARTBEAT=0.1, EVENT_STREAM_WSGI=True)
+class EventStreamTestCase(APITestCase):
+    """
+    Test suite for the Server-Sent Events of /projects/<pk>/events/.
+    """
+
+    def setUp(self):
+        """
+        Creates a project with a contributor and an outsider.
+        """
+        self.user = User.objects.create_user(username='streamer', password='pass', age=30)
+        self.outsider = User.objects.create_user(username='outsider', password='pass', age=30)
+        self.project = Project.objects.create(title='Events', description='', type='back-end', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('project-events', kwargs={'pk': self.project.id})
+
+    def read(self, response):
+        """
+        Returns the text of a stream, which ends after EVENT_STREAM_TIMEOUT.
+        """
+        return b''.join(response.streaming_content).decode()
+
+    def test_stream_pushes_committed_changes(self):
+        """
+        Tests that issue and comment changes committed after the stream opened are pushed, with their ids.
+        """
+        response = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/event-stream'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            issue = self.client.post(reverse('project-issues-list', kwargs={'project_pk': self.project.id}), {
+                'title': 'Live', 'description': 'Text', 'tag': 'BUG', 'priority': 'LOW'}).data
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('issue-comments-list', kwargs={'project_pk': self.project.id, 'issue_pk': issue['id']}),
+                             {'text': 'Hello'})
+
+        content = self.read(response)
+        self.assertIn('event: issue.created', content)
+        self.assertIn('event: comment.created', content)
+        self.assertIn('"title": "Live"', content)
+        self.assertIn(': keepalive', content)
+
+    def test_stream_replays_missed_events_or_resets(self):
+        """
+        Tests that a reconnection gets the events after its Last-Event-ID, and a reset when they are unknown.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            Contributor.objects.create(user=self.outsider, project=self.project)
+        content = self.read(self.client.get(self.url, HTTP_LAST_EVENT_ID='1'))
+        self.assertIn('event: reset', content)
+        self.assertNotIn('event: contributor.created', content)
+
+        response = self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Issue.objects.create(title='Missed', description='', tag='BUG', priority='LOW',
+                                 project=self.project, author=self.user)
+        event_id = next(line for line in self.read(response).splitlines() if line.startswith('id: '))[4:]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Issue.objects.create(title='Replayed', description='', tag='BUG', priority='LOW',
+                                 project=self.project, author=self.user)
+        content = self.read(self.client.get(self.url, HTTP_LAST_EVENT_ID=event_id))
+        self.assertIn('"title": "Replayed"', content)
+        self.assertNotIn('"title": "Missed"', content)
+        self.assertNotIn('event: reset', content)
+
+    @override_settings(EVENT_STREAM_WSGI=False)
+    def test_wsgi_servers_refuse_streams_by_default(self):
+        """
+        Tests that a WSGI server answers 501 instead of holding a worker for the stream.
+        """
+        response = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertTrue(response.content.startswith(b'event: error'))
+
+    @override_settings(EVENT_STREAM_WSGI=False)
+    async def test_asgi_servers_stream_events(self):
+        """
+        Tests that under ASGI the stream is an async stream, served whatever EVENT_STREAM_WSGI.
+        """
+        request = AsyncRequestFactory().get(self.url, headers={
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}', 'Accept': 'text/event-stream'})
+        view = ProjectViewSet.as_view({'get': 'events'}, **ProjectViewSet.events.kwargs)
+        response = await sync_to_async(view)(request, pk=self.project.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        content = ''.join([chunk.decode() async for chunk in response])
+        self.assertTrue(content.startswith('retry: '))
+
+    def test_stream_requires_a_contributor(self):
+        """
+        Tests that outsiders are denied the stream, and that a removed contributor's stream ends.
+        """
+        self.client.force_authenticate(user=self.outsider)
+        response = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(response.content.startswith(b'event: error'))
+
+        contributor = Contributor.objects.create(user=self.outsider, project=self.project)
+        response = self.client.get(self.url)
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('project-users-detail', kwargs={'project_pk': self.project.id, 'pk': contributor.id}))
+        with self.captureOnCommitCallbacks(execute=True):
+            Issue.objects.create(title='Hidden', description='', tag='BUG', priority='LOW',
+                                 project=self.project, author=self.user)
+        content = self.read(response)
+        self.assertIn('event: contributor.deleted', content)
+        self.assertNotIn('Hidden', content)
+
+    def test_erasing_a_user_ends_their_streams_and_resets_the_others(self):
+        """
+        Tests that an erasure, which sends no signal, still ends the erased user's stream and resets the other streams.
+        """
+        Contributor.objects.create(user=self.outsider, project=self.project)
+        Issue.objects.create(title='Erased', description='', tag='BUG', priority='LOW', project=self.project, author=self.outsider)
+        erased_client = APIClient()
+        erased_client.force_authenticate(user=self.outsider)
+        erased_stream = erased_client.get(self.url)
+        stream = self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            erase_user(self.outsider)
+
+        self.assertIn('event: contributor.deleted', self.read(erased_stream))
+        content = self.read(stream)
+        self.assertIn('event: reset', content)
+        self.assertIn('event: contributor.deleted', content)
+
+    def test_erasing_a_user_resets_the_projects_they_left(self):
+        """
+        Tests that an erasure resets and invalidates the projects holding comments of a user who left them.
+        """
+        issue = Issue.objects.create(title='Kept', description='', tag='BUG', priority='LOW', project=self.project, author=self.user)
+        Comment.objects.create(text='Erased', issue=issue, author=self.outsider)
+        version = Project.objects.get(pk=self.project.pk).version
+        stream = self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            erase_user(self.outsider)
+
+        self.assertIn('event: reset', self.read(stream))
+        self.assertGreater(Project.objects.get(pk=self.project.pk).version, version)
+
+    def test_deleting_the_project_ends_its_streams(self):
+        """
+        Tests that deleting a project through the API publishes the removal of its contributors, ending their streams.
+        """
+        stream = self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('project-detail', kwargs={'pk': self.project.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIn('event: contributor.deleted', self.read(stream))
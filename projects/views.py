@@ -1,19 +1,73 @@
-from rest_framework import viewsets, permissions
+import hashlib
+import time
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from .cache import CachedResponseMixin, bump_project_versions
+from .conditional import ConditionalGetMixin
+from .events import EventStreamRenderer, EventStreamUnavailable, aiter_events, build_event, get_event_broker, iter_events, publish_on_commit
+from .membership import get_membership
 from .models import Project, Contributor
 from .serializers import ProjectListSerializer, ProjectDetailSerializer, ContributorCreateSerializer, ContributorListSerializer
 from .permissions import IsProjectAuthorOrReadOnly, IsProjectAuthorForContributor
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.db.models import Prefetch
+from users.authentication import get_user_instance
+from users.deletion import publish_erasure_events
+from users.jobs import enqueue_erasure, wants_async_erasure
+from users.serializers import ErasureJobSerializer
+from issues.export import CSVRenderer, NDJSONRenderer, aiter_chunks, buffered, iter_csv, iter_ndjson, iter_records
+from issues.search import get_search_backend, search_terms
+from issues.stats import BUCKETS, project_stats
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+def projects_for_user(queryset, user):
+    """
+    Restrict a Project queryset to the projects the user authored or contributes to.
+
+    The project ids are the UNION of the Contributor (user_id, project_id) index lookup and of
+    the Project author_id index lookup, matched with a semi-join instead of a JOIN followed by
+    DISTINCT. An OR of the two would make PostgreSQL scan every project. The author ids only
+    cover projects created outside of ProjectViewSet.perform_create, which always registers
+    the author as a contributor.
+
+    Args:
+        queryset (QuerySet): The Project queryset to restrict.
+        user (User): The user whose projects are listed.
+
+    Returns:
+        QuerySet: The filtered queryset, free of duplicates without needing DISTINCT.
+    """
+    project_ids = Contributor.objects.filter(user_id=user.pk).values('project_id').union(
+        Project.objects.filter(author_id=user.pk).values('pk')
+    )
+    return queryset.filter(pk__in=project_ids)
+
+
+class ProjectViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     A ViewSet for handling project operations including create, read, update, and delete.
 
     This ViewSet uses different serializers for detail and list actions and filters the queryset
-    based on the logged-in user's role as an author or a contributor.
+    based on the logged-in user's role as an author or a contributor. Project details are
+    served from the response cache until the project or its contributors change, and every
+    read answers conditional requests with 304 Not Modified.
     """
     queryset = Project.objects.all()
     permission_classes = [permissions.IsAuthenticated, IsProjectAuthorOrReadOnly]
+    cached_actions = ('retrieve',)
+    conditional_actions = ('list', 'retrieve', 'stats')
+    keyset_pagination = True
+    project_url_kwarg = 'pk'
+    search_page_size = 20
+    search_max_page_size = 100
+    export_chunk_size = 2000
 
     def get_serializer_class(self):
         """
@@ -27,27 +81,201 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         Filter the queryset based on the logged-in user's association with the projects.
         """
-        user = self.request.user
-        return self.queryset.filter(
-            contributors__user=user
-        ).distinct() | self.queryset.filter(author=user).distinct()
+        queryset = projects_for_user(self.queryset, self.request.user)
+        if self.action == 'retrieve':
+            # Contributors and their users are loaded with one extra query, whatever their number
+            queryset = queryset.prefetch_related(
+                Prefetch('contributors', queryset=Contributor.objects.select_related('user'))
+            )
+        return queryset
+
+    def get_listing_state(self, request):
+        """
+        Summarize the projects of the user by their versions, used as the ETag of the list.
+
+        The ids of the projects and their versions (see projects.cache.bump_project_versions)
+        are read with a single query. The digest of the (id, version) pairs changes when a
+        project joins or leaves the list, and when a project, its contributors or its issues
+        change. No Last-Modified is given, since removing a project can move the latest
+        modification time backwards.
+        """
+        versions = sorted(projects_for_user(Project.objects.all(), request.user).values_list('pk', 'version'))
+        return hashlib.sha256(repr(versions).encode()).hexdigest(), None
 
     def perform_create(self, serializer):
         """
         Customize the creation of a project. The author of the project is automatically added as a contributor.
         """
-        project = serializer.save(author=self.request.user)
+        project = serializer.save(author=get_user_instance(self.request.user))
         Contributor.objects.create(user=project.author, project=project)
 
+    def destroy(self, request, *args, **kwargs):
+        """
+        Delete the project, or with `?async=true` queue a background erasure of the project
+        and its issues, comments and contributors, and answer 202 Accepted with the job to poll.
+        """
+        if not wants_async_erasure(request):
+            return super().destroy(request, *args, **kwargs)
+
+        job = enqueue_erasure('project', self.get_object(), requested_by=request.user)
+        return Response(ErasureJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    def perform_destroy(self, instance):
+        """
+        Delete the project, then send a 'contributor.deleted' event per membership, which ends
+        the open streams of the project, and a 'reset' event, as the erasure does.
+
+        Deletions send no signal handled by the event streams, so that the contributors of the
+        project are removed with a single DELETE.
+        """
+        project_id = instance.pk
+        with transaction.atomic():
+            memberships = list(Contributor.objects.filter(project_id=project_id))
+            instance.delete()
+            publish_erasure_events(memberships, [project_id])
+
+    @action(detail=True, methods=['get'], url_path='search')
+    def search(self, request, pk=None):
+        """
+        Full-text search over the issue titles and descriptions and the comment texts of the project.
+
+        `?q=login crash` returns the issues and comments matching every word, the last one as a
+        prefix, best first, with a snippet highlighting the matched terms. `?limit=` caps the
+        number of hits (20 by default, 100 at most).
+
+        Returns:
+            Response: The query and its hits, see issues.search.SearchBackend for their fields.
+        """
+        project = self.get_object()
+
+        query = request.query_params.get('q', '')
+        terms = search_terms(query)
+        if not terms:
+            raise ValidationError({'q': ["Expected at least one word to search for."]})
 
-class ContributorViewSet(viewsets.ModelViewSet):
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.search_page_size)), 1), self.search_max_page_size)
+        except ValueError:
+            raise ValidationError({'limit': ["Expected a number."]})
+
+        hits = get_search_backend().search(project.pk, terms, limit)
+        return Response({'query': query, 'results': hits})
+
+    @action(detail=True, methods=['get'], url_path='stats')
+    def stats(self, request, pk=None):
+        """
+        Issue statistics of the project: counts per status, priority and tag, and a histogram
+        of the issues created and finished per `?bucket=day|week|month` (week by default), with
+        the number of issues still open at the end of each period.
+
+        Statistics are computed with a single grouped query and cached until an issue of the
+        project changes (see issues.stats.project_stats).
+
+        Returns:
+            Response: The statistics.
+        """
+        if getattr(self, 'not_modified', None) is not None:
+            return self.not_modified
+        project = self.get_object()
+
+        bucket = request.query_params.get('bucket', 'week')
+        if bucket not in BUCKETS:
+            raise ValidationError({'bucket': [f"Expected one of {', '.join(BUCKETS)}."]})
+        return Response(project_stats(project, bucket))
+
+    @action(detail=True, methods=['get'], url_path='export', renderer_classes=[NDJSONRenderer, CSVRenderer, JSONRenderer])
+    def export(self, request, pk=None):
+        """
+        Stream every issue of the project with its comments, as NDJSON (the default) or CSV.
+
+        The format is negotiated from the Accept header (application/x-ndjson or text/csv) or
+        `?format=ndjson|csv`. In NDJSON, comments are nested in their issue line by default, or
+        written as lines of their own with `?comments=flat`; CSV rows are always flat, issue
+        rows followed by their comment rows. Rows are read with server-side cursors and written
+        as they come, so memory does not grow with the size of the project, only with the
+        comments of the largest issue in nested NDJSON.
+
+        Returns:
+            StreamingHttpResponse: The export, as an attachment.
+        """
+        project = self.get_object()
+
+        output = request.accepted_renderer.format
+        if output == 'json':
+            output = 'ndjson'
+        layout = request.query_params.get('comments', 'flat' if output == 'csv' else 'nested')
+        if layout not in ('nested', 'flat') or (output == 'csv' and layout == 'nested'):
+            raise ValidationError({'comments': ["Expected 'nested' or 'flat', CSV exports being always flat."]})
+
+        records = iter_records(project.pk, self.export_chunk_size)
+        lines = iter_csv(records) if output == 'csv' else iter_ndjson(records, nested=layout == 'nested')
+        media_type = CSVRenderer.media_type if output == 'csv' else NDJSONRenderer.media_type
+        chunks = buffered(lines)
+        # Under ASGI the chunks are read one at a time in a worker thread, rather than all at once by Django
+        if isinstance(request._request, ASGIRequest):
+            chunks = aiter_chunks(chunks)
+        response = StreamingHttpResponse(chunks, content_type=f'{media_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="project-{project.pk}.{output}"'
+        return response
+
+    @action(detail=True, methods=['get'], url_path='events', renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def events(self, request, pk=None):
+        """
+        Stream the changes of the issues, comments and contributors of the project as Server-Sent Events.
+
+        Each event is named '<model>.<action>' (e.g. 'issue.updated') and carries the field
+        values of the row as JSON. A client reconnecting with the Last-Event-ID header gets the
+        events it missed, or a 'reset' event when they are too old to replay, after which it
+        must reload its data. Streams end after EVENT_STREAM_TIMEOUT seconds, EventSource
+        clients reconnecting on their own, and when the user is removed from the project.
+
+        Streams wait in the event loop of an ASGI server. Under WSGI, where each stream would
+        hold a worker, they are refused unless EVENT_STREAM_WSGI is set.
+
+        Returns:
+            StreamingHttpResponse: The event stream.
+
+        Raises:
+            EventStreamUnavailable: Under WSGI, unless EVENT_STREAM_WSGI is set.
+        """
+        is_asgi = isinstance(request._request, ASGIRequest)
+        if not (is_asgi or settings.EVENT_STREAM_WSGI):
+            raise EventStreamUnavailable()
+
+        # Same check as the issue and comment permissions: only the contributors of the project
+        membership = get_membership(request, pk)
+        if not membership.is_contributor:
+            self.permission_denied(request, message="Only the contributors of the project can follow its events.")
+
+        # A new stream starts from now, the broker being created first so that its history covers it
+        get_event_broker()
+        try:
+            after_id = int(request.headers['Last-Event-ID'])
+        except (KeyError, ValueError):
+            after_id = time.time_ns()
+
+        stream_args = (membership.project_id, after_id, request.user.pk,
+                       settings.EVENT_STREAM_TIMEOUT, settings.EVENT_STREAM_HEARTBEAT)
+        # Under ASGI the stream waits in the event loop, under WSGI it holds a worker thread
+        if is_asgi:
+            stream = aiter_events(*stream_args)
+        else:
+            stream = iter_events(*stream_args)
+        response = StreamingHttpResponse(stream, content_type=f'{EventStreamRenderer.media_type}; charset=utf-8')
+        response['Cache-Control'] = 'no-cache'
+        # Keeps nginx from buffering the events
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class ContributorViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     A ViewSet for managing contributors in projects.
 
     It allows project authors and contributors to list, create, update, and delete contributors
-    in a specific project.
+    in a specific project. Reads answer conditional requests with 304 Not Modified.
     """
-    queryset = Contributor.objects.all()
+    queryset = Contributor.objects.select_related('user', 'project').all()
     serializer_class = ContributorListSerializer
     permission_classes = [permissions.IsAuthenticated, IsProjectAuthorForContributor]
 
@@ -79,4 +307,18 @@ class ContributorViewSet(viewsets.ModelViewSet):
         serializer.context['project'] = project
 
         # Save the contributor with the associated project
-        serializer.save()
\ No newline at end of file
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        """
+        Delete the contributor, then invalidate the cached responses of the project and send a
+        'contributor.deleted' event, which also ends the streams of the removed user.
+
+        Deletions send no signal handled by the caches and event streams, so that deleting a
+        project or a user removes its contributors with a single DELETE.
+        """
+        with transaction.atomic():
+            _, deleted = instance.delete()
+            if deleted.get(Contributor._meta.label):
+                bump_project_versions([instance.project_id])
+                publish_on_commit(build_event(instance.project_id, 'contributor', 'deleted', instance))
\ No newline at end of file
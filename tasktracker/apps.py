@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class TaskTrackerConfig(AppConfig):
+    name = "tasktracker"
+
+    def ready(self):
+        # Tune every new SQLite connection with the SQLITE_PRAGMAS setting
+        from .database import configure_sqlite_connection
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='tasktracker-sqlite-pragmas')
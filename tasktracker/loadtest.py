@@ -0,0 +1,104 @@
+import json
+import math
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+
+def timed_request(url, method='GET', data=None, token=None, timeout=30):
+    """
+    Send an HTTP request to a running server and measure it.
+
+    Args:
+        url (str): The absolute URL to call.
+        method (str): The HTTP method.
+        data (dict): Optional body, sent as JSON.
+        token (str): Optional JWT access token sent as a Bearer credential.
+        timeout (float): Seconds before the request is abandoned.
+
+    Returns:
+        tuple: (status code, elapsed seconds, decoded JSON body or None).
+    """
+    headers = {'Accept': 'application/json'}
+    body = None
+    if data is not None:
+        body = json.dumps(data).encode()
+        headers['Content-Type'] = 'application/json'
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+
+    started = time.perf_counter()
+    try:
+        with urlopen(Request(url, data=body, headers=headers, method=method), timeout=timeout) as response:
+            status, payload = response.status, response.read()
+    except HTTPError as error:
+        status, payload = error.code, error.read()
+    elapsed = time.perf_counter() - started
+
+    try:
+        decoded = json.loads(payload) if payload else None
+    except ValueError:
+        decoded = None
+    return status, elapsed, decoded
+
+
+def obtain_token(base_url, username, password):
+    """
+    Log in through /login/ and return the access token.
+    """
+    status, _, payload = timed_request(f'{base_url}/login/', 'POST', {'username': username, 'password': password})
+    if status != 200:
+        raise RuntimeError(f"Login as {username} failed with status {status}: {payload}")
+    return payload['access']
+
+
+def run_for(duration, concurrency, call):
+    """
+    Run `call` in a loop from `concurrency` threads for `duration` seconds.
+
+    Returns:
+        list: The (status, elapsed) pairs of every call.
+    """
+    results = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        while time.monotonic() < deadline:
+            status, elapsed, _ = call()
+            with lock:
+                results.append((status, elapsed))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(samples, pct):
+    """
+    Return the pct-th percentile of the samples, using the nearest-rank method.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def summarize(label, results):
+    """
+    Return a one-line report of the request count, status codes and latency percentiles.
+    """
+    latencies = [elapsed for _, elapsed in results]
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    codes = ', '.join(f'{status}: {count}' for status, count in sorted(statuses.items()))
+    return (
+        f"{label:<24} {len(results):>6} requests  p50 {percentile(latencies, 50) * 1000:8.1f} ms"
+        f"  p99 {percentile(latencies, 99) * 1000:8.1f} ms  [{codes}]"
+    )
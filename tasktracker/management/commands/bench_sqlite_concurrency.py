@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.test.utils import override_settings
+from issues.models import Issue, Comment
+from projects.models import Project
+from tasktracker.loadtest import run_for, summarize
+from users.models import User
+
+
+# Alias of the scratch database the benchmark runs against
+BENCH_ALIAS = 'sqlite-bench'
+
+
+class Command(BaseCommand):
+    """
+    Benchmark concurrent reads and writes on SQLite with and without the SQLITE_JOURNAL_MODE and
+    SQLITE_PRAGMAS tuning.
+
+    For each configuration, a scratch database file is migrated, then writer threads insert
+    comments while reader threads load the first comment page of an issue with its count, as
+    the comment list endpoint does. Locking failures ("database is locked") are reported as
+    errors. The configured database is never touched.
+    """
+    help = "Compare concurrent SQLite throughput with the default pragmas and with SQLITE_PRAGMAS."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10, help="Seconds each workload runs.")
+        parser.add_argument('--writers', type=int, default=4, help="Number of writing threads.")
+        parser.add_argument('--readers', type=int, default=8, help="Number of reading threads.")
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError("This benchmark compares SQLite configurations, the default database is not SQLite.")
+
+        from django.conf import settings
+        configurations = (
+            ('default pragmas', None, {}),
+            ('SQLITE_PRAGMAS', settings.SQLITE_JOURNAL_MODE, settings.SQLITE_PRAGMAS),
+        )
+        for label, journal_mode, pragmas in configurations:
+            # The scratch database is migrated, which sets its journal mode
+            with tempfile.TemporaryDirectory() as directory, \
+                    override_settings(SQLITE_JOURNAL_MODE=journal_mode, SQLITE_PRAGMAS=pragmas):
+                connections.settings[BENCH_ALIAS] = {
+                    **connections.settings['default'], 'NAME': os.path.join(directory, 'bench.sqlite3'), 'CONN_MAX_AGE': 0,
+                }
+                try:
+                    self.stdout.write(f"{label}: journal_mode={journal_mode or 'default'}, {pragmas or 'SQLite defaults'}")
+                    self.run_workload(options)
+                finally:
+                    connections[BENCH_ALIAS].close()
+                    del connections[BENCH_ALIAS]
+                    del connections.settings[BENCH_ALIAS]
+
+    def run_workload(self, options):
+        """
+        Migrate the scratch database, then run the readers and writers side by side and report them.
+        """
+        call_command('migrate', database=BENCH_ALIAS, verbosity=0)
+        author = User.objects.db_manager(BENCH_ALIAS).create_user(username='bench-sqlite', password=None, age=30)
+        project = Project.objects.using(BENCH_ALIAS).create(title='Bench', description='', type='back-end', author=author)
+        issue = Issue.objects.using(BENCH_ALIAS).create(title='Bench', description='', tag='BUG', priority='LOW',
+                                                         project=project, author=author)
+
+        def timed(operation):
+            # Each thread gets its own connection, closed when the thread is done with it
+            def call():
+                started = time.perf_counter()
+                try:
+                    operation()
+                    outcome = 'ok'
+                except OperationalError:
+                    outcome = 'locked'
+                return outcome, time.perf_counter() - started, None
+            return call
+
+        def write():
+            Comment.objects.using(BENCH_ALIAS).create(text='Benchmark comment ' * 10, issue=issue, author=author)
+
+        def read():
+            comments = Comment.objects.using(BENCH_ALIAS).filter(issue=issue)
+            comments.count()
+            list(comments.order_by('-created_time', '-id')[:20])
+
+        results = {}
+
+        def workload(name, operation, concurrency):
+            results[name] = run_for(options['duration'], concurrency, timed(operation))
+            connections.close_all()
+
+        threads = [
+            threading.Thread(target=workload, args=('writes', write, options['writers'])),
+            threading.Thread(target=workload, args=('reads', read, options['readers'])),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for name in ('writes', 'reads'):
+            ok = sum(1 for outcome, _ in results[name] if outcome == 'ok')
+            self.stdout.write(f"  {summarize(name, results[name])}  {ok / options['duration']:8.0f} ok/s")
@@ -0,0 +1,193 @@
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import BasePagination, CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def uses_keyset_pagination(request, view):
+    """
+    Return True if the request selects the keyset pagination of FlexiblePagination.
+
+    Only views setting `keyset_pagination = True`, whose querysets have the (created_time, id)
+    columns and indexes, are paginated by keyset; the others ignore the parameters.
+    """
+    if not getattr(view, 'keyset_pagination', False):
+        return False
+    params = request.query_params
+    return params.get(FlexiblePagination.mode_query_param) == 'cursor' or KeysetPagination.cursor_query_param in params
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination ordered by (created_time, id).
+
+    Each page is fetched with a `created_time > <position>` seek on the composite
+    (parent, created_time, id) indexes, so the cost of a page does not depend on how deep
+    the client is. No COUNT(*) is ever issued.
+    """
+    ordering = ('created_time', 'id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class UncountedLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination that skips the COUNT(*) query.
+
+    One extra row is fetched to know whether a next page exists. The response has the
+    same shape as LimitOffsetPagination without the 'count' key.
+    """
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['required'] = ['results']
+        del response_schema['properties']['count']
+        return response_schema
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_html_context(self):
+        return {
+            'previous_url': self.get_previous_link(),
+            'next_url': self.get_next_link(),
+        }
+
+
+class PrefetchedRows:
+    """
+    Rows of a page already loaded with the async ORM, standing in for the queryset of a paginator.
+
+    Paginators only count the queryset and slice the page out of it, so they paginate these
+    rows with their own code and get the same results without running a query.
+
+    Attributes:
+        rows (list): The loaded rows, starting at `offset`.
+        offset (int): Position of the first row in the queryset.
+        total (int): Number of rows of the queryset, or None when it was not counted.
+    """
+    def __init__(self, rows, offset, total=None):
+        self.rows = rows
+        self.offset = offset
+        self.total = total
+
+    def count(self):
+        return self.total
+
+    def __getitem__(self, page):
+        return self.rows[page.start - self.offset:page.stop - self.offset]
+
+
+class FlexiblePagination(BasePagination):
+    """
+    Default pagination of the API, letting clients choose the pagination mode per request.
+
+    - Without parameters, the classic limit/offset pagination with a total 'count' is used.
+    - `?count=false` keeps limit/offset but skips the COUNT(*) query.
+    - `?pagination=cursor` (or any request carrying a `cursor`) switches to keyset pagination
+      ordered by (created_time, id), whose latency stays flat however deep the page is, on the
+      views setting `keyset_pagination = True`.
+    """
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+
+    def __init__(self):
+        self.paginator = LimitOffsetPagination()
+
+    def __getattr__(self, name):
+        # Anything not defined here (display_page_controls, to_html, ...) is answered by
+        # the paginator selected for the current request.
+        if name == 'paginator':
+            raise AttributeError(name)
+        return getattr(self.paginator, name)
+
+    def get_paginator(self, request, view=None):
+        """
+        Return the paginator instance matching the query parameters of the request and the view.
+        """
+        if uses_keyset_pagination(request, view):
+            return KeysetPagination()
+        if request.query_params.get(self.count_query_param, '').lower() in ('0', 'false', 'no'):
+            return UncountedLimitOffsetPagination()
+        return LimitOffsetPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request, view)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate the queryset from the event loop, see projects.async_views.AsyncViewSetMixin.
+
+        Limit/offset pages are counted and loaded with the async ORM, then paginated by the
+        selected paginator from the loaded rows. Keyset pages build their seek from the cursor
+        and check the boundary rows across several steps, so they are paginated in a thread.
+        """
+        self.paginator = self.get_paginator(request, view)
+        if isinstance(self.paginator, KeysetPagination):
+            return await sync_to_async(self.paginator.paginate_queryset)(queryset, request, view)
+
+        limit = self.paginator.get_limit(request)
+        if limit is None:
+            return None
+        offset = self.paginator.get_offset(request)
+        if isinstance(self.paginator, UncountedLimitOffsetPagination):
+            # The extra row tells whether a next page exists
+            total, stop = None, offset + limit + 1
+        else:
+            total, stop = await queryset.acount(), offset + limit
+        rows = [row async for row in queryset[offset:stop]] if total != 0 else []
+        return self.paginator.paginate_queryset(PrefetchedRows(rows, offset, total), request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = LimitOffsetPagination().get_schema_operation_parameters(view)
+        if not getattr(view, 'keyset_pagination', False):
+            return parameters + [self.get_count_schema_parameter()]
+        parameters += KeysetPagination().get_schema_operation_parameters(view)[:1]
+        return parameters + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "Set to 'cursor' to use keyset pagination.",
+                'schema': {'type': 'string', 'enum': ['offset', 'cursor']},
+            },
+            self.get_count_schema_parameter(),
+        ]
+
+    def get_count_schema_parameter(self):
+        return {
+            'name': self.count_query_param,
+            'required': False,
+            'in': 'query',
+            'description': "Set to 'false' to skip the total count of limit/offset pages.",
+            'schema': {'type': 'boolean'},
+        }
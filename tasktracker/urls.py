@@ -17,9 +17,9 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_nested import routers
-from users.views import SignupView, UserDetail, UserListView
+from users.views import SignupView, UserDetail, UserListView, ErasureJobDetail, HashingMetricsView
 from projects.views import ProjectViewSet, ContributorViewSet
-from issues.views import IssueViewSet, CommentViewSet
+from issues.views import IssueViewSet, CommentViewSet, MyIssueViewSet
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -44,6 +44,9 @@ urlpatterns = [
     path('signup/', SignupView.as_view(), name='signup'), # Signup URL for new users
     path('users/', UserListView.as_view(), name='user-list'), # URL for listing users
     path('users/<int:pk>/', UserDetail.as_view(), name='user-detail'), # URL for user detail, update, delete
+    path('jobs/<uuid:pk>/', ErasureJobDetail.as_view(), name='erasure-job-detail'), # URL for polling a background erasure job
+    path('metrics/hashing/', HashingMetricsView.as_view(), name='hashing-metrics'), # URL for the password hashing pool metrics
+    path('me/issues/', MyIssueViewSet.as_view({'get': 'list'}), name='my-issues'), # URL for the issues of the current user across projects
     path('', include(router.urls)), # Include routes from the root router
     path('', include(projects_router.urls)), # Include project nested router URLs
     path('', include(issues_router.urls)), # Include issue nested router URLs
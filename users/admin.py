@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import User
+from .authentication import revoke_user_tokens
 
 
 @admin.register(User)
@@ -19,3 +20,21 @@ class CustomUserAdmin(UserAdmin):
     )
     # Display these fields in the User list page
     list_display = ['username', 'email', 'age', 'can_be_contacted', 'can_data_be_shared']
+
+    # Changing one of these fields makes the claims of previously issued tokens stale
+    token_claim_fields = ['username', 'is_staff', 'is_superuser', 'is_active']
+
+    def save_model(self, request, obj, form, change):
+        """
+        Save the user, revoking their tokens when they are demoted, deactivated or renamed.
+        """
+        super().save_model(request, obj, form, change)
+        if change and any(field in form.changed_data for field in self.token_claim_fields):
+            revoke_user_tokens(obj.pk)
+
+    def delete_model(self, request, obj):
+        """
+        Delete the user and revoke the tokens issued to them.
+        """
+        revoke_user_tokens(obj.pk)
+        super().delete_model(request, obj)
@@ -0,0 +1,154 @@
+import math
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+
+
+# Token claim holding the token generation of the user when the token was issued
+GENERATION_CLAIM = 'token_generation'
+
+# Cache key holding the current token generation of a user, see get_token_generation
+GENERATION_KEY = 'jwt-generation:{}'
+
+# Generation of a user who no longer exists, above the generation of any token
+DELETED_USER_GENERATION = math.inf
+
+
+def get_generation_cache():
+    """
+    Return the cache of the token generations, named by the TOKEN_GENERATION_CACHE_ALIAS setting.
+    """
+    return caches[settings.TOKEN_GENERATION_CACHE_ALIAS]
+
+
+def revoke_user_tokens(user_id):
+    """
+    Reject every token issued to the user up to now.
+
+    The token generation stored on the User row is incremented, so tokens issued under an
+    earlier generation are rejected, including the ones issued in the same second. The
+    cached generation is dropped now and again once the transaction commits, so that no
+    request caches the previous generation in between.
+
+    Args:
+        user_id (int): The id of the user whose tokens are revoked.
+    """
+    User.objects.filter(pk=user_id).update(token_generation=F('token_generation') + 1)
+    key = GENERATION_KEY.format(user_id)
+    get_generation_cache().delete(key)
+    transaction.on_commit(lambda: get_generation_cache().delete(key))
+
+
+def get_token_generation(user_id):
+    """
+    Return the current token generation of a user, from the cache or else from the User row.
+
+    Generations are cached for TOKEN_GENERATION_CACHE_TIMEOUT seconds. With a cache local to
+    each process, a revocation made by another process is therefore seen within that delay.
+    A deleted user has DELETED_USER_GENERATION, so all their tokens are revoked.
+    """
+    cache = get_generation_cache()
+    key = GENERATION_KEY.format(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        generation = User.objects.filter(pk=user_id).values_list('token_generation', flat=True).first()
+        if generation is None:
+            generation = DELETED_USER_GENERATION
+        cache.set(key, generation, timeout=settings.TOKEN_GENERATION_CACHE_TIMEOUT)
+    return generation
+
+
+def is_token_revoked(token, generation=None):
+    """
+    Return True if the token was issued before the last revocation of its user.
+
+    Args:
+        token (Token): The validated access or refresh token.
+        generation (int): The current token generation of the user, when the User row is
+                          already loaded, otherwise it is read with get_token_generation.
+    """
+    if generation is None:
+        generation = get_token_generation(token.get(api_settings.USER_ID_CLAIM))
+    return token.get(GENERATION_CLAIM, 0) < generation
+
+
+class ClaimsUser(TokenUser):
+    """
+    Lightweight user built from the claims embedded in the token at login time.
+
+    The id, username and is_staff/is_superuser flags are answered from the token, which is
+    all permission checks need. Any other attribute loads the User row on first access.
+    """
+    @cached_property
+    def id(self):
+        """
+        The user id claim, converted to the type of the User primary key.
+        """
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def instance(self):
+        """
+        The User model instance behind the token, fetched on first access.
+        """
+        return User.objects.get(pk=self.id)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.instance, attr)
+
+    def __eq__(self, other):
+        if isinstance(other, (TokenUser, User)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+def get_user_instance(user):
+    """
+    Return the User model instance behind request.user, e.g. to assign it to a foreign key.
+
+    Raises:
+        AuthenticationFailed: If the user of a ClaimsUser was deleted since the token was checked.
+    """
+    if isinstance(user, ClaimsUser):
+        try:
+            return user.instance
+        except User.DoesNotExist:
+            raise AuthenticationFailed("User not found.", code='user_not_found')
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication rejecting revoked tokens, with an optional stateless mode.
+
+    When the JWT_STATELESS_AUTH setting is enabled, request.user is a ClaimsUser built from
+    the token and no query is run to authenticate a request. Otherwise the User row is loaded
+    as with the stock JWTAuthentication.
+    """
+    def get_user(self, validated_token):
+        if not settings.JWT_STATELESS_AUTH:
+            # The generation is read from the loaded row, so revocations apply at once
+            user = super().get_user(validated_token)
+            if is_token_revoked(validated_token, user.token_generation):
+                raise AuthenticationFailed("Token has been revoked.", code='token_revoked')
+            return user
+
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+        if is_token_revoked(validated_token):
+            raise AuthenticationFailed("Token has been revoked.", code='token_revoked')
+        return ClaimsUser(validated_token)
@@ -0,0 +1,33 @@
+from django.contrib.auth.backends import ModelBackend
+from .hashing import hash_password, verify_password
+from .models import User
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    Authentication backend verifying passwords in the hashing pool instead of the request thread.
+
+    Hashes made with an outdated hasher or iteration count are upgraded transparently on a
+    successful login, as ModelBackend does through check_password's setter.
+    """
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hash anyway, so that unknown usernames cannot be told apart by response time
+            hash_password(password)
+            return None
+
+        is_correct, must_update = verify_password(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+
+        if must_update:
+            user.password = hash_password(password)
+            user.save(update_fields=['password'])
+        return user
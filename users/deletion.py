@@ -0,0 +1,207 @@
+import logging
+from collections import Counter
+from django.db.models import Q
+from django.utils import timezone
+from issues.counters import repair_counters
+from issues.models import Issue, Comment
+from projects.cache import bump_project_versions, user_project_ids
+from projects.events import build_event, build_reset_event, publish_on_commit
+from projects.models import Project, Contributor
+
+
+logger = logging.getLogger(__name__)
+
+
+def delete_rows(queryset, chunk_size=None):
+    """
+    Delete the rows matched by a queryset with set-based DELETE statements.
+
+    Unlike QuerySet.delete(), no object is loaded in Python and no signal is sent: the
+    caller is responsible for deleting dependent rows first. Django's deletion collector
+    uses the same fast path for relations without cascades or signals.
+
+    Of the models erased here, only Project has delete receivers, and the one skipped for
+    the projects of a user plan is projects.signals.invalidate_project. Issues, comments and
+    contributors have none, as the views publish their deletions. Erasures therefore bump the
+    versions and publish a reset event for every affected project themselves, see
+    erased_user_project_ids and publish_erasure_events.
+
+    Args:
+        queryset (QuerySet): The rows to delete.
+        chunk_size (int, optional): When set, rows are deleted by batches of at most this
+                                    many primary keys, which bounds the size of each statement.
+
+    Returns:
+        int: The number of deleted rows.
+    """
+    if chunk_size is None:
+        return queryset._raw_delete(queryset.db)
+
+    deleted = 0
+    model = queryset.model
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return deleted
+        deleted += model._base_manager.filter(pk__in=pks)._raw_delete(queryset.db)
+
+
+def erased_user_project_ids(user):
+    """
+    Return the ids of the projects whose rows are removed or changed by the erasure of a user.
+
+    Besides the projects the user authored or contributes to, this covers the projects they
+    left but still hold issues, comments or assigned issues in.
+
+    Args:
+        user (User): The user about to be erased.
+    """
+    # One index lookup per relation, rather than an OR across joins
+    other_project_ids = Issue.objects.filter(author_id=user.pk).values_list('project_id', flat=True).union(
+        Issue.objects.filter(assignee_id=user.pk).values_list('project_id', flat=True),
+        Comment.objects.filter(author_id=user.pk).values_list('issue__project_id', flat=True),
+    )
+    return user_project_ids(user.pk) | set(other_project_ids)
+
+
+def user_erasure_plan(user):
+    """
+    Return the ordered list of set-based steps erasing the data owned by a user.
+
+    Each step is a (model, queryset) pair. Steps are ordered so that no row is deleted
+    before the rows referencing it: comments, then issues, then contributors, then projects.
+    Issues merely assigned to the user are kept and unassigned beforehand.
+
+    Args:
+        user (User): The user whose data is erased.
+    """
+    authored_projects = Project.objects.filter(author_id=user.pk).values('pk')
+    doomed_issues = Issue.objects.filter(author_id=user.pk).values('pk')
+    project_issues = Issue.objects.filter(project_id__in=authored_projects).values('pk')
+
+    return [
+        (Comment, Comment.objects.filter(author_id=user.pk)),
+        (Comment, Comment.objects.filter(issue_id__in=doomed_issues)),
+        (Comment, Comment.objects.filter(issue_id__in=project_issues)),
+        (Issue, Issue.objects.filter(author_id=user.pk)),
+        (Issue, Issue.objects.filter(project_id__in=authored_projects)),
+        (Contributor, Contributor.objects.filter(user_id=user.pk)),
+        (Contributor, Contributor.objects.filter(project_id__in=authored_projects)),
+        (Project, Project.objects.filter(author_id=user.pk)),
+    ]
+
+
+def project_erasure_plan(project):
+    """
+    Return the ordered list of set-based steps erasing the issues, comments and contributors of a project.
+
+    Args:
+        project (Project): The project whose dependent rows are erased.
+    """
+    project_issues = Issue.objects.filter(project_id=project.pk).values('pk')
+
+    return [
+        (Comment, Comment.objects.filter(issue_id__in=project_issues)),
+        (Issue, Issue.objects.filter(project_id=project.pk)),
+        (Contributor, Contributor.objects.filter(project_id=project.pk)),
+    ]
+
+
+def publish_erasure_events(memberships, project_ids):
+    """
+    Tell the event streams about the rows removed by an erasure, whose set-based deletes sent no signal.
+
+    A 'contributor.deleted' event per removed membership ends the streams of the removed
+    users, then a 'reset' event per project makes the remaining clients reload their data.
+    Events are published once the current transaction, if any, commits.
+
+    Args:
+        memberships (list): The Contributor rows removed by the erasure, loaded before it ran.
+        project_ids (iterable): The ids of the projects whose rows were removed.
+    """
+    for contributor in memberships:
+        publish_on_commit(build_event(contributor.project_id, 'contributor', 'deleted', contributor))
+    for project_id in project_ids:
+        publish_on_commit(build_reset_event(project_id))
+
+
+def run_erasure(plan, instance, chunk_size=None, on_progress=None):
+    """
+    Run the steps of an erasure plan, then delete the instance itself with the ORM.
+
+    The final ORM delete also cascades to any dependent row written while the plan was
+    running, so a chunked erasure never fails on a foreign key.
+
+    Args:
+        plan (list): The (model, queryset) steps, as returned by user_erasure_plan or project_erasure_plan.
+        instance (Model): The object deleted once the plan has run.
+        chunk_size (int, optional): Delete rows by batches of at most this many rows.
+        on_progress (callable, optional): Called with the per-model counts after each step.
+
+    Returns:
+        dict: The number of removed rows per model label, e.g. {'issues.Comment': 120, ...}.
+    """
+    removed = Counter()
+
+    for model, queryset in plan:
+        removed[model._meta.label] += delete_rows(queryset, chunk_size)
+        if on_progress is not None:
+            on_progress(dict(removed))
+
+    _, instance_rows = instance.delete()
+    removed.update({label: count for label, count in instance_rows.items() if count})
+    return dict(removed)
+
+
+def erase_user(user, chunk_size=None, on_progress=None):
+    """
+    Delete a user together with their projects, issues, comments and contributions.
+
+    The dependent rows are removed with set-based DELETEs in dependency order instead of
+    collecting every related object in Python. The user row itself is deleted last with the
+    ORM so that the remaining small relations (groups, permissions, admin log) cascade as usual.
+    Should be called inside a transaction when chunk_size is not set.
+
+    Args:
+        user (User): The user to delete.
+        chunk_size (int, optional): Delete rows by batches of at most this many rows.
+        on_progress (callable, optional): Called with the per-model counts after each step.
+
+    Returns:
+        dict: The number of removed rows per model label, e.g. {'issues.Comment': 120, ...}.
+    """
+    user_id = user.pk
+    # Set-based deletes send no signals, so the affected projects are invalidated here
+    project_ids = erased_user_project_ids(user)
+    memberships = list(Contributor.objects.filter(Q(user_id=user.pk) | Q(project__author_id=user.pk)))
+
+    # Issues assigned to the user survive their deletion, as with on_delete=SET_NULL
+    Issue.objects.filter(assignee_id=user.pk).update(assignee=None, updated_time=timezone.now())
+
+    removed = run_erasure(user_erasure_plan(user), user, chunk_size, on_progress)
+    # The issues and comments of the user were removed from projects that remain, whose counters are recomputed
+    repair_counters(project_ids)
+    bump_project_versions(project_ids)
+    publish_erasure_events(memberships, project_ids)
+    logger.info("Erased user %s: %s", user_id, removed)
+    return removed
+
+
+def erase_project(project, chunk_size=None, on_progress=None):
+    """
+    Delete a project together with its issues, comments and contributors.
+
+    Args:
+        project (Project): The project to delete.
+        chunk_size (int, optional): Delete rows by batches of at most this many rows.
+        on_progress (callable, optional): Called with the per-model counts after each step.
+
+    Returns:
+        dict: The number of removed rows per model label.
+    """
+    project_id = project.pk
+    memberships = list(Contributor.objects.filter(project_id=project_id))
+    removed = run_erasure(project_erasure_plan(project), project, chunk_size, on_progress)
+    publish_erasure_events(memberships, [project_id])
+    logger.info("Erased project %s: %s", project_id, removed)
+    return removed
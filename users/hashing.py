@@ -0,0 +1,175 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, identify_hasher, make_password, check_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    """
+    Raised when the password hashing queue is full, so that auth bursts fail fast with a 503
+    instead of starving the workers serving the rest of the API.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many concurrent sign-ups or logins, please retry shortly."
+    default_code = 'hashing_busy'
+
+
+def _init_worker(settings_module):
+    """
+    Configure Django in a freshly spawned hashing process.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _encode(password):
+    """
+    Hash a password with the preferred hasher, returning when the work started with the hash.
+    """
+    return time.time(), make_password(password)
+
+
+def _verify(password, encoded):
+    """
+    Check a password and tell whether its hash should be upgraded, as check_password does
+    before calling its setter.
+    """
+    started = time.time()
+    is_correct = check_password(password, encoded)
+    must_update = False
+    # Only a correct password can be re-hashed, and only its hasher needs checking then
+    if is_correct:
+        preferred = get_hasher('default')
+        hasher = identify_hasher(encoded)
+        must_update = hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+    return started, (is_correct, must_update)
+
+
+class HashingPool:
+    """
+    Bounded process pool running password hashing away from the request threads.
+
+    At most `max_pending` hashing calls are queued or running at once. A request that cannot
+    get a slot within `queue_timeout` seconds is rejected with HashingBusy. With zero workers
+    the hashing runs inline, which keeps the concurrency limit but not the CPU isolation.
+
+    Args:
+        workers (int): Number of hashing processes.
+        max_pending (int): Maximum number of hashing calls queued or running at once.
+        queue_timeout (float): Seconds to wait for a slot before giving up.
+    """
+    def __init__(self, workers, max_pending, queue_timeout):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            'submitted': 0,
+            'completed': 0,
+            'rejected': 0,
+            'pending': 0,
+            'queue_wait_total_ms': 0.0,
+            'queue_wait_max_ms': 0.0,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            # Spawned processes do not inherit the database connections or threads of the server
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'tasktracker.settings'),),
+                )
+            return self._executor
+
+    def _record(self, **changes):
+        with self._lock:
+            for key, value in changes.items():
+                self._metrics[key] += value
+
+    def run(self, function, *args):
+        """
+        Run a hashing function in the pool and return its result.
+
+        Raises:
+            HashingBusy: If no slot frees up within the queue timeout.
+        """
+        # Wait for a slot, rejecting the call once the queue timeout is reached
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._record(rejected=1)
+            raise HashingBusy()
+
+        self._record(submitted=1, pending=1)
+        submitted = time.time()
+        try:
+            # Hashing functions return when they started, so that the queue wait can be measured
+            if self.workers:
+                started, result = self._get_executor().submit(function, *args).result()
+            else:
+                started, result = function(*args)
+        finally:
+            self._slots.release()
+            self._record(pending=-1)
+
+        wait_ms = max(started - submitted, 0) * 1000
+        with self._lock:
+            self._metrics['completed'] += 1
+            self._metrics['queue_wait_total_ms'] += wait_ms
+            self._metrics['queue_wait_max_ms'] = max(self._metrics['queue_wait_max_ms'], wait_ms)
+        return result
+
+    def get_metrics(self):
+        """
+        Return a snapshot of the queueing metrics of the pool.
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        completed = metrics['completed']
+        metrics['queue_wait_avg_ms'] = metrics['queue_wait_total_ms'] / completed if completed else 0.0
+        metrics.update(workers=self.workers, max_pending=self.max_pending)
+        return metrics
+
+
+_pool = None
+
+
+def get_hashing_pool():
+    """
+    Return the process-wide hashing pool configured by the PASSWORD_HASHING_* settings.
+    """
+    global _pool
+    if _pool is None:
+        _pool = HashingPool(
+            workers=settings.PASSWORD_HASHING_WORKERS,
+            max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+            queue_timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT,
+        )
+    return _pool
+
+
+def hash_password(password):
+    """
+    Hash a raw password with the preferred hasher, in the hashing pool.
+    """
+    return get_hashing_pool().run(_encode, password)
+
+
+def verify_password(password, encoded):
+    """
+    Check a raw password against its stored hash, in the hashing pool.
+
+    Returns:
+        tuple: (is_correct, must_update), must_update telling whether the stored hash uses an
+               outdated hasher or iteration count and should be replaced.
+    """
+    return get_hashing_pool().run(_verify, password, encoded)
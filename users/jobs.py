@@ -0,0 +1,125 @@
+import logging
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from projects.models import Project
+from .deletion import erase_user, erase_project
+from .models import User, ErasureJob
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+ERASERS = {
+    'user': (User, erase_user),
+    'project': (Project, erase_project),
+}
+
+
+def wants_async_erasure(request):
+    """
+    Return True if the client asked for the deletion to run as a background job (`?async=true`).
+    """
+    return request.query_params.get('async', '').lower() in ('1', 'true', 'yes')
+
+
+def get_executor():
+    """
+    Return the local thread pool running erasure jobs, creating it on first use.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.ERASURE_JOB_WORKERS, thread_name_prefix='erasure')
+    return _executor
+
+
+def enqueue_erasure(kind, target, requested_by):
+    """
+    Queue the erasure of a user or a project and return the job tracking it.
+
+    The job is handed to the worker pool once the current transaction commits. A user is
+    deactivated right away so that they cannot log in while their data is being erased.
+
+    Args:
+        kind (str): 'user' or 'project'.
+        target (Model): The user or project to erase.
+        requested_by (User): The user requesting the erasure.
+
+    Returns:
+        ErasureJob: The pending job.
+    """
+    if kind == 'user':
+        User.objects.filter(pk=target.pk).update(is_active=False)
+
+    job = ErasureJob.objects.create(kind=kind, target_id=target.pk, requested_by_id=requested_by.pk)
+    transaction.on_commit(lambda: submit_erasure(job.pk))
+    return job
+
+
+def submit_erasure(job_id):
+    """
+    Run the job in the worker pool, or inline when ERASURE_JOBS_EAGER is set.
+    """
+    if settings.ERASURE_JOBS_EAGER:
+        run_erasure_job(job_id)
+    else:
+        get_executor().submit(run_erasure_job, job_id)
+
+
+def requeue_expired_erasure_jobs():
+    """
+    Move back to PENDING the running jobs whose worker made no progress for ERASURE_JOB_LEASE seconds.
+
+    Their worker is assumed to have crashed or been restarted. Jobs held by live workers keep
+    beating on every step and are left alone. Jobs claimed before heartbeats were recorded have
+    none and are requeued too.
+
+    Returns:
+        int: The number of requeued jobs.
+    """
+    expired = timezone.now() - timedelta(seconds=settings.ERASURE_JOB_LEASE)
+    return ErasureJob.objects.filter(
+        Q(heartbeat_time__lt=expired) | Q(heartbeat_time__isnull=True), status='RUNNING',
+    ).update(status='PENDING')
+
+
+def run_erasure_job(job_id):
+    """
+    Run a pending erasure job to completion.
+
+    Rows are deleted by chunks of ERASURE_JOB_CHUNK_SIZE, each committed on its own, so no
+    long transaction is held and an interrupted job can safely be run again. The per-model
+    counts and the heartbeat are saved on the job after every step, so that clients can poll
+    the progress and stalled jobs can be requeued (see requeue_expired_erasure_jobs).
+
+    Args:
+        job_id (UUID): The id of the job to run.
+    """
+    # Claim the job, so that two workers never run the same one
+    claimed = ErasureJob.objects.filter(pk=job_id, status='PENDING').update(status='RUNNING', heartbeat_time=timezone.now())
+    if not claimed:
+        return
+
+    job = ErasureJob.objects.get(pk=job_id)
+    model, erase = ERASERS[job.kind]
+
+    def save_progress(removed):
+        ErasureJob.objects.filter(pk=job.pk).update(rows_deleted=removed, heartbeat_time=timezone.now())
+
+    try:
+        target = model.objects.filter(pk=job.target_id).first()
+        removed = {}
+        if target is not None:
+            removed = erase(target, chunk_size=settings.ERASURE_JOB_CHUNK_SIZE, on_progress=save_progress)
+        ErasureJob.objects.filter(pk=job.pk).update(status='DONE', rows_deleted=removed, finished_time=timezone.now())
+    except Exception as exc:
+        logger.exception("Erasure job %s failed", job.pk)
+        ErasureJob.objects.filter(pk=job.pk).update(status='FAILED', error=str(exc), finished_time=timezone.now())
+    finally:
+        # Worker threads own their database connection
+        if not settings.ERASURE_JOBS_EAGER:
+            connections.close_all()
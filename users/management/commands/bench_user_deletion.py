@@ -0,0 +1,86 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from issues.models import Issue, Comment
+from projects.models import Project, Contributor
+from users.deletion import erase_user
+from users.models import User
+
+
+def legacy_erase_user(user):
+    """
+    The ORM based cascade formerly run by UserDetail.perform_destroy, kept for comparison.
+    """
+    Issue.objects.filter(author=user).delete()
+    Comment.objects.filter(author=user).delete()
+    Contributor.objects.filter(user=user).delete()
+    for project in Project.objects.filter(author=user):
+        project.delete()
+    user.delete()
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the deletion of a heavy user with the legacy ORM cascade and with erase_user.
+
+    The dataset is created inside a transaction that is rolled back after each run, so the
+    database is left untouched.
+    """
+    help = "Time the deletion of a user owning many issues and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=20)
+        parser.add_argument('--issues', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help="Delete rows by batches of this size with erase_user.")
+        parser.add_argument('--skip-legacy', action='store_true',
+                            help="Only time erase_user.")
+
+    def handle(self, *args, **options):
+        strategies = [('erase_user', lambda user: erase_user(user, chunk_size=options['chunk_size']))]
+        if not options['skip_legacy']:
+            strategies.insert(0, ('legacy ORM cascade', legacy_erase_user))
+
+        for label, strategy in strategies:
+            with transaction.atomic():
+                user = self.create_dataset(options['projects'], options['issues'], options['comments'])
+                start = time.perf_counter()
+                removed = strategy(user)
+                elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+
+            self.stdout.write(f"{label}: {elapsed:.2f} s")
+            if removed:
+                for table, count in sorted(removed.items()):
+                    self.stdout.write(f"    {table}: {count}")
+
+    def create_dataset(self, project_count, issue_count, comment_count):
+        """
+        Create a user authoring `project_count` projects, `issue_count` issues and `comment_count` comments.
+        """
+        user = User.objects.create_user(username='bench-heavy', password=None, age=30)
+        peer = User.objects.create_user(username='bench-peer', password=None, age=30)
+
+        projects = Project.objects.bulk_create(
+            [Project(title=f'Bench {i}', description='', type='back-end', author=user) for i in range(project_count)]
+        )
+        Contributor.objects.bulk_create(
+            [Contributor(user=member, project=project) for project in projects for member in (user, peer)]
+        )
+        issues = Issue.objects.bulk_create(
+            [
+                Issue(title=f'Issue {i}', description='', tag='BUG', priority='LOW',
+                      project=projects[i % project_count], author=user, assignee=peer)
+                for i in range(issue_count)
+            ],
+            batch_size=1000,
+        )
+        Comment.objects.bulk_create(
+            [
+                Comment(text=f'Comment {i}', issue=issues[i % issue_count], author=user if i % 2 else peer)
+                for i in range(comment_count)
+            ],
+            batch_size=1000,
+        )
+        return user
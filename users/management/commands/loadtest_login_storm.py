@@ -0,0 +1,56 @@
+import threading
+from django.core.management.base import BaseCommand
+from tasktracker.loadtest import obtain_token, run_for, summarize, timed_request
+
+
+class Command(BaseCommand):
+    """
+    Measure the latency of non-auth endpoints while the server is flooded with logins.
+
+    The command first probes an authenticated endpoint alone to get a baseline, then probes it
+    again while other threads hammer /login/. With password hashing running in the bounded
+    process pool, the probe p99 should stay close to the baseline and excess logins should be
+    answered with 503 rather than queueing behind the hashing work.
+
+    It runs against a live server (runserver, gunicorn...) and needs an existing account.
+    """
+    help = "Report p99 latency of a non-auth endpoint during a login storm against a running server."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the running server.")
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--probe-path', default='/projects/',
+                            help="Authenticated endpoint whose latency is measured.")
+        parser.add_argument('--logins', type=int, default=32, help="Number of threads sending logins.")
+        parser.add_argument('--probes', type=int, default=4, help="Number of threads sending probe requests.")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds each phase lasts.")
+
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        token = obtain_token(base_url, options['username'], options['password'])
+        credentials = {'username': options['username'], 'password': options['password']}
+
+        def probe():
+            return timed_request(base_url + options['probe_path'], token=token)
+
+        def login():
+            return timed_request(f'{base_url}/login/', 'POST', credentials)
+
+        baseline = run_for(options['duration'], options['probes'], probe)
+        self.stdout.write(summarize('probe alone', baseline))
+
+        # The storm runs in the background while the probe is measured again
+        storm = []
+        storm_thread = threading.Thread(
+            target=lambda: storm.extend(run_for(options['duration'], options['logins'], login)), daemon=True,
+        )
+        storm_thread.start()
+        during = run_for(options['duration'], options['probes'], probe)
+        storm_thread.join()
+
+        self.stdout.write(summarize('probe during storm', during))
+        self.stdout.write(summarize('logins', storm))
+        metrics_status, _, metrics = timed_request(f'{base_url}/metrics/hashing/', token=token)
+        if metrics_status == 200:
+            self.stdout.write(f"hashing pool: {metrics}")
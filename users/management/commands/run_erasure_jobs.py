@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from users.jobs import requeue_expired_erasure_jobs, run_erasure_job
+from users.models import ErasureJob
+
+
+class Command(BaseCommand):
+    """
+    Run the pending erasure jobs in the foreground.
+
+    Useful after a restart: jobs queued while no worker was alive, and jobs left running by a
+    worker that made no progress for ERASURE_JOB_LEASE seconds, are resumed. Erasure steps are
+    idempotent, so a job interrupted halfway can safely be run again.
+    """
+    help = "Run pending user and project erasure jobs, and resume the ones abandoned by their worker."
+
+    def handle(self, *args, **options):
+        while True:
+            # Checked before every job, since a worker may stop while the previous one runs
+            requeue_expired_erasure_jobs()
+            job_id = ErasureJob.objects.filter(status='PENDING').order_by('created_time').values_list('pk', flat=True).first()
+            if job_id is None:
+                break
+            run_erasure_job(job_id)
+            job = ErasureJob.objects.get(pk=job_id)
+            self.stdout.write(f"{job}: {job.rows_deleted}")
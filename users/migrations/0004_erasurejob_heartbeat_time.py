@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_token_generation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='erasurejob',
+            name='heartbeat_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
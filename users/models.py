@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
+import uuid
 
 
 class User(AbstractUser):
@@ -12,15 +13,65 @@ class User(AbstractUser):
         can_be_contacted (BooleanField): Flag to indicate if the user agrees to be contacted. Defaults to False.
         can_data_be_shared (BooleanField): Flag to indicate if the user agrees to share their data. Defaults to False.
         created_time (DateTimeField): The date and time the user was created. Automatically set to the current time when the user is created.
+        token_generation (PositiveIntegerField): Incremented when the tokens of the user are revoked, tokens issued under an earlier generation being rejected.
     """
 
     age = models.PositiveIntegerField()
     can_be_contacted = models.BooleanField(default=False)
     can_data_be_shared = models.BooleanField(default=False)
     created_time = models.DateTimeField(default=timezone.now)
+    token_generation = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         """
         Return a string representation of the User.
         """
-        return self.username
\ No newline at end of file
+        return self.username
+
+class ErasureJob(models.Model):
+    """
+    Background erasure of a user or a project, polled by clients through its id.
+
+    The table doubles as the job queue: pending jobs left behind by a stopped worker, and
+    running jobs whose worker stopped beating (see ERASURE_JOB_LEASE), are picked up again by
+    the run_erasure_jobs command.
+
+    Attributes:
+        id (UUIDField): The job identifier handed out to the client.
+        kind (CharField): What is erased, 'user' or 'project'.
+        target_id (BigIntegerField): The primary key of the erased user or project.
+        status (CharField): Progress of the job, from 'PENDING' to 'DONE' or 'FAILED'.
+        rows_deleted (JSONField): The number of deleted rows per model label so far.
+        error (TextField): The error message of a failed job.
+        requested_by (ForeignKey): The user who requested the erasure.
+        created_time (DateTimeField): The date and time the job was queued.
+        heartbeat_time (DateTimeField): The date and time the running worker last made progress.
+        finished_time (DateTimeField): The date and time the job finished, if it did.
+    """
+    KIND_CHOICES = (
+        ('user', 'User'),
+        ('project', 'Project'),
+    )
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    target_id = models.BigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    rows_deleted = models.JSONField(default=dict)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='erasure_jobs')
+    created_time = models.DateTimeField(auto_now_add=True)
+    heartbeat_time = models.DateTimeField(null=True, blank=True)
+    finished_time = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        """
+        Return a string representation of the job, naming its target and status.
+        """
+        return f"Erasure of {self.kind} {self.target_id} ({self.status})"
@@ -1,6 +1,12 @@
+from django.conf import settings
 from rest_framework import serializers
-from django.contrib.auth.hashers import make_password
-from .models import User
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import GENERATION_CLAIM, GENERATION_KEY, get_generation_cache, is_token_revoked
+from .hashing import hash_password
+from .models import User, ErasureJob
 
 
 class SignupUserSerializer(serializers.ModelSerializer):
@@ -41,8 +47,8 @@ class SignupUserSerializer(serializers.ModelSerializer):
         # Remove the password_confirm field as it's not needed for the User model.
         validated_data.pop('password_confirm', None)
         
-        # Hash the user's password before saving to the database.
-        validated_data['password'] = make_password(validated_data['password'])
+        # Hash the user's password before saving to the database, in the bounded hashing pool.
+        validated_data['password'] = hash_password(validated_data['password'])
 
         return User.objects.create(**validated_data)
 
@@ -53,4 +59,50 @@ class UserSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = User
-        fields = ['id', 'username', 'age', 'can_be_contacted', 'can_data_be_shared', 'created_time']
\ No newline at end of file
+        fields = ['id', 'username', 'age', 'can_be_contacted', 'can_data_be_shared', 'created_time']
+
+
+class ErasureJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer exposing the progress of a background erasure job.
+
+    The error of a failed job is only logged, as it may reveal internals of the server.
+    """
+    class Meta:
+        model = ErasureJob
+        fields = ['id', 'kind', 'status', 'rows_deleted', 'created_time', 'finished_time']
+        read_only_fields = fields
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Serializer for /login/ embedding the claims needed to authenticate without a database lookup.
+    """
+    @classmethod
+    def get_token(cls, user):
+        """
+        Add the username, the staff and superuser flags and the token generation to the
+        refresh token, and thereby to every access token derived from it.
+        """
+        token = super().get_token(user)
+        token['username'] = user.username
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        token[GENERATION_CLAIM] = user.token_generation
+        # The login warms the cached generation read by the stateless authentication
+        get_generation_cache().set(GENERATION_KEY.format(user.pk), user.token_generation,
+                                   timeout=settings.TOKEN_GENERATION_CACHE_TIMEOUT)
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Serializer for /api/token/refresh/ refusing refresh tokens revoked by UserDetail or the admin.
+    """
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        # Refreshes are rare, so the generation is read from the User row rather than the cache
+        generation = User.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM)).values_list('token_generation', flat=True).first()
+        if generation is None or is_token_revoked(refresh, generation):
+            raise InvalidToken("Token has been revoked.")
+        return super().validate(attrs)
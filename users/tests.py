@@ -1,8 +1,21 @@
+import io
+from datetime import timedelta
 from django.urls import reverse
+from django.utils import timezone
+from django.core.management import call_command
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.contrib.auth.hashers import make_password
 from rest_framework.test import APITestCase
 from rest_framework import status
 from rest_framework.test import APIClient
-from users.models import User
+from users.models import User, ErasureJob
+from users.hashing import HashingPool, HashingBusy, hash_password
+from projects.models import Project, Contributor
+from issues.models import Issue, Comment
 
 class UserTests(APITestCase):
     def setUp(self):
@@ -153,3 +166,220 @@ class UserTests(APITestCase):
         self.client.force_authenticate(user=user1)
         response = self.client.get(reverse('user-detail', kwargs={'pk': user2.id}))
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_delete_user_erases_owned_data(self):
+        """
+        Ensure deleting a user removes their projects, issues and comments, and unassigns issues they do not own.
+        """
+        user = User.objects.create_user(username='owner', password='password123', age=30)
+        project = Project.objects.create(title='Owned', description='', type='back-end', author=user)
+        Contributor.objects.create(user=user, project=project)
+        issue = Issue.objects.create(title='Owned issue', description='', tag='BUG', priority='LOW', project=project, author=user)
+        Comment.objects.create(text='Owned comment', issue=issue, author=self.admin_user)
+
+        other_project = Project.objects.create(title='Other', description='', type='back-end', author=self.admin_user)
+        Contributor.objects.create(user=user, project=other_project)
+        assigned = Issue.objects.create(title='Assigned', description='', tag='BUG', priority='LOW',
+                                        project=other_project, author=self.admin_user, assignee=user)
+        Comment.objects.create(text='Left on other project', issue=assigned, author=user)
+
+        self.client.force_authenticate(user=user)
+        response = self.client.delete(reverse('user-detail', kwargs={'pk': user.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Project.objects.filter(pk=project.pk).exists())
+        self.assertFalse(Issue.objects.filter(pk=issue.pk).exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Contributor.objects.filter(user_id=user.id).exists())
+        assigned.refresh_from_db()
+        self.assertIsNone(assigned.assignee)
+
+    @override_settings(ERASURE_JOBS_EAGER=True)
+    def test_async_delete_user_returns_job(self):
+        """
+        Ensure `?async=true` answers 202 with a job that erases the user and can be polled by its requester only.
+        """
+        user = User.objects.create_user(username='owner', password='password123', age=30)
+        other = User.objects.create_user(username='other', password='password123', age=30)
+        project = Project.objects.create(title='Owned', description='', type='back-end', author=user)
+        Issue.objects.create(title='Owned issue', description='', tag='BUG', priority='LOW', project=project, author=user)
+
+        self.client.force_authenticate(user=self.admin_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('user-detail', kwargs={'pk': user.id}) + '?async=true')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotIn('detail', response.data)
+        self.assertFalse(User.objects.filter(pk=user.id).exists())
+        url = reverse('erasure-job-detail', kwargs={'pk': response.data['id']})
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['status'], 'DONE')
+        self.assertEqual(response.data['rows_deleted']['issues.Issue'], 1)
+        self.assertEqual(response.data['rows_deleted']['users.User'], 1)
+        self.assertNotIn('error', response.data)
+
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_async_delete_own_account_reports_deactivation(self):
+        """
+        Ensure a user erasing their own account is told in the 202 body, as they cannot poll the job.
+        """
+        user = User.objects.create_user(username='owner', password='password123', age=30)
+
+        self.client.force_authenticate(user=user)
+        response = self.client.delete(reverse('user-detail', kwargs={'pk': user.id}) + '?async=true')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn('deactivated', response.data['detail'])
+        self.assertFalse(User.objects.get(pk=user.id).is_active)
+
+    @override_settings(ERASURE_JOBS_EAGER=True)
+    def test_run_erasure_jobs_resumes_only_expired_jobs(self):
+        """
+        Ensure run_erasure_jobs resumes a job abandoned past its lease, and leaves the jobs of live workers running.
+        """
+        abandoned = User.objects.create_user(username='abandoned', password='password123', age=30)
+        busy = User.objects.create_user(username='busy', password='password123', age=30)
+        stale_job = ErasureJob.objects.create(kind='user', target_id=abandoned.pk, status='RUNNING',
+                                              heartbeat_time=timezone.now() - timedelta(seconds=settings.ERASURE_JOB_LEASE + 1))
+        live_job = ErasureJob.objects.create(kind='user', target_id=busy.pk, status='RUNNING', heartbeat_time=timezone.now())
+
+        call_command('run_erasure_jobs', stdout=io.StringIO())
+
+        stale_job.refresh_from_db()
+        live_job.refresh_from_db()
+        self.assertEqual(stale_job.status, 'DONE')
+        self.assertFalse(User.objects.filter(pk=abandoned.pk).exists())
+        self.assertEqual(live_job.status, 'RUNNING')
+        self.assertTrue(User.objects.filter(pk=busy.pk).exists())
+
+
+@override_settings(JWT_STATELESS_AUTH=True)
+class StatelessTokenAuthenticationTests(APITestCase):
+    """
+    Tests for the stateless JWT authentication mode, where request.user is built from token claims.
+    """
+    def setUp(self):
+        """
+        Create a user with a project and log them in through /login/.
+        """
+        for alias in settings.CACHES:
+            caches[alias].clear()
+        self.user = User.objects.create_user(username='claims', password='password123', age=30)
+        self.project = Project.objects.create(title='Claims', description='', type='back-end', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'claims', 'password': 'password123'})
+        self.tokens = response.data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    def test_read_requests_do_not_load_the_user(self):
+        """
+        Ensure listing projects authenticates from the token without fetching the user row.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertFalse(any('FROM "users_user"' in query['sql'] for query in queries.captured_queries))
+
+    def test_writes_use_the_full_user(self):
+        """
+        Ensure creating a project through a token user stores the real author.
+        """
+        response = self.client.post(reverse('project-list'), {'title': 'New', 'description': 'New', 'type': 'ios'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Project.objects.get(title='New').author, self.user)
+
+    def test_renaming_user_revokes_tokens(self):
+        """
+        Ensure tokens carrying a stale username are rejected, including for refresh.
+        """
+        response = self.client.patch(reverse('user-detail', kwargs={'pk': self.user.id}), {'username': 'renamed'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_of_deleted_users_are_rejected(self):
+        """
+        Ensure the tokens of a deleted user are rejected, including once the cached generation is lost.
+        """
+        other = User.objects.create_user(username='other', password='password123', age=30)
+        response = self.client.delete(reverse('user-detail', kwargs={'pk': self.user.id}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(reverse('project-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Deleted without revoking, while the generation is still cached from the login
+        tokens = self.client.post(reverse('token_obtain_pair'), {'username': 'other', 'password': 'password123'}).data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        User.objects.filter(pk=other.pk).delete()
+        response = self.client.post(reverse('project-list'), {'title': 'New', 'description': 'New', 'type': 'ios'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        caches[settings.TOKEN_GENERATION_CACHE_ALIAS].clear()
+        self.assertEqual(self.client.get(reverse('project-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_survives_cache_loss_and_allows_new_logins(self):
+        """
+        Ensure a login right after a revocation works, and revoked tokens stay rejected once the caches are lost.
+        """
+        stale = self.tokens['access']
+        self.client.patch(reverse('user-detail', kwargs={'pk': self.user.id}), {'username': 'renamed'})
+        # Issued within the same second as the revocation
+        tokens = self.client.post(reverse('token_obtain_pair'), {'username': 'renamed', 'password': 'password123'}).data
+        for alias in settings.CACHES:
+            caches[alias].clear()
+
+        for stateless in (True, False):
+            with self.settings(JWT_STATELESS_AUTH=stateless):
+                self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+                self.assertEqual(self.client.get(reverse('project-list')).status_code, status.HTTP_200_OK)
+                self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {stale}")
+                self.assertEqual(self.client.get(reverse('project-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PasswordHashingTests(APITestCase):
+    """
+    Tests for the bounded password hashing pool used by /signup/ and /login/.
+    """
+    def test_login_upgrades_outdated_hash(self):
+        """
+        Ensure a password stored with an outdated hasher is re-hashed on a successful login.
+        """
+        user = User.objects.create(username='legacy', password=make_password('password123', hasher='pbkdf2_sha1'), age=30)
+
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'legacy', 'password': 'password123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+        self.assertTrue(user.check_password('password123'))
+
+    def test_wrong_password_is_rejected(self):
+        """
+        Ensure the pooled backend rejects a wrong password and leaves the stored hash untouched.
+        """
+        user = User.objects.create(username='hashed', password=hash_password('password123'), age=30)
+
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'hashed', 'password': 'wrong'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(User.objects.get(pk=user.pk).password, user.password)
+
+    def test_full_pool_rejects_with_503(self):
+        """
+        Ensure a hashing call is rejected once every slot is taken for longer than the queue timeout.
+        """
+        pool = HashingPool(workers=0, max_pending=1, queue_timeout=0.01)
+        pool._slots.acquire()
+
+        with self.assertRaises(HashingBusy) as raised:
+            pool.run(make_password, 'password123')
+        self.assertEqual(raised.exception.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(pool.get_metrics()['rejected'], 1)
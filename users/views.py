@@ -1,9 +1,12 @@
 
-from rest_framework import permissions, generics
-from .serializers import SignupUserSerializer, UserSerializer
-from .models import User
-from issues.models import Issue, Comment
-from projects.models import Project, Contributor
+from rest_framework import permissions, generics, status
+from rest_framework.response import Response
+from .serializers import SignupUserSerializer, UserSerializer, ErasureJobSerializer
+from .models import User, ErasureJob
+from .deletion import erase_user
+from .jobs import enqueue_erasure, wants_async_erasure
+from .authentication import revoke_user_tokens
+from .hashing import get_hashing_pool
 from .permissions import IsSelfOrAdmin
 from rest_framework.permissions import IsAdminUser
 from django.db import transaction
@@ -59,21 +62,78 @@ class UserDetail(generics.RetrieveUpdateDestroyAPIView):
             raise permissions.PermissionDenied("You do not have permission to access this user.")
         return obj
 
+    def destroy(self, request, *args, **kwargs):
+        """
+        Delete the user, or with `?async=true` queue a background erasure and answer 202 Accepted
+        with the job to poll.
+
+        A user erasing their own account cannot poll the job, since the account is deactivated
+        and its tokens are revoked right away. Their response tells so in its `detail`.
+        """
+        if not wants_async_erasure(request):
+            return super().destroy(request, *args, **kwargs)
+
+        instance = self.get_object()
+        revoke_user_tokens(instance.pk)
+        job = enqueue_erasure('user', instance, requested_by=request.user)
+        data = ErasureJobSerializer(job).data
+        if instance.pk == request.user.pk:
+            data['detail'] = "The account is deactivated and its data will be erased in the background."
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+    def perform_update(self, serializer):
+        """
+        Save the user, revoking their tokens when a claim embedded at login time changes.
+        """
+        previous_username = serializer.instance.username
+        user = serializer.save()
+        if user.username != previous_username:
+            revoke_user_tokens(user.pk)
+
     @transaction.atomic
     def perform_destroy(self, instance):
         """
         Custom destruction method to ensure all data related to the user is also deleted.
+
+        Issues, comments, contributions and authored projects are removed with set-based
+        DELETEs before the user instance itself (see users.deletion.erase_user). Tokens
+        already issued to the user are revoked.
+        """
+        revoke_user_tokens(instance.pk)
+        erase_user(instance)
+
+
+class ErasureJobDetail(generics.RetrieveAPIView):
+    """
+    API view for polling the progress of a background erasure job.
+
+    Accessible by the user who requested the erasure and by admin users. Other users get a
+    404, as if the job did not exist.
+    """
+    queryset = ErasureJob.objects.all()
+    serializer_class = ErasureJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Return every job to admin users, and only the jobs they requested to other users.
         """
+        queryset = super().get_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(requested_by_id=self.request.user.pk)
 
-        # Delete user's issues, comments and contributions
-        Issue.objects.filter(author=instance).delete()
-        Comment.objects.filter(author=instance).delete()
-        Contributor.objects.filter(user=instance).delete()
 
-        # Delete projects authored by the user
-        projects = Project.objects.filter(author=instance)
-        for project in projects:
-            project.delete()
+class HashingMetricsView(generics.GenericAPIView):
+    """
+    API view exposing the queueing metrics of the password hashing pool.
 
-        # Finally, delete the user instance
-        instance.delete()
+    Accessible only by admin users, to size PASSWORD_HASHING_WORKERS and PASSWORD_HASHING_MAX_PENDING.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Return the current metrics of the hashing pool of this process.
+        """
+        return Response(get_hashing_pool().get_metrics())